@@ -3,20 +3,39 @@ Flask application package
 """
 
 from flask import Flask, jsonify
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 
+from huffman import metrics
+
+from . import instrumentation
 from .routes import api_bp
+from .warmup import load_dictionaries
 
 
-def create_app() -> Flask:
+def create_app(config_name: Optional[str] = None) -> Flask:
     """
     Application factory pattern for creating Flask app.
     
+    Args:
+        config_name: Key of :data:`config.config` to load and initialize,
+            e.g. ``'production'``. Left to the caller if None
+    
     Returns:
         Configured Flask application
     """
     app = Flask(__name__)
     
+    if config_name is not None:
+        from config import config
+        config_class = config.get(config_name, config['default'])
+        app.config.from_object(config_class)
+        config_class.init_app(app)
+    
+    if app.config.get('METRICS_ENABLED'):
+        metrics.enable()
+    instrumentation.init_app(app)
+    load_dictionaries(app)
+    
     # Register blueprints
     app.register_blueprint(api_bp)
     
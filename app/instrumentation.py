@@ -0,0 +1,93 @@
+"""
+HTTP instrumentation feeding :mod:`huffman.metrics` and :mod:`huffman.profiling`
+"""
+
+import json
+from time import perf_counter
+from typing import Any, Optional
+
+from flask import Flask, Response, g, request
+from flask.json.provider import DefaultJSONProvider
+
+from huffman import metrics, profiling
+from huffman.metrics import HTTP_BYTES_IN, HTTP_BYTES_OUT, HTTP_REQUESTS, HTTP_SECONDS
+
+# Request header asking for a profile, answered in the same response header.
+# Any value profiles; "time" skips allocation tracing
+PROFILE_HEADER = 'X-Huffman-Profile'
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """JSON provider recording serialization time as a codec stage"""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        with profiling.stage("json_serialization"):
+            return super().dumps(obj, **kwargs)
+
+
+def _finish_profile(response: Optional[Response] = None) -> None:
+    """Close the request's profile, if any, and attach it to ``response``"""
+    session = g.pop('profile_session', None)
+    if session is None:
+        return
+    session.__exit__(None, None, None)
+    report = g.pop('profile_report')
+    if response is not None:
+        response.headers['Server-Timing'] = report.server_timing()
+        response.headers[PROFILE_HEADER] = json.dumps(report.to_dict(),
+                                                      separators=(',', ':'))
+
+
+def init_app(app: Flask) -> None:
+    """
+    Install request hooks and the timed JSON provider.
+
+    Hooks return after one flag check while metrics are disabled.
+    Streamed responses are counted, timed and profiled up to their first
+    byte; their size is unknown when the hook runs.
+
+    With ``PROFILING_ENABLED``, requests carrying the ``X-Huffman-Profile``
+    header get the per-stage breakdown back as ``Server-Timing`` and as
+    JSON in ``X-Huffman-Profile``. Jobs offloaded to worker processes are
+    not profiled.
+
+    Args:
+        app: Application to instrument
+    """
+    app.json = TimedJSONProvider(app)
+
+    @app.before_request
+    def start_timer() -> None:
+        if metrics.is_enabled():
+            g.metrics_start = perf_counter()
+
+    @app.before_request
+    def start_profile() -> None:
+        mode = request.headers.get(PROFILE_HEADER)
+        if not mode or not app.config.get('PROFILING_ENABLED'):
+            return
+        session = profiling.profile(sink=app.config.get('PROFILING_SINK'),
+                                    memory=mode.lower() != 'time')
+        g.profile_report = session.__enter__()
+        g.profile_session = session
+
+    @app.after_request
+    def record_request(response: Response) -> Response:
+        _finish_profile(response)
+        start = g.pop('metrics_start', None)
+        if start is None:
+            return response
+        # Rule patterns keep label values bounded, unlike raw paths
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+        HTTP_SECONDS.observe(perf_counter() - start, (endpoint,))
+        HTTP_REQUESTS.inc((endpoint, request.method, str(response.status_code)))
+        if request.content_length:
+            HTTP_BYTES_IN.inc((endpoint,), request.content_length)
+        if not response.is_streamed and response.content_length:
+            HTTP_BYTES_OUT.inc((endpoint,), response.content_length)
+        return response
+
+    @app.teardown_request
+    def close_profile(error: Optional[BaseException]) -> None:
+        # after_request is skipped when a view raises
+        _finish_profile()
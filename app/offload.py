@@ -0,0 +1,179 @@
+"""
+Bounded process pool that keeps large codec jobs off the request threads
+"""
+
+import atexit
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Any, Callable, Mapping, Optional, Tuple
+
+from flask import current_app
+
+from huffman import metrics
+from huffman.parallel import resolve_workers
+
+# Defaults when the app config does not set the OFFLOAD_* keys
+DEFAULT_OFFLOAD_WORKERS = 0
+DEFAULT_OFFLOAD_MIN_SIZE = 64 * 1024
+DEFAULT_OFFLOAD_MAX_PENDING = 32
+DEFAULT_OFFLOAD_TIMEOUT = 30.0
+
+_EXTENSION_KEY = 'codec_pool'
+_pool_lock = threading.Lock()
+
+
+class PoolOverloaded(Exception):
+    """Raised when every pending-job slot is taken"""
+
+
+class JobTimeout(Exception):
+    """Raised when a job does not finish within the request timeout"""
+
+
+def _run_job(fn: Callable[..., Any], record: bool, args: Tuple[Any, ...]
+             ) -> Tuple[Any, Optional[BaseException], Optional[metrics.Snapshot]]:
+    """
+    Call ``fn(*args)`` in a worker process and collect what it recorded.
+
+    Worker processes handle one job at a time, so the registry is
+    cleared first and holds exactly this job's metrics afterwards.
+
+    Returns:
+        Tuple of (result, raised exception or None, metrics or None)
+    """
+    if record:
+        metrics.enable()
+        metrics.REGISTRY.reset()
+    else:
+        metrics.disable()
+    try:
+        result, error = fn(*args), None
+    except Exception as e:
+        result, error = None, e
+    return result, error, metrics.REGISTRY.snapshot() if record else None
+
+
+class CodecPool:
+    """
+    Run codec calls inline or in a bounded process pool, by input size.
+
+    Small inputs run on the request thread, where a pool round trip
+    would cost more than the work. Large inputs go to worker processes,
+    so they neither hold the GIL nor queue up behind each other on the
+    request threads. At most ``max_pending`` large jobs are queued or
+    running; beyond that requests are refused immediately rather than
+    piling up, which keeps tail latency bounded for everyone else.
+    """
+
+    def __init__(self, workers: Optional[int] = DEFAULT_OFFLOAD_WORKERS,
+                 min_size: int = DEFAULT_OFFLOAD_MIN_SIZE,
+                 max_pending: int = DEFAULT_OFFLOAD_MAX_PENDING,
+                 timeout: Optional[float] = DEFAULT_OFFLOAD_TIMEOUT) -> None:
+        """
+        Args:
+            workers: Worker processes; None uses every CPU and 0 runs
+                every job inline, as everywhere else in the package
+            min_size: Smallest input, in characters or bytes, sent to the pool
+            max_pending: Jobs that may be queued or running at once
+            timeout: Seconds a request waits for its job, None for no limit
+        """
+        self._workers = resolve_workers(workers)
+        self._min_size = min_size
+        self._timeout = timeout
+        self._slots = threading.BoundedSemaphore(max(max_pending, 1))
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Mapping[str, Any]) -> "CodecPool":
+        """Build a pool from the OFFLOAD_* keys of an app config"""
+        return cls(
+            workers=config.get('OFFLOAD_WORKERS', DEFAULT_OFFLOAD_WORKERS),
+            min_size=config.get('OFFLOAD_MIN_SIZE', DEFAULT_OFFLOAD_MIN_SIZE),
+            max_pending=config.get('OFFLOAD_MAX_PENDING', DEFAULT_OFFLOAD_MAX_PENDING),
+            timeout=config.get('OFFLOAD_TIMEOUT', DEFAULT_OFFLOAD_TIMEOUT))
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any job can leave the request thread"""
+        return self._workers > 0
+
+    def run(self, fn: Callable[..., Any], size: int, *args: Any) -> Any:
+        """
+        Call ``fn(*args)``, in a worker process when ``size`` is large.
+
+        Args:
+            fn: Picklable module-level function
+            size: Input size deciding where the job runs
+            *args: Picklable arguments
+
+        Returns:
+            Whatever ``fn`` returns; exceptions it raises propagate. The
+            metrics a worker process records join this process's registry
+
+        Raises:
+            PoolOverloaded: If the pending-job limit is reached
+            JobTimeout: If the job outlives the timeout. A job already
+                running keeps its slot until it finishes
+        """
+        if not self.enabled or size < self._min_size:
+            return fn(*args)
+
+        if not self._slots.acquire(blocking=False):
+            raise PoolOverloaded('Server is busy, retry later')
+        try:
+            future: Future = self._get_executor().submit(
+                _run_job, fn, metrics.is_enabled(), args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+
+        try:
+            result, error, recorded = future.result(timeout=self._timeout)
+        except FutureTimeout:
+            future.cancel()
+            raise JobTimeout(f'Request took longer than {self._timeout}s') from None
+        # Stage timings and sizes from the worker count towards this process
+        if recorded:
+            metrics.REGISTRY.merge(recorded)
+        if error is not None:
+            raise error
+        return result
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Start the worker processes on first use"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self._workers)
+            return self._executor
+
+    def shutdown(self) -> None:
+        """Stop the worker processes, cancelling queued jobs"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+def get_pool() -> CodecPool:
+    """
+    Get the codec pool of the current app, creating it on first use.
+
+    Created lazily because the factory registers routes before the
+    configuration is loaded.
+
+    Returns:
+        The app's CodecPool
+    """
+    extensions = current_app.extensions
+    pool = extensions.get(_EXTENSION_KEY)
+    if pool is None:
+        with _pool_lock:
+            pool = extensions.get(_EXTENSION_KEY)
+            if pool is None:
+                pool = CodecPool.from_config(current_app.config)
+                extensions[_EXTENSION_KEY] = pool
+                atexit.register(pool.shutdown)
+    return pool
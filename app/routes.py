@@ -2,14 +2,41 @@
 API routes for the Huffman coding application
 """
 
-from flask import Blueprint, render_template, request, jsonify
-from typing import Dict, Any
+import base64
+import binascii
+import io
 
+from flask import Blueprint, Response, current_app, render_template, request, jsonify
+from typing import Dict, Any, Iterator, List, Optional
+from werkzeug.wsgi import get_input_stream
+
+from huffman import metrics
+from huffman.cache import default_cache
+from huffman.canonical import deserialize_code_lengths, serialize_code_lengths
 from huffman.coding import HuffmanCoding, EncodingError, DecodingError
+from huffman.container import iter_compress_blocks, iter_decompress
+from huffman.dictionary import decode_message
+
+from .offload import JobTimeout, PoolOverloaded, get_pool
+from .warmup import get_dictionaries
 
 # Create blueprint
 api_bp = Blueprint('api', __name__)
 
+# Defaults when the app config does not set BATCH_MAX_ITEMS / BATCH_WORKERS
+DEFAULT_BATCH_MAX_ITEMS = 10000
+DEFAULT_BATCH_WORKERS = 1
+
+# /encode response shapes: everything for the web UI, or just enough to decode
+ENCODE_MODES = ('full', 'lean')
+
+# Defaults for the raw-body endpoints when the app config does not set
+# STREAM_BLOCK_SIZE / STREAM_WORKERS / STREAM_BUFFER_SIZE; STREAM_MAX_CONTENT_LENGTH
+# defaults to unbounded
+DEFAULT_STREAM_BLOCK_SIZE = 1 << 20
+DEFAULT_STREAM_WORKERS = 1
+DEFAULT_STREAM_BUFFER_SIZE = 16 << 20
+
 
 @api_bp.route('/')
 def index() -> str:
@@ -18,10 +45,19 @@ def index() -> str:
 
 
 @api_bp.route('/encode', methods=['POST'])
-def encode_text() -> tuple[Dict[str, Any], int]:
+def encode_text() -> Any:
     """
     Encode text using Huffman coding.
     
+    ``"mode": "lean"`` returns only what decoding needs: the packed
+    payload in base64, its bit length and the code-length header. The
+    tree layout is built only when ``include_tree`` asks for it, which
+    defaults to on in full mode only.
+    
+    Full mode assigns the classic tree codes, which a frequency table
+    alone decodes; ``"canonical": true`` assigns canonical codes and adds
+    the code-length header. Lean mode is always canonical.
+    
     Returns:
         JSON response with encoded data or error
     """
@@ -37,27 +73,272 @@ def encode_text() -> tuple[Dict[str, Any], int]:
         text = data.get('text', '')
         if not text:
             return {'error': 'No text provided'}, 400
+        if not isinstance(text, str):
+            return {'error': 'Text must be a string'}, 400
+        
+        mode = data.get('mode', 'full')
+        if mode not in ENCODE_MODES:
+            return {'error': f'Unknown mode: {mode}'}, 400
+        include_tree = bool(data.get('include_tree', mode == 'full'))
+        canonical = mode == 'lean' or bool(data.get('canonical', False))
         
-        huffman = HuffmanCoding()
+        return get_pool().run(encode_payload, len(text), text, mode, include_tree,
+                              canonical), 200
+    
+    except PoolOverloaded as e:
+        return _busy(e)
+    except JobTimeout as e:
+        return {'error': str(e)}, 504
+    except EncodingError as e:
+        return {'error': f'Encoding error: {str(e)}'}, 400
+    except Exception as e:
+        return {'error': f'Internal server error: {str(e)}'}, 500
+
+
+@api_bp.route('/decode', methods=['POST'])
+def decode_text() -> Any:
+    """
+    Decode Huffman encoded text.
+    
+    A ``bit_length`` marks ``encoded`` as a base64 packed payload from
+    lean ``/encode``; otherwise it is a '0'/'1' string. A frequency table
+    rebuilds the classic tree codes unless ``"canonical": true`` says the
+    payload was encoded with canonical codes.
+    
+    Returns:
+        JSON response with decoded text or error
+    """
+    try:
+        data = request.get_json()
+        if not data:
+            return {'error': 'No JSON data provided'}, 400
+        
+        encoded = data.get('encoded', '')
+        freq_table_list = data.get('frequency_table', [])
+        code_lengths_header = data.get('code_lengths', '')
+        bit_length = data.get('bit_length')
+        canonical = bool(data.get('canonical', False))
+        
+        if not encoded:
+            return {'error': 'No encoded text provided'}, 400
+        if not isinstance(encoded, str):
+            return {'error': 'Encoded text must be a string'}, 400
+        
+        packed = None
+        if bit_length is not None:
+            try:
+                packed = base64.b64decode(encoded, validate=True)
+            except (binascii.Error, TypeError, ValueError):
+                return {'error': 'Invalid packed payload'}, 400
+            if (not isinstance(bit_length, int) or isinstance(bit_length, bool)
+                    or not 0 <= bit_length <= len(packed) * 8):
+                return {'error': 'Invalid bit length'}, 400
+        
+        freq_dict = None
+        code_lengths = None
+        
+        # Compact canonical header takes precedence over the frequency table
+        if code_lengths_header:
+            try:
+                code_lengths = _parse_code_lengths(code_lengths_header, {})
+            except ValueError as e:
+                return {'error': str(e)}, 400
+        elif not freq_table_list:
+            return {'error': 'No frequency table provided'}, 400
+        else:
+            # Convert frequency table back to dict
+            try:
+                freq_dict = {item['char']: item['freq'] for item in freq_table_list}
+            except (KeyError, TypeError):
+                return {'error': 'Invalid frequency table format'}, 400
+        
+        decoded = get_pool().run(decode_payload, len(encoded), encoded, packed,
+                                 bit_length, freq_dict, code_lengths, canonical)
+        return {'decoded': decoded}, 200
+    
+    except PoolOverloaded as e:
+        return _busy(e)
+    except JobTimeout as e:
+        return {'error': str(e)}, 504
+    except DecodingError as e:
+        return {'error': f'Decoding error: {str(e)}'}, 400
+    except Exception as e:
+        return {'error': f'Internal server error: {str(e)}'}, 500
+
+
+def encode_payload(text: str, mode: str, include_tree: bool,
+                   canonical: bool = False) -> Dict[str, Any]:
+    """
+    Build the ``/encode`` response body.
+    
+    Module-level so it can run in an offload worker process.
+    
+    Args:
+        text: Text to encode
+        mode: One of ENCODE_MODES
+        include_tree: Add the tree layout for visualization
+        canonical: Assign canonical codes and return the code-length header
+        
+    Returns:
+        JSON-serializable response body
+        
+    Raises:
+        EncodingError: If encoding fails
+    """
+    huffman = HuffmanCoding(canonical=canonical, cache=default_cache)
+    
+    if mode == 'lean':
+        packed, bit_length, _ = huffman.encode_packed(text)
+        response: Dict[str, Any] = {
+            'encoded': base64.b64encode(packed).decode('ascii'),
+            'bit_length': bit_length,
+            'code_lengths': _code_lengths_header(huffman.code_lengths)
+        }
+    else:
         encoded, freq_table = huffman.encode(text)
         stats = huffman.get_compression_stats(text, encoded)
-        tree_structure = huffman.get_tree_structure()
         
         # Convert data for JSON serialization
         freq_list = [{'char': char, 'freq': freq} for char, freq in freq_table.items()]
         codes_list = [{'char': char, 'code': code} for char, code in huffman.codes.items()]
         
-        return {
+        response = {
             'encoded': encoded,
             'frequency_table': freq_list,
+            'canonical': canonical,
             'huffman_codes': codes_list,
-            'tree_structure': tree_structure,
             'stats': {
                 'original_size': stats.original_size,
                 'compressed_size': stats.compressed_size,
                 'compression_ratio': stats.compression_ratio,
                 'space_saved': stats.space_saved
             }
+        }
+        if canonical:
+            # The header only describes canonical codes
+            response['code_lengths'] = _code_lengths_header(huffman.code_lengths)
+    
+    if include_tree:
+        response['tree_structure'] = huffman.get_tree_structure()
+    return response
+
+
+def decode_payload(encoded: str, packed: Optional[bytes], bit_length: Optional[int],
+                   freq_table: Optional[Dict[str, int]],
+                   code_lengths: Optional[Dict[str, int]],
+                   canonical: bool = False) -> str:
+    """
+    Decode a validated ``/decode`` request.
+    
+    Module-level so it can run in an offload worker process.
+    
+    Args:
+        encoded: Binary string, ignored when ``packed`` is given
+        packed: Packed payload, or None
+        bit_length: Meaningful bits in ``packed``
+        freq_table: Character frequency mapping
+        code_lengths: Canonical code lengths, used instead of ``freq_table``
+        canonical: Whether ``freq_table`` was encoded with canonical codes
+        
+    Returns:
+        Decoded text
+        
+    Raises:
+        DecodingError: If decoding fails
+    """
+    huffman = HuffmanCoding(canonical=canonical or code_lengths is not None,
+                            cache=default_cache)
+    if packed is not None:
+        return huffman.decode_packed(packed, bit_length or 0, freq_table, code_lengths)
+    return huffman.decode(encoded, freq_table, code_lengths)
+
+
+def _busy(error: Exception) -> tuple[Dict[str, Any], int, Dict[str, str]]:
+    """Build the 503 response sent when the offload pool is full"""
+    return {'error': str(error)}, 503, {'Retry-After': '1'}
+
+
+def _batch_items(data: Optional[Dict[str, Any]]) -> List[Any]:
+    """
+    Pull the ``items`` array out of a batch request.
+    
+    Raises:
+        ValueError: If the array is missing, empty or too long
+    """
+    if not isinstance(data, dict) or not data:
+        raise ValueError('No JSON data provided')
+    items = data.get('items')
+    if not isinstance(items, list) or not items:
+        raise ValueError('No items provided')
+    limit = current_app.config.get('BATCH_MAX_ITEMS', DEFAULT_BATCH_MAX_ITEMS)
+    if len(items) > limit:
+        raise ValueError(f'Too many items: {len(items)} > {limit}')
+    return items
+
+
+def _parse_code_lengths(header: str,
+                        parsed: Dict[str, Dict[str, int]]) -> Dict[str, int]:
+    """
+    Decode a base64 code-length header, reusing ones already seen in the request.
+    
+    Raises:
+        ValueError: If the header is malformed
+    """
+    if header not in parsed:
+        try:
+            raw = base64.b64decode(header, validate=True)
+            parsed[header] = deserialize_code_lengths(raw)
+        except (binascii.Error, TypeError, ValueError):
+            raise ValueError('Invalid code lengths format') from None
+    return parsed[header]
+
+
+def _code_lengths_header(code_lengths: Dict[str, int]) -> str:
+    """Serialize code lengths as the base64 header sent to clients"""
+    return base64.b64encode(serialize_code_lengths(code_lengths)).decode('ascii')
+
+
+@api_bp.route('/encode/batch', methods=['POST'])
+def encode_batch() -> tuple[Dict[str, Any], int]:
+    """
+    Encode many texts in one request.
+    
+    With ``shared_table`` every item is coded with one table, sent once
+    as a top-level header; otherwise each item carries its own header.
+    
+    Returns:
+        JSON response with one entry per item, or error
+    """
+    try:
+        if not request.is_json:
+            return {'error': 'Content-Type must be application/json'}, 400
+        
+        data = request.get_json()
+        try:
+            texts = _batch_items(data)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        for index, text in enumerate(texts):
+            if not isinstance(text, str) or not text:
+                return {'error': f'Item {index}: No text provided'}, 400
+        
+        shared = bool(data.get('shared_table', False))
+        huffman = HuffmanCoding(canonical=True, cache=default_cache)
+        results = huffman.encode_many(
+            texts, shared=shared,
+            workers=current_app.config.get('BATCH_WORKERS', DEFAULT_BATCH_WORKERS))
+        
+        if shared:
+            return {
+                'code_lengths': _code_lengths_header(huffman.code_lengths),
+                'items': [{'encoded': encoded} for encoded, _ in results]
+            }, 200
+        
+        return {
+            'items': [{'encoded': encoded,
+                       'code_lengths': _code_lengths_header(
+                           huffman.code_lengths_for(freq_table))}
+                      for encoded, freq_table in results]
         }, 200
     
     except EncodingError as e:
@@ -66,45 +347,213 @@ def encode_text() -> tuple[Dict[str, Any], int]:
         return {'error': f'Internal server error: {str(e)}'}, 500
 
 
-@api_bp.route('/decode', methods=['POST'])
-def decode_text() -> tuple[Dict[str, Any], int]:
+@api_bp.route('/decode/batch', methods=['POST'])
+def decode_batch() -> tuple[Dict[str, Any], int]:
     """
-    Decode Huffman encoded text.
+    Decode many encoded items in one request.
+    
+    Each item carries its own ``code_lengths`` header or falls back to
+    the top-level one from a shared-table ``/encode/batch`` response.
     
     Returns:
-        JSON response with decoded text or error
+        JSON response with one decoded text per item, or error
     """
     try:
         data = request.get_json()
-        if not data:
-            return {'error': 'No JSON data provided'}, 400
-        
-        encoded = data.get('encoded', '')
-        freq_table_list = data.get('frequency_table', [])
-        
-        if not encoded:
-            return {'error': 'No encoded text provided'}, 400
-        
-        if not freq_table_list:
-            return {'error': 'No frequency table provided'}, 400
-        
-        # Convert frequency table back to dict
         try:
-            freq_dict = {item['char']: item['freq'] for item in freq_table_list}
-        except (KeyError, TypeError):
-            return {'error': 'Invalid frequency table format'}, 400
+            items = _batch_items(data)
+        except ValueError as e:
+            return {'error': str(e)}, 400
         
-        huffman = HuffmanCoding()
-        decoded = huffman.decode(encoded, freq_dict)
+        parsed: Dict[str, Dict[str, int]] = {}
+        shared_header = data.get('code_lengths', '')
+        encoded: List[str] = []
+        code_lengths: List[Optional[Dict[str, int]]] = []
+        for index, item in enumerate(items):
+            if not isinstance(item, dict) or not item.get('encoded'):
+                return {'error': f'Item {index}: No encoded text provided'}, 400
+            header = item.get('code_lengths') or shared_header
+            if not header:
+                return {'error': f'Item {index}: No code lengths provided'}, 400
+            try:
+                code_lengths.append(_parse_code_lengths(header, parsed))
+            except ValueError as e:
+                return {'error': f'Item {index}: {str(e)}'}, 400
+            encoded.append(item['encoded'])
         
-        return {'decoded': decoded}, 200
+        huffman = HuffmanCoding(canonical=True, cache=default_cache)
+        decoded = huffman.decode_many(
+            encoded, code_lengths=code_lengths,
+            workers=current_app.config.get('BATCH_WORKERS', DEFAULT_BATCH_WORKERS))
+        
+        return {'items': [{'decoded': text} for text in decoded]}, 200
     
-    except DecodingError as e:
+    except (DecodingError, ValueError) as e:
         return {'error': f'Decoding error: {str(e)}'}, 400
     except Exception as e:
         return {'error': f'Internal server error: {str(e)}'}, 500
 
 
+def _raw_body() -> Any:
+    """
+    Open the request body as a stream, bypassing form and JSON parsing.
+    
+    Uses ``STREAM_MAX_CONTENT_LENGTH`` (unbounded by default) instead of
+    the ``MAX_CONTENT_LENGTH`` cap meant for JSON requests.
+    """
+    limit = current_app.config.get('STREAM_MAX_CONTENT_LENGTH')
+    return get_input_stream(request.environ, max_content_length=limit)
+
+
+def _stream_response(pieces: Iterator[bytes]) -> Response:
+    """
+    Send ``pieces`` as a streamed binary response.
+    
+    The first piece is produced up front, so malformed input still gets
+    a JSON error status; a failure after that can only abort the stream.
+    
+    Raises:
+        EncodingError, DecodingError, ValueError: From the first piece
+    """
+    first = next(pieces, b'')
+    
+    def generate() -> Iterator[bytes]:
+        yield first
+        yield from pieces
+    
+    return Response(generate(), mimetype='application/octet-stream')
+
+
+@api_bp.route('/compress', methods=['POST'])
+def compress_body() -> Any:
+    """
+    Compress the raw request body into a block container.
+    
+    The body is read and coded a block at a time and each block record
+    is sent as soon as it is ready, so memory stays bounded by the block
+    size whatever the upload size.
+    
+    Returns:
+        Streamed ``application/octet-stream`` container, or JSON error
+    """
+    try:
+        config = current_app.config
+        pieces = iter_compress_blocks(
+            _raw_body(),
+            block_size=config.get('STREAM_BLOCK_SIZE', DEFAULT_STREAM_BLOCK_SIZE),
+            workers=config.get('STREAM_WORKERS', DEFAULT_STREAM_WORKERS))
+        return _stream_response(pieces)
+    except (EncodingError, ValueError) as e:
+        return {'error': f'Encoding error: {str(e)}'}, 400
+
+
+@api_bp.route('/decompress', methods=['POST'])
+def decompress_body() -> Any:
+    """
+    Decompress a container sent as the raw request body.
+    
+    Accepts both container versions. Block containers are verified block
+    by block before each is sent. Bodies of at most ``STREAM_BUFFER_SIZE``
+    bytes are buffered, so a truncated container is refused before any
+    output. Larger bodies are streamed through; a truncation or corrupted
+    block found after the first block aborts the connection mid-response.
+    
+    Returns:
+        Streamed ``application/octet-stream`` original bytes, or JSON error
+    """
+    try:
+        config = current_app.config
+        body = _raw_body()
+        limit = config.get('STREAM_BUFFER_SIZE', DEFAULT_STREAM_BUFFER_SIZE)
+        if request.content_length is not None and request.content_length <= limit:
+            # Seekable, so the container's end is checked before decoding
+            body = io.BytesIO(body.read())
+        workers = config.get('STREAM_WORKERS', DEFAULT_STREAM_WORKERS)
+        pieces = iter_decompress(body, workers=workers)
+        return _stream_response(pieces)
+    except DecodingError as e:
+        return {'error': f'Decoding error: {str(e)}'}, 400
+
+
+@api_bp.route('/dictionary/encode', methods=['POST'])
+def dictionary_encode() -> tuple[Dict[str, Any], int]:
+    """
+    Encode text against a static dictionary from ``DICTIONARY_PATHS``.
+    
+    The message carries no code table, only the dictionary ID, so short
+    texts cost a few bytes of header instead of a frequency table.
+    
+    Returns:
+        JSON response with the base64 message and its dictionary ID
+    """
+    if not request.is_json:
+        return {'error': 'Content-Type must be application/json'}, 400
+    data = request.get_json()
+    if not isinstance(data, dict):
+        return {'error': 'No JSON data provided'}, 400
+    
+    text = data.get('text', '')
+    dict_id = data.get('dict_id')
+    if not isinstance(text, str):
+        return {'error': 'Text must be a string'}, 400
+    dictionary = None
+    if isinstance(dict_id, int):
+        dictionary = get_dictionaries(current_app).get(dict_id)
+    if dictionary is None:
+        return {'error': f'Unknown dictionary ID {dict_id}'}, 400
+    
+    encoded = base64.b64encode(dictionary.encode(text)).decode('ascii')
+    return {'encoded': encoded, 'dict_id': dictionary.dict_id}, 200
+
+
+@api_bp.route('/dictionary/decode', methods=['POST'])
+def dictionary_decode() -> tuple[Dict[str, Any], int]:
+    """
+    Decode a message from ``/dictionary/encode``.
+    
+    The dictionary is picked by the ID in the message header.
+    
+    Returns:
+        JSON response with decoded text or error
+    """
+    if not request.is_json:
+        return {'error': 'Content-Type must be application/json'}, 400
+    data = request.get_json()
+    if not isinstance(data, dict):
+        return {'error': 'No JSON data provided'}, 400
+    
+    encoded = data.get('encoded', '')
+    if not encoded or not isinstance(encoded, str):
+        return {'error': 'No encoded message provided'}, 400
+    try:
+        message = base64.b64decode(encoded, validate=True)
+    except (binascii.Error, ValueError):
+        return {'error': 'Invalid encoded message'}, 400
+    
+    try:
+        return {'decoded': decode_message(message, get_dictionaries(current_app))}, 200
+    except DecodingError as e:
+        return {'error': f'Decoding error: {str(e)}'}, 400
+
+
+@api_bp.route('/metrics')
+def metrics_endpoint() -> Any:
+    """
+    Expose codec and HTTP metrics.
+    
+    Covers every worker sharing ``METRICS_DIR``, or just this process
+    when it is not set. Jobs run in offload processes count towards the
+    worker that sent them.
+    
+    Returns:
+        Prometheus text exposition, or a JSON 404 while metrics are disabled
+    """
+    if not metrics.is_enabled():
+        return {'error': 'Metrics are disabled'}, 404
+    return Response(metrics.render(),
+                    content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
 @api_bp.errorhandler(404)
 def not_found(error) -> tuple[Dict[str, str], int]:
     """Handle 404 errors"""
@@ -0,0 +1,81 @@
+"""
+Start-up warm-up so the first real requests do not pay for cold caches
+"""
+
+from typing import Dict
+
+from flask import Flask
+
+from huffman.dictionary import HuffmanDictionary
+
+# Mixed-case ASCII with digits and punctuation, like typical API traffic
+WARMUP_TEXT = (
+    "The quick brown fox jumps over the lazy dog. "
+    "PACK MY BOX WITH FIVE DOZEN LIQUOR JUGS! 0123456789 {\"id\": 42, \"ok\": true}\n"
+)
+
+_DICTIONARIES_KEY = 'huffman_dictionaries'
+
+
+def warm_up(app: Flask) -> None:
+    """
+    Run each endpoint and loaded dictionary once.
+
+    Run in the gunicorn master before forking, so every worker inherits
+    the imported modules, compiled templates and filled code-table cache
+    instead of building them on its first requests.
+
+    Args:
+        app: Configured application
+
+    Raises:
+        RuntimeError: If an endpoint fails, so a broken build never
+            starts serving
+    """
+    dictionaries = get_dictionaries(app)
+
+    with app.test_client() as client:
+        checks = [client.get('/')]
+        for mode in ('full', 'lean'):
+            encoded = client.post('/encode', json={'text': WARMUP_TEXT, 'mode': mode})
+            checks.append(encoded)
+            checks.append(client.post('/decode', json=encoded.get_json()))
+        compressed = client.post('/compress', data=WARMUP_TEXT.encode('utf-8'))
+        checks.append(client.post('/decompress', data=compressed.data))
+        for dict_id in dictionaries:
+            encoded = client.post('/dictionary/encode',
+                                  json={'text': WARMUP_TEXT, 'dict_id': dict_id})
+            checks.append(encoded)
+            checks.append(client.post('/dictionary/decode', json=encoded.get_json()))
+
+    failed = [response.request.path for response in checks
+              if response.status_code != 200]
+    if failed:
+        raise RuntimeError(f"Warm-up failed for {', '.join(failed)}")
+
+    app.logger.info('Warm-up complete, %d dictionaries loaded', len(dictionaries))
+
+
+def load_dictionaries(app: Flask) -> Dict[int, HuffmanDictionary]:
+    """
+    Load the dictionaries named by ``DICTIONARY_PATHS``, keyed by ID.
+
+    Called by the app factory; the result is what the ``/dictionary``
+    endpoints can code with, see :func:`get_dictionaries`.
+
+    Args:
+        app: Configured application
+
+    Returns:
+        Loaded dictionaries by dictionary ID
+    """
+    dictionaries = app.extensions.setdefault(_DICTIONARIES_KEY, {})
+    for path in app.config.get('DICTIONARY_PATHS', []):
+        dictionary = HuffmanDictionary.load(path)
+        dictionaries[dictionary.dict_id] = dictionary
+    return dictionaries
+
+
+def get_dictionaries(app: Flask) -> Dict[int, HuffmanDictionary]:
+    """Dictionaries loaded for ``app`` by :func:`load_dictionaries`, keyed by ID"""
+    return app.extensions.get(_DICTIONARIES_KEY, {})
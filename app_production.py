@@ -1,25 +1,36 @@
 #!/usr/bin/env python3
 """
 Production startup script for Render deployment
+
+Starts gunicorn with gunicorn.conf.py: preforked, pre-warmed workers
+serving wsgi:app. Falls back to the single-process development server
+only when gunicorn is not installed (e.g. on Windows).
 """
 
 import os
-from app import create_app
+import sys
+
+# Importing wsgi creates and warms the app; re-exported for "app_production:app"
+from wsgi import app
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                           'gunicorn.conf.py')
+
+
+def main() -> None:
+    """Launch the production server"""
+    try:
+        from gunicorn.app.wsgiapp import run
+    except ImportError:
+        app.logger.warning('gunicorn is not installed, using the development server')
+        # Get port from environment (Render sets this)
+        port = int(os.environ.get('PORT', 5000))
+        app.run(host='0.0.0.0', port=port, debug=False)
+        return
 
-# Create the application with production config
-app = create_app()
+    sys.argv = [sys.argv[0], '--config', CONFIG_PATH, 'wsgi:app', *sys.argv[1:]]
+    run()
 
-# Set production configuration
-app.config.update(
-    DEBUG=False,
-    TESTING=False,
-    SECRET_KEY=os.environ.get('SECRET_KEY', 'prod-secret-key-change-me'),
-    JSON_AS_ASCII=False
-)
 
 if __name__ == '__main__':
-    # Get port from environment (Render sets this)
-    port = int(os.environ.get('PORT', 5000))
-    
-    # Run the app (bind to all interfaces for cloud deployment)
-    app.run(host='0.0.0.0', port=port, debug=False)
+    main()
@@ -0,0 +1,3 @@
+"""
+Reproducible benchmark suite: python -m benchmarks {run,compare} ...
+"""
@@ -0,0 +1,110 @@
+"""
+Command-line interface: python -m benchmarks {run,compare} ...
+"""
+
+import argparse
+import json
+import sys
+from typing import List, Optional
+
+from .compare import compare, format_report
+from .corpora import CORPORA, format_size, parse_size
+from .suite import BENCHMARKS, DEFAULT_HTTP_MAX_SIZE, DEFAULT_SIZES, run_suite
+
+
+def _names(text: str) -> List[str]:
+    return [name for name in text.split(",") if name]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Create the argument parser for the benchmark CLI"""
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Run the Huffman benchmark suite and compare results "
+                    "between commits",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run = subparsers.add_parser("run", help="run benchmarks and write results as JSON")
+    run.add_argument("--sizes", default=",".join(map(format_size, DEFAULT_SIZES)),
+                     help="comma-separated corpus sizes, 1KB to 1GB "
+                          "(default: %(default)s)")
+    run.add_argument("--corpora", default=",".join(CORPORA),
+                     help="comma-separated corpora (default: %(default)s)")
+    run.add_argument("--benchmarks", default=",".join(BENCHMARKS),
+                     help="comma-separated benchmarks (default: %(default)s)")
+    run.add_argument("--repeats", type=int, default=5,
+                     help="timed runs per case (default: %(default)s)")
+    run.add_argument("--warmup", type=int, default=1,
+                     help="untimed runs per case (default: %(default)s)")
+    run.add_argument("--no-memory", action="store_true",
+                     help="skip the tracemalloc run that measures peak memory")
+    run.add_argument("--http-max-size", default=format_size(DEFAULT_HTTP_MAX_SIZE),
+                     help="largest corpus sent through HTTP (default: %(default)s)")
+    run.add_argument("-o", "--output", help="write results to this JSON file")
+
+    cmp = subparsers.add_parser("compare", help="compare two result files")
+    cmp.add_argument("baseline", help="results of the reference commit")
+    cmp.add_argument("current", help="results to check")
+    cmp.add_argument("--threshold", type=float, default=0.10,
+                     help="relative slowdown flagged as a regression "
+                          "(default: %(default)s)")
+    cmp.add_argument("--statistic", default="p50_ns",
+                     choices=("min_ns", "p50_ns", "p90_ns", "p99_ns", "mean_ns"),
+                     help="summary compared (default: %(default)s)")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run the benchmark CLI.
+
+    Args:
+        argv: Command-line arguments, defaults to ``sys.argv[1:]``
+
+    Returns:
+        Process exit code; 1 when ``compare`` finds a regression
+    """
+    args = build_parser().parse_args(argv)
+
+    if args.command == "compare":
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        with open(args.current) as f:
+            current = json.load(f)
+        comparisons = compare(baseline, current, args.statistic)
+        print(format_report(comparisons, args.threshold))
+        regressions = [item for item in comparisons
+                       if item.is_regression(args.threshold)]
+        if regressions:
+            print(f"{len(regressions)} regression(s) above {args.threshold:.0%}",
+                  file=sys.stderr)
+            return 1
+        return 0
+
+    try:
+        results = run_suite(
+            sizes=[parse_size(size) for size in _names(args.sizes)],
+            corpora=_names(args.corpora),
+            benchmarks=_names(args.benchmarks),
+            repeats=args.repeats,
+            warmup=args.warmup,
+            track_memory=not args.no_memory,
+            http_max_size=parse_size(args.http_max_size),
+            progress=lambda line: print(line, file=sys.stderr),
+        )
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
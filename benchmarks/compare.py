@@ -0,0 +1,56 @@
+"""
+Compare two result files and flag regressions
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+
+@dataclass
+class Comparison:
+    """Change of one case between a baseline and a current run"""
+    key: str
+    baseline_ns: float
+    current_ns: float
+
+    @property
+    def change(self) -> float:
+        """Relative change in time; positive means slower"""
+        return self.current_ns / self.baseline_ns - 1 if self.baseline_ns else 0.0
+
+    def is_regression(self, threshold: float) -> bool:
+        """Whether the case got slower by more than ``threshold``"""
+        return self.change > threshold
+
+
+def _by_key(results: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    return {f"{entry['benchmark']}/{entry['corpus']}/{entry['size']}": entry
+            for entry in results["results"]}
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any],
+            statistic: str = "p50_ns") -> List[Comparison]:
+    """
+    Pair up cases present in both runs.
+
+    Args:
+        baseline: Results from :func:`benchmarks.suite.run_suite`
+        current: Results to check against the baseline
+        statistic: Summary field to compare, e.g. ``p50_ns`` or ``p90_ns``
+
+    Returns:
+        One comparison per shared case, in the current run's order
+    """
+    old = _by_key(baseline)
+    return [Comparison(key, old[key][statistic], entry[statistic])
+            for key, entry in _by_key(current).items() if key in old]
+
+
+def format_report(comparisons: List[Comparison], threshold: float) -> str:
+    """Render comparisons as a table, marking regressions"""
+    lines = [f"{'case':<42} {'baseline ms':>12} {'current ms':>12} {'change':>8}"]
+    for item in comparisons:
+        flag = "  REGRESSION" if item.is_regression(threshold) else ""
+        lines.append(f"{item.key:<42} {item.baseline_ns / 1e6:12.3f} "
+                     f"{item.current_ns / 1e6:12.3f} {item.change:+8.1%}{flag}")
+    return "\n".join(lines)
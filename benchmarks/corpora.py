@@ -0,0 +1,113 @@
+"""
+Deterministic benchmark corpora from 1 KB to 1 GB
+"""
+
+import random
+import re
+import string
+from typing import Callable, Dict, Union
+
+Corpus = Union[str, bytes]
+
+# Large corpora tile a seeded block of this many symbols, so generating
+# 1 GB costs one block of random draws plus a copy
+_BLOCK_SYMBOLS = 1 << 20
+
+_SEED = 20240601
+
+_UNITS = {"B": 1, "KB": 1 << 10, "MB": 1 << 20, "GB": 1 << 30}
+
+# English letter frequencies (percent), with space
+_ENGLISH_CHARS = "etaoinshrdlcumwfgypbvkjxqz ,.\n"
+_ENGLISH_WEIGHTS = [12.7, 9.1, 8.2, 7.5, 7.0, 6.3, 6.1, 6.0, 5.9, 4.3, 4.0, 2.8,
+                    2.8, 2.4, 2.4, 2.0, 2.0, 1.9, 1.5, 1.3, 1.0, 0.15, 0.15, 0.10,
+                    0.07, 0.05, 18.0, 1.2, 1.0, 0.4]
+
+
+def parse_size(text: str) -> int:
+    """
+    Parse a size such as ``64KB`` or ``1GB`` (binary units) into symbols.
+
+    Raises:
+        ValueError: If the size is malformed or not positive
+    """
+    match = re.fullmatch(r"\s*(\d+)\s*([KMG]?B)?\s*", text.upper())
+    if not match or not int(match.group(1)):
+        raise ValueError(f"Invalid size: {text!r}")
+    return int(match.group(1)) * _UNITS[match.group(2) or "B"]
+
+
+def format_size(size: int) -> str:
+    """Render a size with the largest binary unit dividing it"""
+    for unit in ("GB", "MB", "KB"):
+        if size % _UNITS[unit] == 0:
+            return f"{size // _UNITS[unit]}{unit}"
+    return f"{size}B"
+
+
+def _tile(block: Corpus, size: int) -> Corpus:
+    """Repeat ``block`` out to exactly ``size`` symbols"""
+    return (block * (size // len(block) + 1))[:size]
+
+
+def uniform(size: int, rng: random.Random) -> str:
+    """Lowercase letters and space, all equally likely"""
+    return "".join(rng.choices(string.ascii_lowercase + " ", k=size))
+
+
+def english(size: int, rng: random.Random) -> str:
+    """Characters drawn with English letter frequencies"""
+    return "".join(rng.choices(_ENGLISH_CHARS, weights=_ENGLISH_WEIGHTS, k=size))
+
+
+def repetitive(size: int, rng: random.Random) -> str:
+    """A short skewed pattern repeated, like logs or padding"""
+    return _tile("AAAAAABBBBCCCDDE", size)  # type: ignore[return-value]
+
+
+def unicode_heavy(size: int, rng: random.Random) -> str:
+    """Mixed scripts: ASCII, Cyrillic, CJK and astral-plane emoji"""
+    alphabet = (string.ascii_letters + " " +
+                "".join(map(chr, range(0x0410, 0x0450))) +
+                "".join(map(chr, range(0x4E00, 0x4E00 + 500))) +
+                "".join(map(chr, range(0x1F600, 0x1F650))))
+    weights = [1 / (rank + 1) for rank in range(len(alphabet))]
+    rng.shuffle(weights)
+    return "".join(rng.choices(alphabet, weights=weights, k=size))
+
+
+def binary(size: int, rng: random.Random) -> bytes:
+    """Bytes skewed towards zero and small values, like executables"""
+    weights = [64.0] + [16.0 / (value + 1) for value in range(1, 256)]
+    return bytes(rng.choices(range(256), weights=weights, k=size))
+
+
+CORPORA: Dict[str, Callable[[int, random.Random], Corpus]] = {
+    "uniform": uniform,
+    "english": english,
+    "repetitive": repetitive,
+    "unicode": unicode_heavy,
+    "binary": binary,
+}
+
+
+def generate(name: str, size: int) -> Corpus:
+    """
+    Build corpus ``name`` with exactly ``size`` symbols.
+
+    The same name and size always give the same data, so results from
+    different commits are comparable.
+
+    Args:
+        name: Key of :data:`CORPORA`
+        size: Characters, or bytes for the binary corpus
+
+    Returns:
+        The corpus as str, or bytes for ``binary``
+
+    Raises:
+        KeyError: If the corpus is unknown
+    """
+    rng = random.Random(f"{_SEED}:{name}")
+    block = CORPORA[name](min(size, _BLOCK_SYMBOLS), rng)
+    return block if len(block) == size else _tile(block, size)
@@ -0,0 +1,113 @@
+"""
+Timing harness: warm-ups, repeats, percentiles and peak memory
+"""
+
+import gc
+import math
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+def percentile(samples: Sequence[int], q: float) -> float:
+    """
+    Linearly interpolated percentile of ``samples``.
+
+    Args:
+        samples: Observations, in any order
+        q: Percentile between 0 and 100
+
+    Returns:
+        The percentile value
+    """
+    ordered = sorted(samples)
+    rank = (len(ordered) - 1) * q / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+@dataclass
+class Measurement:
+    """Timings of one benchmark on one corpus"""
+    benchmark: str
+    corpus: str
+    size: int
+    input_bytes: int
+    samples_ns: List[int] = field(default_factory=list)
+    peak_bytes: Optional[int] = None
+
+    @property
+    def key(self) -> str:
+        """Identity used to match results across runs"""
+        return f"{self.benchmark}/{self.corpus}/{self.size}"
+
+    def summary(self) -> Dict[str, float]:
+        """Percentiles in nanoseconds and median throughput"""
+        p50 = percentile(self.samples_ns, 50)
+        return {
+            "min_ns": min(self.samples_ns),
+            "p50_ns": p50,
+            "p90_ns": percentile(self.samples_ns, 90),
+            "p99_ns": percentile(self.samples_ns, 99),
+            "max_ns": max(self.samples_ns),
+            "mean_ns": sum(self.samples_ns) / len(self.samples_ns),
+            "mb_per_s": self.input_bytes / 1e6 / (p50 / 1e9) if p50 else math.inf,
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable record including the summary"""
+        return {**asdict(self), **self.summary()}
+
+
+def measure(fn: Callable[[], Any], repeats: int = 5, warmup: int = 1,
+            track_memory: bool = True) -> Tuple[List[int], Optional[int]]:
+    """
+    Time ``fn`` with ``perf_counter_ns``.
+
+    The collector runs before each sample and is paused during it, as
+    in :mod:`timeit`. Peak memory comes from one extra ``tracemalloc``
+    run, kept out of the timings because tracing slows allocation.
+
+    Args:
+        fn: Zero-argument callable to time
+        repeats: Timed runs
+        warmup: Untimed runs first, to fill caches
+        track_memory: Measure peak traced memory
+
+    Returns:
+        Tuple of (samples in nanoseconds, peak bytes or None)
+
+    Raises:
+        ValueError: If ``repeats`` is not positive
+    """
+    if repeats < 1:
+        raise ValueError("At least one repeat is required")
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+    enabled = gc.isenabled()
+    try:
+        for _ in range(repeats):
+            gc.collect()
+            gc.disable()
+            start = time.perf_counter_ns()
+            fn()
+            samples.append(time.perf_counter_ns() - start)
+            if enabled:
+                gc.enable()
+    finally:
+        if enabled:
+            gc.enable()
+
+    peak = None
+    if track_memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            fn()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return samples, peak
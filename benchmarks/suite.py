@@ -0,0 +1,164 @@
+"""
+Benchmark cases: encode, decode, tree build and HTTP round trip
+"""
+
+import datetime
+import os
+import platform
+import subprocess
+import sys
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from huffman.byte_coding import ByteHuffmanCoding
+from huffman.coding import HuffmanCoding
+
+from .corpora import CORPORA, Corpus, format_size, generate
+from .harness import Measurement, measure
+
+BENCHMARKS = ("encode", "decode", "tree_build", "http_round_trip")
+
+DEFAULT_SIZES = (1 << 10, 64 << 10, 1 << 20, 16 << 20)
+
+# Largest corpus sent through the HTTP round trip (JSON or raw body)
+DEFAULT_HTTP_MAX_SIZE = 16 << 20
+
+Case = Callable[[], Any]
+
+
+def _text_cases(text: str) -> Dict[str, Case]:
+    """Build the timed callables for a text corpus"""
+    huffman = HuffmanCoding(canonical=True)
+    packed, bit_length, freq_table = huffman.encode_packed(text)
+    if huffman.decode_packed(packed, bit_length, freq_table) != text:
+        raise AssertionError("Round trip mismatch")
+
+    def http_round_trip() -> None:
+        client = _client()
+        encoded = client.post('/encode', json={'text': text, 'mode': 'lean'}).get_json()
+        if client.post('/decode', json=encoded).get_json()['decoded'] != text:
+            raise AssertionError("HTTP round trip mismatch")
+
+    # A fresh coder per run, so every case pays for building its codes
+    def coder() -> HuffmanCoding:
+        return HuffmanCoding(canonical=True)
+
+    return {
+        "encode": lambda: coder().encode_packed(text),
+        "decode": lambda: coder().decode_packed(packed, bit_length, freq_table),
+        "tree_build": lambda: coder().code_lengths_for(freq_table),
+        "http_round_trip": http_round_trip,
+    }
+
+
+def _binary_cases(data: bytes) -> Dict[str, Case]:
+    """Build the timed callables for a binary corpus"""
+    payload, bit_length, lengths = ByteHuffmanCoding().encode(data)
+    if ByteHuffmanCoding().decode(payload, bit_length, lengths) != data:
+        raise AssertionError("Round trip mismatch")
+    counter = Counter(data)
+    counts = [counter.get(byte, 0) for byte in range(256)]
+
+    def http_round_trip() -> None:
+        client = _client()
+        compressed = client.post('/compress', data=data).data
+        if client.post('/decompress', data=compressed).data != data:
+            raise AssertionError("HTTP round trip mismatch")
+
+    return {
+        "encode": lambda: ByteHuffmanCoding().encode(data),
+        "decode": lambda: ByteHuffmanCoding().decode(payload, bit_length, lengths),
+        "tree_build": lambda: ByteHuffmanCoding().build_codes(counts),
+        "http_round_trip": http_round_trip,
+    }
+
+
+_app_client = None
+
+
+def _client() -> Any:
+    """Flask test client, created once; requests skip the network"""
+    global _app_client
+    if _app_client is None:
+        from app import create_app
+        _app_client = create_app().test_client()
+    return _app_client
+
+
+def _input_bytes(corpus: Corpus) -> int:
+    """Size of the corpus as transmitted (UTF-8 for text)"""
+    return len(corpus) if isinstance(corpus, bytes) else len(corpus.encode("utf-8"))
+
+
+def environment() -> Dict[str, Any]:
+    """Describe the machine and code the results came from"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+    }
+
+
+def run_suite(sizes: Sequence[int] = DEFAULT_SIZES,
+              corpora: Sequence[str] = tuple(CORPORA),
+              benchmarks: Sequence[str] = BENCHMARKS,
+              repeats: int = 5, warmup: int = 1, track_memory: bool = True,
+              http_max_size: int = DEFAULT_HTTP_MAX_SIZE,
+              progress: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+    """
+    Run every benchmark on every corpus and size.
+
+    Args:
+        sizes: Corpus sizes in symbols
+        corpora: Names from :data:`benchmarks.corpora.CORPORA`
+        benchmarks: Names from :data:`BENCHMARKS`
+        repeats: Timed runs per case
+        warmup: Untimed runs per case
+        track_memory: Record peak traced memory per case
+        http_max_size: Skip the HTTP round trip above this size
+        progress: Called with a line per finished case
+
+    Returns:
+        JSON-serializable results with an ``environment`` and ``results``
+
+    Raises:
+        ValueError: If a corpus or benchmark name is unknown
+    """
+    unknown = [name for name in corpora if name not in CORPORA]
+    unknown += [name for name in benchmarks if name not in BENCHMARKS]
+    if unknown:
+        raise ValueError(f"Unknown corpora or benchmarks: {', '.join(unknown)}")
+
+    results: List[Dict[str, Any]] = []
+    for size in sizes:
+        for corpus_name in corpora:
+            corpus = generate(corpus_name, size)
+            input_bytes = _input_bytes(corpus)
+            if isinstance(corpus, bytes):
+                cases = _binary_cases(corpus)
+            else:
+                cases = _text_cases(corpus)
+            for benchmark in benchmarks:
+                if benchmark == "http_round_trip" and size > http_max_size:
+                    continue
+                samples, peak = measure(cases[benchmark], repeats, warmup, track_memory)
+                measurement = Measurement(benchmark, corpus_name, size, input_bytes,
+                                          samples, peak)
+                results.append(measurement.to_dict())
+                if progress:
+                    summary = measurement.summary()
+                    progress(f"{benchmark:<16} {corpus_name:<11} "
+                             f"{format_size(size):>6}  "
+                             f"p50 {summary['p50_ns'] / 1e6:10.3f} ms  "
+                             f"{summary['mb_per_s']:9.2f} MB/s  "
+                             f"peak {(peak or 0) / (1 << 20):8.2f} MiB")
+            del corpus, cases
+    return {"environment": environment(), "results": results}
@@ -3,7 +3,19 @@ Configuration settings for the Huffman coding application
 """
 
 import os
-from typing import Dict, Any
+import tempfile
+from typing import Dict, Any, Optional
+
+
+def _env_flag(name: str) -> bool:
+    """Read a boolean switch such as ``METRICS_ENABLED=1`` from the environment"""
+    return os.environ.get(name, '').lower() in ('1', 'true', 'yes')
+
+
+def _env_workers(name: str, default: int) -> Optional[int]:
+    """Read a worker count from the environment, ``all`` meaning every CPU"""
+    value = os.environ.get(name, str(default))
+    return None if value.lower() == 'all' else int(value)
 
 
 class Config:
@@ -18,6 +30,45 @@ class Config:
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
     JSON_AS_ASCII = False
     
+    # Every *_WORKERS setting counts worker processes the same way: 0 works
+    # on the request thread, None (``all`` in the environment) uses every
+    # CPU, and N uses up to N processes. Batches and streams also stay on
+    # the request thread with 1, since one process could not overlap work
+    
+    # Batch endpoints: items per request, and worker processes per batch
+    BATCH_MAX_ITEMS = int(os.environ.get('BATCH_MAX_ITEMS', 10000))
+    BATCH_WORKERS = _env_workers('BATCH_WORKERS', 1)
+    
+    # /compress and /decompress: uncompressed bytes per block, worker
+    # processes, and a body limit replacing MAX_CONTENT_LENGTH (None = none)
+    STREAM_BLOCK_SIZE = int(os.environ.get('STREAM_BLOCK_SIZE', 1 << 20))
+    STREAM_WORKERS = _env_workers('STREAM_WORKERS', 1)
+    STREAM_MAX_CONTENT_LENGTH = None
+    # /decompress buffers bodies up to this size, so truncated containers get
+    # 400 before any output; larger ones stream and abort mid-way on errors
+    STREAM_BUFFER_SIZE = int(os.environ.get('STREAM_BUFFER_SIZE', 16 << 20))
+    
+    # /encode and /decode: inputs of at least OFFLOAD_MIN_SIZE characters run
+    # in OFFLOAD_WORKERS processes (0 = always on the request thread, 1 = one
+    # process off the request threads). Beyond OFFLOAD_MAX_PENDING queued
+    # jobs requests get 503; OFFLOAD_TIMEOUT seconds without a result gives 504
+    OFFLOAD_WORKERS = _env_workers('OFFLOAD_WORKERS', 0)
+    OFFLOAD_MIN_SIZE = int(os.environ.get('OFFLOAD_MIN_SIZE', 64 * 1024))
+    OFFLOAD_MAX_PENDING = int(os.environ.get('OFFLOAD_MAX_PENDING', 32))
+    OFFLOAD_TIMEOUT = float(os.environ.get('OFFLOAD_TIMEOUT', 30))
+    
+    # Record codec and HTTP metrics and serve them at /metrics
+    METRICS_ENABLED = _env_flag('METRICS_ENABLED')
+    # Gunicorn workers publish their metrics to METRICS_DIR every
+    # METRICS_SHARE_INTERVAL seconds, so /metrics sums all of them
+    METRICS_DIR = os.environ.get('METRICS_DIR')
+    METRICS_SHARE_INTERVAL = float(os.environ.get('METRICS_SHARE_INTERVAL', 5))
+    
+    # Honour the X-Huffman-Profile request header with a per-stage breakdown
+    # in the response headers; PROFILING_SINK also receives every profile
+    PROFILING_ENABLED = _env_flag('PROFILING_ENABLED')
+    PROFILING_SINK = None
+    
     @staticmethod
     def init_app(app) -> None:
         """Initialize application with this config"""
@@ -27,6 +78,7 @@ class Config:
 class DevelopmentConfig(Config):
     """Development configuration"""
     DEBUG = True
+    PROFILING_ENABLED = True
     
     @classmethod
     def init_app(cls, app) -> None:
@@ -37,6 +89,26 @@ class DevelopmentConfig(Config):
 class ProductionConfig(Config):
     """Production configuration"""
     
+    # Gunicorn launcher (gunicorn.conf.py). The codec is CPU-bound, so one
+    # process per core, with a few threads each to overlap request I/O
+    WORKERS = int(os.environ.get('WEB_CONCURRENCY', os.cpu_count() or 1))
+    WORKER_THREADS = int(os.environ.get('WORKER_THREADS', 4))
+    WORKER_TIMEOUT = int(os.environ.get('WORKER_TIMEOUT', 60))
+    GRACEFUL_TIMEOUT = int(os.environ.get('GRACEFUL_TIMEOUT', 30))
+    # Recycle workers now and then so fragmentation cannot build up
+    MAX_REQUESTS = int(os.environ.get('MAX_REQUESTS', 10000))
+    
+    # Exercise the codec and fill its caches before workers take traffic
+    WARM_UP = True
+    # Dictionaries served by /dictionary/encode and /dictionary/decode,
+    # loaded before the workers fork; separated by os.pathsep
+    DICTIONARY_PATHS = [path for path
+                        in os.environ.get('DICTIONARY_PATHS', '').split(os.pathsep)
+                        if path]
+    # One directory per server, so every worker answers /metrics for all
+    METRICS_DIR = os.environ.get('METRICS_DIR', os.path.join(
+        tempfile.gettempdir(), f"huffman-metrics-{os.environ.get('PORT', '5000')}"))
+    
     @classmethod
     def init_app(cls, app) -> None:
         Config.init_app(app)
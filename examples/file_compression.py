@@ -1,58 +1,41 @@
 # Example: File Compression
 
 import os
-from huffman.coding import HuffmanCoding
+from huffman.container import compress_file as huff_compress_file
+from huffman.container import decompress_file as huff_decompress_file
+from huffman.exceptions import HuffmanCodingError
 
 def compress_file(input_file: str, output_file: str) -> None:
-    """Compress a text file using Huffman coding"""
+    """Compress a file into a binary .huff container"""
     
-    # Read input file
-    try:
-        with open(input_file, 'r', encoding='utf-8') as f:
-            text = f.read()
-    except FileNotFoundError:
+    if not os.path.exists(input_file):
         print(f"Error: File '{input_file}' not found")
         return
-    except Exception as e:
-        print(f"Error reading file: {e}")
-        return
-    
-    if not text:
-        print("Error: File is empty")
-        return
     
-    print(f"Read {len(text)} characters from '{input_file}'")
-    
-    # Compress using Huffman coding
-    huffman = HuffmanCoding()
+    # Stream the file through the codec instead of reading it whole
     try:
-        encoded, freq_table = huffman.encode(text)
-        stats = huffman.get_compression_stats(text, encoded)
-        
-        print(f"\nCompression Results:")
-        print(f"- Original size: {stats.original_size} bits ({stats.original_size // 8} bytes)")
-        print(f"- Compressed size: {stats.compressed_size} bits ({stats.compressed_size // 8} bytes)")
-        print(f"- Space saved: {stats.space_saved:.1f}%")
-        
-        # Save compressed data (simplified - in real implementation you'd save binary)
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(f"# Huffman Compressed File\n")
-            f.write(f"# Original size: {len(text)} chars\n")
-            f.write(f"# Compressed size: {len(encoded)} bits\n")
-            f.write(f"# Frequency table: {freq_table}\n")
-            f.write(f"# Encoded data:\n")
-            f.write(encoded)
-        
-        print(f"Compressed data saved to '{output_file}'")
-        
-    except Exception as e:
+        stats = huff_compress_file(input_file, output_file)
+    except (OSError, HuffmanCodingError) as e:
         print(f"Compression failed: {e}")
+        return
+    
+    print(f"\nCompression Results:")
+    print(f"- Original size: {stats.original_size} bits "
+          f"({stats.original_size // 8} bytes)")
+    print(f"- Compressed size: {stats.compressed_size} bits "
+          f"({stats.compressed_size // 8} bytes)")
+    print(f"- Space saved: {stats.space_saved:.1f}%")
+    print(f"Compressed data saved to '{output_file}'")
 
 def decompress_file(input_file: str, output_file: str) -> None:
-    """Decompress a Huffman compressed file"""
-    # This is a simplified example - real implementation would parse binary format
-    print("Note: This is a simplified decompression example")
-    print("In a real implementation, you'd save/load in binary format")
+    """Decompress a .huff container, verifying its checksum"""
+    try:
+        written = huff_decompress_file(input_file, output_file)
+    except (OSError, HuffmanCodingError) as e:
+        print(f"Decompression failed: {e}")
+        return
+    
+    print(f"Restored {written} bytes to '{output_file}'")
 
 if __name__ == "__main__":
     # Example usage
@@ -82,3 +65,6 @@ if __name__ == "__main__":
         
         print(f"Created sample file '{input_file}'")
         compress_file(input_file, compressed_file)
+    
+    if os.path.exists(compressed_file):
+        decompress_file(compressed_file, "sample_restored.txt")
@@ -0,0 +1,50 @@
+"""
+Gunicorn settings for the production launcher, taken from ProductionConfig
+
+Reloads:
+    kill -HUP <master>     restart workers gracefully, re-reading this file
+    kill -USR2 <master>    start a new master on new code, then -WINCH and
+                           -QUIT the old one for a zero-downtime upgrade.
+                           With preload_app a HUP alone reuses the old code
+"""
+
+import os
+
+from config import ProductionConfig
+from huffman import metrics
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+
+workers = ProductionConfig.WORKERS
+threads = ProductionConfig.WORKER_THREADS
+worker_class = 'gthread'
+timeout = ProductionConfig.WORKER_TIMEOUT
+graceful_timeout = ProductionConfig.GRACEFUL_TIMEOUT
+keepalive = 5
+
+max_requests = ProductionConfig.MAX_REQUESTS
+max_requests_jitter = ProductionConfig.MAX_REQUESTS // 10
+
+# Import and warm the app once in the master; forked workers share the
+# warmed pages copy-on-write and accept traffic already hot
+preload_app = True
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.environ.get('LOG_LEVEL', 'info')
+
+
+def on_starting(server) -> None:
+    """Start metrics from zero, keeping them across HUP reloads"""
+    if ProductionConfig.METRICS_DIR:
+        metrics.clear_shared(ProductionConfig.METRICS_DIR)
+
+
+def post_fork(server, worker) -> None:
+    """Log each worker as it starts serving and publish its metrics"""
+    if ProductionConfig.METRICS_ENABLED and ProductionConfig.METRICS_DIR:
+        # Requests the master made while warming up are not traffic
+        metrics.REGISTRY.reset()
+        metrics.share(ProductionConfig.METRICS_DIR,
+                      ProductionConfig.METRICS_SHARE_INTERVAL)
+    server.log.info("Worker %s ready", worker.pid)
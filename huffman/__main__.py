@@ -0,0 +1,108 @@
+"""
+Command-line interface: python -m huffman {compress,decompress,extract} ...
+"""
+
+import argparse
+import sys
+from typing import List, Optional
+
+from .container import (
+    DEFAULT_BLOCK_SIZE,
+    DEFAULT_CHUNK_SIZE,
+    BlockContainerReader,
+    compress_file,
+    decompress_file,
+)
+from .exceptions import HuffmanCodingError
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Create the argument parser for the CLI"""
+    parser = argparse.ArgumentParser(
+        prog="python -m huffman",
+        description="Compress and decompress files with Huffman coding "
+                    "(.huff containers)",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    for name, help_text in (("compress", "compress INPUT into a .huff container"),
+                            ("decompress", "restore INPUT .huff container to OUTPUT")):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument("input", help="input file path")
+        sub.add_argument("output", help="output file path")
+        sub.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                         help="bytes read per step (default: %(default)s)")
+        sub.add_argument("-j", "--jobs", type=_jobs, default=1,
+                         help="worker processes for block containers, 'all' for "
+                              "every CPU, 0 or 1 in-process (default: %(default)s)")
+        if name == "compress":
+            sub.add_argument("--block-size", type=int, default=None,
+                             help="write a block container with blocks of this "
+                                  "many bytes (default with --jobs: "
+                                  f"{DEFAULT_BLOCK_SIZE})")
+
+    extract = subparsers.add_parser(
+        "extract", help="write bytes START:STOP of a block container to stdout")
+    extract.add_argument("input", help="block container path")
+    extract.add_argument("start", type=int, help="offset of the first byte")
+    extract.add_argument("stop", type=int, help="offset after the last byte")
+    return parser
+
+
+def _jobs(value: str) -> Optional[int]:
+    """Parse --jobs: a process count, or 'all' (None) for every CPU"""
+    return None if value == "all" else int(value)
+
+
+def _extract(path: str, start: int, stop: int) -> int:
+    """Decode only the blocks covering ``start:stop`` and print them raw"""
+    try:
+        with BlockContainerReader.open(path) as reader:
+            data = reader.decode_range(start, stop)
+    except (OSError, ValueError, HuffmanCodingError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    sys.stdout.buffer.write(data)
+    sys.stdout.flush()
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run the CLI.
+
+    Args:
+        argv: Command-line arguments, defaults to ``sys.argv[1:]``
+
+    Returns:
+        Process exit code
+    """
+    args = build_parser().parse_args(argv)
+    if args.command == "extract":
+        return _extract(args.input, args.start, args.stop)
+    if args.chunk_size < 1:
+        print("error: --chunk-size must be positive", file=sys.stderr)
+        return 2
+    if args.jobs is not None and args.jobs < 0:
+        print("error: --jobs cannot be negative", file=sys.stderr)
+        return 2
+    workers = args.jobs
+
+    try:
+        if args.command == "compress":
+            stats = compress_file(args.input, args.output, args.chunk_size,
+                                  args.block_size, workers)
+            print(f"{args.input}: {stats.original_size // 8} -> "
+                  f"{stats.compressed_size // 8} bytes "
+                  f"({stats.space_saved:.1f}% saved)")
+        else:
+            written = decompress_file(args.input, args.output, args.chunk_size, workers)
+            print(f"{args.output}: {written} bytes restored")
+    except (OSError, ValueError, HuffmanCodingError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,456 @@
+"""
+Single-pass adaptive Huffman coding (Vitter's Algorithm V)
+
+Encoder and decoder start from the same empty tree and update it after
+every symbol, so no frequency table is sent and the input never needs
+to be counted or buffered first. The stream is self-delimiting:
+
+- a known symbol is sent as its current code;
+- a new symbol is sent as the code of the NYT ("not yet transmitted")
+  leaf, a 0 bit and the symbol itself: 8 bits per byte, or the UTF-8
+  bytes of a character;
+- the end of the stream is the NYT code and a 1 bit, zero-padded to a
+  whole byte.
+
+Each symbol updates the tree in Python, so this is several times slower
+than static coding; use it where one pass matters more than throughput.
+"""
+
+from typing import Dict, List, Optional, Tuple, Union
+
+from .bitio import BitWriter, BytesLike, byte_view
+from .decoder import Piece, Symbol
+from .exceptions import DecodingError, EncodingError
+
+Chunk = Union[str, BytesLike]
+
+# Decoder states: walking the tree, reading the bit after an NYT code,
+# reading the bits of a new symbol
+_WALK, _FLAG, _RAW = range(3)
+
+
+class _Node:
+    """Node of the adaptive tree; a leaf has no children"""
+
+    __slots__ = ("weight", "parent", "left", "right", "symbol", "rank")
+
+    def __init__(self, parent: Optional["_Node"], rank: int,
+                 symbol: Optional[Symbol] = None) -> None:
+        self.weight = 0
+        self.parent = parent
+        self.left: Optional[_Node] = None
+        self.right: Optional[_Node] = None
+        self.symbol = symbol
+        self.rank = rank
+
+
+class AdaptiveTree:
+    """
+    Huffman tree kept optimal for the symbols seen so far.
+
+    Nodes are listed by rank, the reverse of Vitter's implicit numbering:
+    the root is rank 0 and the NYT leaf always has the highest rank.
+    Weights never decrease with rank, and among nodes of equal weight
+    the internal nodes come first, which is the invariant Algorithm V
+    maintains to keep the tree's height and total path length minimal.
+    """
+
+    def __init__(self) -> None:
+        self._nyt = _Node(None, 0)
+        self._root = self._nyt
+        self._order: List[_Node] = [self._nyt]
+        self._leaves: Dict[Symbol, _Node] = {}
+
+    @property
+    def root(self) -> _Node:
+        """Root node; a leaf (the NYT) until the first symbol"""
+        return self._root
+
+    @property
+    def nyt(self) -> _Node:
+        """The NYT leaf, which escapes new symbols and the end marker"""
+        return self._nyt
+
+    def __len__(self) -> int:
+        """Number of distinct symbols seen"""
+        return len(self._leaves)
+
+    def leaf(self, symbol: Symbol) -> Optional[_Node]:
+        """Leaf of ``symbol``, or None if it has not been seen"""
+        return self._leaves.get(symbol)
+
+    @staticmethod
+    def code(node: _Node) -> Tuple[int, int]:
+        """
+        Current code of a node.
+
+        Returns:
+            Tuple of (code, length), code bits most significant first
+        """
+        code = length = 0
+        parent = node.parent
+        while parent is not None:
+            if parent.right is node:
+                code |= 1 << length
+            length += 1
+            node, parent = parent, parent.parent
+        return code, length
+
+    def update(self, symbol: Symbol) -> None:
+        """
+        Count one occurrence of ``symbol`` and restore the invariant.
+
+        Args:
+            symbol: Symbol just coded
+        """
+        leaf = self._leaves.get(symbol)
+        increment_last: Optional[_Node] = None
+        if leaf is None:
+            # Split the NYT into an internal node over a new NYT and the new leaf
+            q = self._nyt
+            leaf = _Node(q, len(self._order), symbol)
+            nyt = _Node(q, len(self._order) + 1)
+            q.left, q.right = nyt, leaf
+            self._order += (leaf, nyt)
+            self._nyt = nyt
+            self._leaves[symbol] = leaf
+            increment_last = leaf
+        else:
+            q = leaf
+            leader = self._leader(q)
+            if leader is not q:
+                self._swap(q, leader)
+            if q.parent is self._nyt.parent:
+                # The NYT's sibling is incremented after its parent, which
+                # otherwise would be in the block it has to slide past
+                increment_last, q = q, q.parent  # type: ignore[assignment]
+        while q is not None:
+            q = self._slide_and_increment(q)  # type: ignore[assignment]
+        if increment_last is not None:
+            self._slide_and_increment(increment_last)
+
+    def _leader(self, node: _Node) -> _Node:
+        """Lowest-ranked node with the same weight and kind as ``node``"""
+        order = self._order
+        weight, is_leaf = node.weight, node.left is None
+        rank = node.rank
+        while rank:
+            previous = order[rank - 1]
+            if previous.weight != weight or (previous.left is None) != is_leaf:
+                break
+            rank -= 1
+        return order[rank]
+
+    def _slide_and_increment(self, node: _Node) -> Optional[_Node]:
+        """
+        Increment ``node``, first sliding it past the block it would
+        otherwise break the invariant with.
+
+        Returns:
+            The next node to increment, None after the root
+        """
+        order = self._order
+        weight = node.weight
+        is_leaf = node.left is None
+        former_parent = node.parent
+        rank = node.rank - 1
+        if is_leaf:
+            # A leaf slides past internal nodes of its own weight
+            while (rank >= 0 and order[rank].weight == weight
+                   and order[rank].left is not None):
+                self._swap(node, order[rank])
+                rank -= 1
+        else:
+            # An internal node slides past leaves one heavier than it
+            while (rank >= 0 and order[rank].weight == weight + 1
+                   and order[rank].left is None):
+                self._swap(node, order[rank])
+                rank -= 1
+        node.weight = weight + 1
+        return node.parent if is_leaf else former_parent
+
+    def _swap(self, a: _Node, b: _Node) -> None:
+        """Exchange the tree positions and ranks of two unrelated subtrees"""
+        parent_a, parent_b = a.parent, b.parent
+        assert parent_a is not None and parent_b is not None
+        if parent_a is parent_b:
+            parent_a.left, parent_a.right = parent_a.right, parent_a.left
+        else:
+            if parent_a.left is a:
+                parent_a.left = b
+            else:
+                parent_a.right = b
+            if parent_b.left is b:
+                parent_b.left = a
+            else:
+                parent_b.right = a
+            a.parent, b.parent = parent_b, parent_a
+        order = self._order
+        order[a.rank], order[b.rank] = b, a
+        a.rank, b.rank = b.rank, a.rank
+
+
+class AdaptiveEncoder:
+    """
+    Incremental single-pass encoder.
+
+    Each :meth:`update` returns the whole bytes completed by that chunk,
+    so output can be sent as soon as input arrives. Text encoders take
+    ``str`` chunks, binary encoders buffer-protocol chunks.
+    """
+
+    def __init__(self, binary: bool = False) -> None:
+        """
+        Args:
+            binary: Code byte values instead of characters
+        """
+        self._binary = binary
+        self._tree = AdaptiveTree()
+        self._writer = BitWriter()
+        self._finished = False
+
+    @property
+    def bit_length(self) -> int:
+        """Number of bits produced so far"""
+        return self._writer.bit_length
+
+    def update(self, chunk: Chunk) -> bytes:
+        """
+        Encode the next chunk.
+
+        Args:
+            chunk: Text (text encoders) or bytes (binary encoders)
+
+        Returns:
+            Packed bytes completed by this chunk
+
+        Raises:
+            EncodingError: If the chunk type is wrong or the encoder is flushed
+        """
+        if self._finished:
+            raise EncodingError("Encoder has already been flushed")
+        if self._binary == isinstance(chunk, str):
+            expected = "bytes" if self._binary else "str"
+            raise EncodingError(
+                f"Expected {expected} chunks, got {type(chunk).__name__}")
+        symbols = byte_view(chunk) if self._binary else chunk  # type: ignore[arg-type]
+        tree, write = self._tree, self._writer.write
+        for symbol in symbols:
+            leaf = tree.leaf(symbol)
+            if leaf is not None:
+                write(*tree.code(leaf))
+            else:
+                write(*tree.code(tree.nyt))
+                write(0, 1)
+                self._write_symbol(symbol)
+            tree.update(symbol)
+        return self._writer.take()
+
+    def _write_symbol(self, symbol: Symbol) -> None:
+        """Write a new symbol: one byte, or the UTF-8 bytes of a character"""
+        if self._binary:
+            self._writer.write(symbol, 8)  # type: ignore[arg-type]
+            return
+        raw = symbol.encode("utf-8", "surrogatepass")  # type: ignore[union-attr]
+        self._writer.write(int.from_bytes(raw, "big"), 8 * len(raw))
+
+    def flush(self) -> bytes:
+        """
+        Finish the stream with the end marker.
+
+        Returns:
+            The remaining bytes, the last one zero-padded
+        """
+        if self._finished:
+            raise EncodingError("Encoder has already been flushed")
+        self._finished = True
+        self._writer.write(*self._tree.code(self._tree.nyt))
+        self._writer.write(1, 1)
+        return self._writer.getvalue()
+
+
+class AdaptiveDecoder:
+    """
+    Incremental decoder for :class:`AdaptiveEncoder` streams.
+
+    Needs neither a table nor the stream length: :attr:`eof` turns True
+    at the end marker, and any bytes after it are kept in
+    :attr:`unused_data`, so a stream can be followed by other data.
+    """
+
+    def __init__(self, binary: bool = False) -> None:
+        """
+        Args:
+            binary: Decode byte values instead of characters
+        """
+        self._binary = binary
+        self._tree = AdaptiveTree()
+        # The tree starts as a lone NYT leaf, whose code is empty
+        self._state = _FLAG
+        self._node = self._tree.root
+        self._raw = bytearray()
+        self._raw_value = 0
+        self._raw_bits = 0
+        self._raw_needed = 1
+        self._eof = False
+        self._finished = False
+        self._unused = b""
+
+    @property
+    def eof(self) -> bool:
+        """Whether the end marker has been decoded"""
+        return self._eof
+
+    @property
+    def unused_data(self) -> bytes:
+        """Bytes received after the one holding the end marker"""
+        return self._unused
+
+    def update(self, data: BytesLike) -> Piece:
+        """
+        Decode the next chunk of packed bytes.
+
+        Args:
+            data: Next chunk of the stream
+
+        Returns:
+            Text or bytes completed by this chunk
+
+        Raises:
+            DecodingError: If the stream is invalid or already flushed
+        """
+        if self._finished:
+            raise DecodingError("Decoder has already been flushed")
+        view = byte_view(data)
+        if self._eof:
+            self._unused += bytes(view)
+            return self._join([])
+
+        tree, out = self._tree, []
+        state, node = self._state, self._node
+        for index, byte in enumerate(view):
+            for shift in range(7, -1, -1):
+                bit = (byte >> shift) & 1
+                if state == _WALK:
+                    node = node.right if bit else node.left  # type: ignore[assignment]
+                    if node.left is not None:
+                        continue
+                    if node is not tree.nyt:
+                        out.append(node.symbol)
+                        tree.update(node.symbol)  # type: ignore[arg-type]
+                        node = tree.root
+                        continue
+                    state = _FLAG
+                elif state == _FLAG:
+                    if bit:
+                        self._eof = True
+                        self._unused = bytes(view[index + 1:])
+                        return self._join(out)
+                    state, self._raw_value, self._raw_bits = _RAW, 0, 0
+                else:
+                    self._raw_value = (self._raw_value << 1) | bit
+                    self._raw_bits += 1
+                    if self._raw_bits < 8:
+                        continue
+                    symbol = self._read_symbol()
+                    if symbol is None:
+                        self._raw_value = self._raw_bits = 0
+                        continue
+                    out.append(symbol)
+                    tree.update(symbol)
+                    node = tree.root
+                    state = _WALK
+        self._state, self._node = state, node
+        return self._join(out)
+
+    def _read_symbol(self) -> Optional[Symbol]:
+        """
+        Take the byte just read as (part of) a new symbol.
+
+        Returns:
+            The symbol once complete, None while a character needs more bytes
+
+        Raises:
+            DecodingError: If the bytes are not valid UTF-8
+        """
+        byte = self._raw_value
+        if self._binary:
+            return byte
+        raw = self._raw
+        if not raw:
+            if byte < 0x80:
+                return chr(byte)
+            if 0xC0 <= byte < 0xF8:
+                self._raw_needed = 2 if byte < 0xE0 else 3 if byte < 0xF0 else 4
+            else:
+                raise DecodingError(f"Invalid escaped symbol byte 0x{byte:02x}")
+        raw.append(byte)
+        if len(raw) < self._raw_needed:
+            return None
+        try:
+            symbol = raw.decode("utf-8", "surrogatepass")
+        except UnicodeDecodeError as e:
+            raise DecodingError(f"Invalid escaped symbol: {e}") from None
+        raw.clear()
+        return symbol
+
+    def _join(self, symbols: List[Symbol]) -> Piece:
+        """Concatenate decoded symbols into bytes or text"""
+        if self._binary:
+            return bytes(symbols)  # type: ignore[arg-type]
+        return "".join(symbols)  # type: ignore[arg-type]
+
+    def flush(self, bit_length: Optional[int] = None) -> Piece:
+        """
+        Finish decoding.
+
+        Args:
+            bit_length: Ignored; accepted so :func:`huffman.streaming.iter_decode`
+                can drive this decoder. The end marker delimits the stream
+
+        Returns:
+            Empty text or bytes; every symbol is returned by :meth:`update`
+
+        Raises:
+            DecodingError: If the end marker was not reached
+        """
+        if self._finished:
+            raise DecodingError("Decoder has already been flushed")
+        self._finished = True
+        if not self._eof:
+            raise DecodingError("Stream ended before its end marker")
+        return self._join([])
+
+
+def encode(data: Chunk) -> bytes:
+    """
+    Encode text or bytes in one pass, without a frequency table.
+
+    Args:
+        data: Text, or bytes to code byte-wise
+
+    Returns:
+        Self-delimiting packed stream
+    """
+    encoder = AdaptiveEncoder(binary=not isinstance(data, str))
+    return encoder.update(data) + encoder.flush()
+
+
+def decode(data: BytesLike, binary: bool = False) -> Piece:
+    """
+    Decode a stream produced by :func:`encode`.
+
+    Args:
+        data: Packed stream; bytes after its end marker are ignored
+        binary: Whether the stream codes bytes rather than text
+
+    Returns:
+        Decoded text or bytes
+
+    Raises:
+        DecodingError: If the stream is invalid or truncated
+    """
+    decoder = AdaptiveDecoder(binary)
+    piece = decoder.update(data)
+    decoder.flush()
+    return piece
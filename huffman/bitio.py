@@ -0,0 +1,212 @@
+"""
+Bit-level I/O helpers for packing Huffman codes into bytes
+"""
+
+from typing import Any, Callable, Sequence, Tuple, Union
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+
+def byte_view(data: BytesLike) -> memoryview:
+    """
+    View any buffer-protocol object as flat unsigned bytes without copying.
+
+    Args:
+        data: Buffer to view
+
+    Returns:
+        One-dimensional memoryview with format 'B'
+    """
+    view = memoryview(data)
+    if view.format != "B" or view.ndim != 1:
+        view = view.cast("B")
+    return view
+
+
+class BitWriter:
+    """
+    Accumulates variable-length codes MSB-first into a packed byte buffer.
+
+    Codes are shifted into an integer accumulator and drained to the
+    output buffer a machine word at a time, so the writer never holds
+    more than one word of unflushed bits. The final partial byte is
+    padded with zero bits.
+    """
+
+    WORD_BITS = 64
+
+    # Symbols whose codes are joined into one string per write_codes step
+    JOIN_SIZE = 8192
+
+    __slots__ = ("_buffer", "_acc", "_acc_bits", "_bit_length")
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self._acc = 0
+        self._acc_bits = 0
+        self._bit_length = 0
+
+    @property
+    def bit_length(self) -> int:
+        """Total number of bits written so far"""
+        return self._bit_length
+
+    def write(self, code: int, length: int) -> None:
+        """
+        Append the low ``length`` bits of ``code``.
+
+        Args:
+            code: Integer holding the code bits, most significant bit first
+            length: Number of bits to append
+        """
+        self._acc = (self._acc << length) | code
+        self._acc_bits += length
+        self._bit_length += length
+        if self._acc_bits >= self.WORD_BITS:
+            self._drain()
+
+    def write_bits(self, bits: str) -> None:
+        """
+        Append a string of '0'/'1' characters.
+
+        Args:
+            bits: Binary string to append
+        """
+        if bits:
+            self.write(int(bits, 2), len(bits))
+
+    def write_codes(self, symbols: Sequence[Any], lookup: Callable[[Any], str]) -> None:
+        """
+        Append the code of every symbol in ``symbols``.
+
+        Codes are joined into one '0'/'1' string ``JOIN_SIZE`` symbols at
+        a time and converted with a single ``int(bits, 2)``, which beats
+        writing codes one by one while keeping the joined string bounded.
+
+        Args:
+            symbols: Sliceable symbols, such as text or a byte view
+            lookup: Function returning the code string of a symbol
+
+        Raises:
+            Whatever ``lookup`` raises (or ``TypeError`` if it returns a
+            non-string) for a symbol without a code; the codes of earlier
+            chunks stay written
+        """
+        step = self.JOIN_SIZE
+        for start in range(0, len(symbols), step):
+            self.write_bits("".join(map(lookup, symbols[start:start + step])))
+
+    def _drain(self) -> None:
+        """Move all whole bytes from the accumulator to the buffer"""
+        nbytes, rem = divmod(self._acc_bits, 8)
+        if nbytes:
+            self._buffer += (self._acc >> rem).to_bytes(nbytes, "big")
+            self._acc &= (1 << rem) - 1
+            self._acc_bits = rem
+
+    def take(self) -> bytes:
+        """
+        Remove and return the whole bytes written so far.
+
+        Bits of an unfinished byte stay in the writer, so output can be
+        streamed out while encoding continues.
+
+        Returns:
+            Completed bytes not yet taken
+        """
+        self._drain()
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+    def getvalue(self) -> bytes:
+        """
+        Get the packed bytes written so far.
+
+        Returns:
+            Packed bytes, with the last byte zero-padded if needed
+        """
+        self._drain()
+        if self._acc_bits:
+            tail = self._acc << (8 - self._acc_bits)
+            return bytes(self._buffer) + bytes((tail,))
+        return bytes(self._buffer)
+
+
+def write_varint(out: bytearray, value: int) -> None:
+    """
+    Append an unsigned LEB128 varint.
+
+    Args:
+        out: Buffer to append to
+        value: Non-negative integer
+    """
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data: BytesLike, pos: int) -> Tuple[int, int]:
+    """
+    Read an unsigned LEB128 varint.
+
+    Args:
+        data: Buffer holding the varint
+        pos: Offset of its first byte
+
+    Returns:
+        Tuple of (value, offset after the varint)
+
+    Raises:
+        ValueError: If the buffer ends inside the varint
+    """
+    value = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise ValueError("Truncated varint")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def pack_bits(bits: str) -> bytes:
+    """
+    Pack a '0'/'1' string into bytes, MSB-first, zero-padded.
+
+    Args:
+        bits: Binary string to pack
+
+    Returns:
+        Packed bytes
+    """
+    if not bits:
+        return b""
+    nbytes = (len(bits) + 7) // 8
+    return (int(bits, 2) << (nbytes * 8 - len(bits))).to_bytes(nbytes, "big")
+
+
+def unpack_bits(data: BytesLike, bit_length: int) -> str:
+    """
+    Expand packed bytes back into a '0'/'1' string.
+
+    Args:
+        data: Packed bytes
+        bit_length: Number of meaningful bits in ``data``
+
+    Returns:
+        Binary string of length ``bit_length``
+
+    Raises:
+        ValueError: If ``bit_length`` does not fit in ``data``
+    """
+    if bit_length < 0 or bit_length > len(data) * 8:
+        raise ValueError("Bit length does not match packed data size")
+    if not bit_length:
+        return ""
+    bits = bin(int.from_bytes(data, "big"))[2:].zfill(len(data) * 8)
+    return bits[:bit_length]
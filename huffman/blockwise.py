@@ -0,0 +1,206 @@
+"""
+Block-adaptive coding: a new code table per block only when it pays off
+
+Inputs whose statistics drift, like logs whose content changes over
+time, compress poorly under one global table. Here the input is cut
+into blocks of ``block_size`` symbols and each block's frequencies are
+counted. A block keeps the previous table unless a table built for it,
+header included, codes it in fewer bits.
+
+Stream layout (integers are varints): block size, symbol count, then per
+block a mode byte, the code-length header when the mode is
+:data:`NEW_TABLE`, the payload bit length and the packed payload.
+"""
+
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple, Union
+
+from .bitio import BitWriter, BytesLike, byte_view, read_varint, write_varint
+from .canonical import (
+    assign_canonical_codes,
+    code_lengths_from_frequencies,
+    read_code_lengths,
+    serialize_code_lengths,
+)
+from .decoder import Piece, Symbol, TableDecoder
+from .exceptions import DecodingError
+
+# Block modes
+REUSE_TABLE = 0
+NEW_TABLE = 1
+
+# Default symbols per block
+DEFAULT_BLOCK_SIZE = 1 << 16
+
+Data = Union[str, BytesLike]
+Lengths = Dict[Symbol, int]
+
+
+@dataclass
+class BlockChoice:
+    """Table decision for one block"""
+    new_table: bool
+    # Payload bits with the chosen table, and bits the header adds
+    payload_bits: int
+    header_bits: int
+
+
+def _payload_bits(counts: Mapping[Symbol, int],
+                  lengths: Mapping[Symbol, int]) -> Optional[int]:
+    """Bits to code ``counts`` with ``lengths``, None if a symbol has no code"""
+    total = 0
+    for symbol, count in counts.items():
+        length = lengths.get(symbol)
+        if length is None:
+            return None
+        total += count * length
+    return total
+
+
+def choose_table(counts: Mapping[Symbol, int],
+                 previous: Optional[Mapping[Symbol, int]]
+                 ) -> Tuple[Lengths, BlockChoice]:
+    """
+    Decide whether a block reuses the previous table or sends its own.
+
+    The new table's cost includes its serialized header, so a table is
+    only sent when the bits it saves outweigh it.
+
+    Args:
+        counts: Symbol frequencies of the block
+        previous: Code lengths in force, None for the first block
+
+    Returns:
+        Tuple of (code lengths to use, decision)
+    """
+    lengths = code_lengths_from_frequencies(counts)
+    new_bits = _payload_bits(counts, lengths)
+    header_bits = 8 * len(serialize_code_lengths(lengths))
+    reuse_bits = _payload_bits(counts, previous) if previous is not None else None
+    assert new_bits is not None
+    if reuse_bits is not None and reuse_bits <= new_bits + header_bits:
+        reused = dict(previous)  # type: ignore[arg-type]
+        return reused, BlockChoice(False, reuse_bits, 0)
+    return lengths, BlockChoice(True, new_bits, header_bits)
+
+
+def _blocks(data: Data, block_size: int) -> Iterator[Data]:
+    """Split text or bytes into blocks of ``block_size`` symbols"""
+    symbols = data if isinstance(data, str) else byte_view(data)
+    for start in range(0, len(symbols), block_size):
+        yield symbols[start:start + block_size]
+
+
+def plan(data: Data, block_size: int = DEFAULT_BLOCK_SIZE) -> List[BlockChoice]:
+    """
+    Report the table decision :func:`encode` makes for each block.
+
+    Args:
+        data: Text or bytes
+        block_size: Symbols per block
+
+    Returns:
+        One decision per block
+    """
+    choices = []
+    lengths: Optional[Lengths] = None
+    for block in _blocks(data, block_size):
+        lengths, choice = choose_table(Counter(block), lengths)
+        choices.append(choice)
+    return choices
+
+
+def encode(data: Data, block_size: int = DEFAULT_BLOCK_SIZE) -> bytes:
+    """
+    Encode text or bytes, switching code tables only where it pays off.
+
+    Args:
+        data: Text, or bytes to code byte-wise
+        block_size: Symbols per block; smaller blocks follow drift
+            more closely at the cost of more table decisions
+
+    Returns:
+        Encoded stream
+
+    Raises:
+        ValueError: If ``block_size`` is not positive
+    """
+    if block_size < 1:
+        raise ValueError("Block size must be positive")
+    out = bytearray()
+    write_varint(out, block_size)
+    write_varint(out, len(data))
+
+    lengths: Optional[Lengths] = None
+    lookup = None
+    for block in _blocks(data, block_size):
+        lengths, choice = choose_table(Counter(block), lengths)
+        if choice.new_table:
+            out.append(NEW_TABLE)
+            out += serialize_code_lengths(lengths)
+            codes = assign_canonical_codes(lengths)  # type: ignore[type-var]
+            lookup = codes.__getitem__
+        else:
+            out.append(REUSE_TABLE)
+
+        writer = BitWriter()
+        writer.write_codes(block, lookup)  # type: ignore[arg-type]
+        write_varint(out, writer.bit_length)
+        out += writer.getvalue()
+    return bytes(out)
+
+
+def decode(data: BytesLike, binary: bool = False) -> Piece:
+    """
+    Decode a stream produced by :func:`encode`.
+
+    Args:
+        data: Encoded stream
+        binary: Whether the stream codes bytes rather than text
+
+    Returns:
+        Decoded text or bytes
+
+    Raises:
+        DecodingError: If the stream is malformed or truncated
+    """
+    view = byte_view(data)
+    try:
+        block_size, pos = read_varint(view, 0)
+        remaining, pos = read_varint(view, pos)
+    except ValueError:
+        raise DecodingError("Truncated block stream header") from None
+    if not block_size and remaining:
+        raise DecodingError("Invalid block size 0")
+
+    pieces: List[Piece] = []
+    decoder: Optional[TableDecoder] = None
+    while remaining:
+        if pos >= len(view):
+            raise DecodingError("Truncated block stream")
+        mode = view[pos]
+        pos += 1
+        try:
+            if mode == NEW_TABLE:
+                lengths, pos = read_code_lengths(view, pos, binary)
+                codes = assign_canonical_codes(lengths)  # type: ignore[type-var]
+                decoder = TableDecoder(codes)
+            elif mode != REUSE_TABLE or decoder is None:
+                raise DecodingError(f"Invalid block mode {mode}")
+            bit_length, pos = read_varint(view, pos)
+        except ValueError as e:
+            raise DecodingError(f"Invalid block header: {e}") from e
+
+        end = pos + (bit_length + 7) // 8
+        if end > len(view):
+            raise DecodingError("Truncated block payload")
+        piece = decoder.decode(view[pos:end], bit_length)
+        expected = min(block_size, remaining)
+        if len(piece) != expected:
+            raise DecodingError(
+                f"Block decoded to {len(piece)} symbols, expected {expected}")
+        pieces.append(piece)
+        remaining -= expected
+        pos = end
+    return b"".join(pieces) if binary else "".join(pieces)  # type: ignore[arg-type]
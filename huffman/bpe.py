@@ -0,0 +1,265 @@
+"""
+Alphabet extension with byte-pair-encoding merges
+
+Per-character Huffman coding spends at least one bit per character, so
+highly repetitive text leaves ratio unused. Before coding, the most
+frequent adjacent symbol pairs are merged into new symbols, repeatedly,
+so common n-grams like ``"ERROR "`` or ``"https://"`` become a single
+symbol. Each new symbol is a private-use character absent from the text,
+so the extended text is coded by :class:`HuffmanCoding` unchanged and
+decoding ends with a single ``str.translate``.
+
+Stream layout (integers are varints): merge table, extended symbol
+count, then when non-empty the canonical code-length header, payload
+bit length and packed payload.
+"""
+
+from collections import Counter
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from .bitio import BytesLike, byte_view, read_varint, write_varint
+from .canonical import (
+    code_lengths_from_frequencies,
+    read_code_lengths,
+    serialize_code_lengths,
+)
+from .coding import HuffmanCoding
+from .exceptions import DecodingError
+
+# Defaults for training
+DEFAULT_MAX_MERGES = 256
+DEFAULT_MIN_COUNT = 4
+DEFAULT_SAMPLE_SIZE = 1 << 16
+
+# Pairs ranked per training pass, and merges accepted from one pass
+_CANDIDATES = 64
+_MERGES_PER_PASS = 16
+
+# New symbols come from the supplementary private use areas
+_SYMBOL_RANGES = ((0xF0000, 0xFFFFE), (0x100000, 0x10FFFE))
+
+Merge = Tuple[str, str, str]
+
+
+def _free_symbols(used: Set[str]) -> Iterator[str]:
+    """Yield private-use characters not in ``used``"""
+    for start, stop in _SYMBOL_RANGES:
+        for value in range(start, stop):
+            char = chr(value)
+            if char not in used:
+                yield char
+
+
+class MergeTable:
+    """
+    Ordered pair merges, each defining a new symbol as two older ones.
+
+    Applying the merges in order rewrites text into the extended
+    alphabet; expanding replaces every merged symbol by the characters
+    it stands for.
+    """
+
+    def __init__(self, merges: Sequence[Merge] = ()) -> None:
+        """
+        Args:
+            merges: ``(symbol, left, right)`` triples, where ``left`` and
+                ``right`` are characters or symbols defined earlier
+
+        Raises:
+            ValueError: If a symbol is redefined or not a single character
+        """
+        self._merges: List[Merge] = []
+        self._expansions: Dict[str, str] = {}
+        for symbol, left, right in merges:
+            if any(len(char) != 1 for char in (symbol, left, right)):
+                raise ValueError("Merge symbols must be single characters")
+            if symbol in self._expansions or symbol in (left, right):
+                raise ValueError(f"Symbol U+{ord(symbol):04X} is defined twice")
+            self._expansions[symbol] = (self._expansions.get(left, left)
+                                        + self._expansions.get(right, right))
+            self._merges.append((symbol, left, right))
+        self._table = {ord(symbol): text for symbol, text in self._expansions.items()}
+
+    @classmethod
+    def train(cls, text: str, max_merges: int = DEFAULT_MAX_MERGES,
+              min_count: int = DEFAULT_MIN_COUNT,
+              sample_size: Optional[int] = DEFAULT_SAMPLE_SIZE) -> "MergeTable":
+        """
+        Learn merges from the most frequent adjacent pairs.
+
+        Each pass counts the pairs of the rewritten sample and merges up
+        to several of the most frequent ones that share no symbol, until
+        ``max_merges`` is reached or no pair occurs ``min_count`` times.
+
+        Args:
+            text: Text the merges are for; its characters are never
+                used as new symbols
+            max_merges: Most merges to learn
+            min_count: Fewest occurrences in the sample worth a merge
+            sample_size: Characters from the start of ``text`` to train
+                on, None for all of it
+
+        Returns:
+            The learned merges
+        """
+        symbols = text if sample_size is None else text[:sample_size]
+        free = _free_symbols(set(text))
+        merges: List[Merge] = []
+        while len(merges) < max_merges:
+            pairs = Counter(map(str.__add__, symbols, symbols[1:]))
+            taken: Set[str] = set()
+            batch = []
+            for pair, count in pairs.most_common(_CANDIDATES):
+                if count < min_count or len(batch) >= _MERGES_PER_PASS \
+                        or len(merges) + len(batch) >= max_merges:
+                    break
+                if taken.isdisjoint(pair):
+                    taken.update(pair)
+                    batch.append(pair)
+            if not batch:
+                break
+            for pair in batch:
+                symbol = next(free)
+                symbols = symbols.replace(pair, symbol)
+                merges.append((symbol, pair[0], pair[1]))
+        return cls(merges)
+
+    def __len__(self) -> int:
+        """Number of merges"""
+        return len(self._merges)
+
+    @property
+    def merges(self) -> List[Merge]:
+        """The ``(symbol, left, right)`` triples in order"""
+        return list(self._merges)
+
+    def apply(self, text: str) -> str:
+        """
+        Rewrite text into the extended alphabet.
+
+        Args:
+            text: Text without any of the merge symbols
+
+        Returns:
+            Text with every merge applied, left to right, in order
+        """
+        for symbol, left, right in self._merges:
+            text = text.replace(left + right, symbol)
+        return text
+
+    def expand(self, text: str) -> str:
+        """Replace every merged symbol by the characters it stands for"""
+        return text.translate(self._table) if self._table else text
+
+    def to_bytes(self) -> bytes:
+        """Serialize as a varint count and varint code-point triples"""
+        out = bytearray()
+        write_varint(out, len(self._merges))
+        for merge in self._merges:
+            for char in merge:
+                write_varint(out, ord(char))
+        return bytes(out)
+
+    @classmethod
+    def read(cls, data: BytesLike, pos: int = 0) -> Tuple["MergeTable", int]:
+        """
+        Parse a table produced by :meth:`to_bytes` embedded at ``pos``.
+
+        Returns:
+            Tuple of (table, offset after it)
+
+        Raises:
+            ValueError: If the table is malformed
+        """
+        count, pos = read_varint(data, pos)
+        if count > len(data) - pos:
+            raise ValueError("Merge count exceeds data size")
+        merges = []
+        for _ in range(count):
+            values = []
+            for _ in range(3):
+                value, pos = read_varint(data, pos)
+                values.append(value)
+            try:
+                merges.append(tuple(map(chr, values)))
+            except (ValueError, OverflowError) as e:
+                raise ValueError(f"Invalid merge symbol: {e}") from e
+        return cls(merges), pos  # type: ignore[arg-type]
+
+
+def _coded_size(text: str) -> int:
+    """Estimated stream size in bits of ``text`` with its own code table"""
+    if not text:
+        return 0
+    counts = Counter(text)
+    lengths = code_lengths_from_frequencies(counts)
+    payload = sum(count * lengths[char] for char, count in counts.items())
+    return payload + 8 * len(serialize_code_lengths(lengths))
+
+
+def encode(text: str, max_merges: int = DEFAULT_MAX_MERGES,
+           min_count: int = DEFAULT_MIN_COUNT,
+           sample_size: Optional[int] = DEFAULT_SAMPLE_SIZE) -> bytes:
+    """
+    Encode text with an alphabet extended by learned merges.
+
+    The merges are dropped if, table included, they would not make the
+    stream smaller.
+
+    Args:
+        text: Text to encode
+        max_merges: Most merges to learn
+        min_count: Fewest sample occurrences worth a merge
+        sample_size: Characters trained on, None for all
+
+    Returns:
+        Encoded stream
+    """
+    table = MergeTable.train(text, max_merges, min_count, sample_size)
+    extended = table.apply(text)
+    table_bits = 8 * len(table.to_bytes())
+    if len(table) and _coded_size(extended) + table_bits >= _coded_size(text):
+        table, extended = MergeTable(), text
+
+    out = bytearray(table.to_bytes())
+    write_varint(out, len(extended))
+    if not extended:
+        return bytes(out)
+    huffman = HuffmanCoding(canonical=True)
+    packed, bit_length, _ = huffman.encode_packed(extended)
+    out += serialize_code_lengths(huffman.code_lengths)
+    write_varint(out, bit_length)
+    return bytes(out) + packed
+
+
+def decode(data: BytesLike) -> str:
+    """
+    Decode a stream produced by :func:`encode`.
+
+    Args:
+        data: Encoded stream
+
+    Returns:
+        Decoded text
+
+    Raises:
+        DecodingError: If the stream is malformed
+    """
+    view = byte_view(data)
+    try:
+        table, pos = MergeTable.read(view)
+        length, pos = read_varint(view, pos)
+        if not length:
+            return ""
+        code_lengths, pos = read_code_lengths(view, pos)
+        bit_length, pos = read_varint(view, pos)
+    except ValueError as e:
+        raise DecodingError(f"Invalid stream header: {e}") from e
+    if len(view) - pos != (bit_length + 7) // 8:
+        raise DecodingError("Payload size does not match bit length")
+
+    extended = HuffmanCoding(canonical=True).decode_packed(
+        view[pos:], bit_length, code_lengths=code_lengths)  # type: ignore[arg-type]
+    if len(extended) != length:
+        raise DecodingError(f"Decoded {len(extended)} symbols, expected {length}")
+    return table.expand(extended)
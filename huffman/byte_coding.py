@@ -0,0 +1,205 @@
+"""
+Byte-oriented Huffman coding over a fixed 256-symbol alphabet
+"""
+
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .bitio import BitWriter, BytesLike, byte_view
+from .canonical import assign_canonical_codes, code_lengths_from_frequencies
+from .coding import CompressionStats
+from .decoder import TableDecoder
+from .exceptions import EncodingError, DecodingError
+
+# Number of symbols in the byte alphabet
+ALPHABET_SIZE = 256
+
+
+class ByteHuffmanCoding:
+    """
+    Huffman coding for ``bytes``, ``bytearray`` and ``memoryview`` inputs.
+
+    Frequencies, code lengths and codes are flat 256-entry lists indexed
+    by byte value, so lookups never hash. Codes are always canonical,
+    which makes the 256 code lengths the only side information needed to
+    decode.
+    """
+
+    def __init__(self) -> None:
+        self._lengths: List[int] = [0] * ALPHABET_SIZE
+        self._codes: List[Optional[str]] = [None] * ALPHABET_SIZE
+
+    @property
+    def code_lengths(self) -> List[int]:
+        """Get the code length of each byte value (0 when unused)"""
+        return self._lengths.copy()
+
+    @property
+    def codes(self) -> Dict[int, str]:
+        """Get the generated codes of the byte values in use"""
+        return {byte: code for byte, code in enumerate(self._codes) if code is not None}
+
+    def build_frequency_table(self, data: BytesLike) -> List[int]:
+        """
+        Count byte frequencies.
+
+        Args:
+            data: Any buffer-protocol object; it is not copied
+
+        Returns:
+            256-entry list of counts indexed by byte value
+
+        Raises:
+            ValueError: If data is empty
+        """
+        view = byte_view(data)
+        if not len(view):
+            raise ValueError("Data cannot be empty")
+
+        counts = [0] * ALPHABET_SIZE
+        for byte, count in Counter(view).items():
+            counts[byte] = count
+        return counts
+
+    def set_code_lengths(self, lengths: Sequence[int]) -> None:
+        """
+        Install canonical codes for the given code lengths.
+
+        Args:
+            lengths: 256-entry sequence of code lengths (0 when unused)
+
+        Raises:
+            ValueError: If the lengths do not form a valid prefix code
+        """
+        if len(lengths) != ALPHABET_SIZE:
+            raise ValueError(
+                f"Expected {ALPHABET_SIZE} code lengths, got {len(lengths)}")
+        used = {byte: length for byte, length in enumerate(lengths) if length}
+        codes = assign_canonical_codes(used)
+
+        self._lengths = list(lengths)
+        self._codes = [codes.get(byte) for byte in range(ALPHABET_SIZE)]
+
+    def build_codes(self, counts: Sequence[int]) -> List[int]:
+        """
+        Derive canonical codes from byte counts.
+
+        Args:
+            counts: 256-entry list of byte frequencies
+
+        Returns:
+            256-entry list of code lengths
+        """
+        lengths = code_lengths_from_frequencies(dict(enumerate(counts)))
+        table = [lengths.get(byte, 0) for byte in range(ALPHABET_SIZE)]
+        self.set_code_lengths(table)
+        return table
+
+    def encode_with_codes(self, data: BytesLike,
+                          writer: Optional[BitWriter] = None) -> BitWriter:
+        """
+        Append the codes for ``data`` using the installed code table.
+
+        Args:
+            data: Bytes to encode
+            writer: Writer to append to, a new one by default
+
+        Returns:
+            The writer holding the packed bits
+
+        Raises:
+            EncodingError: If a byte has no code
+        """
+        view = byte_view(data)
+        if writer is None:
+            writer = BitWriter()
+        try:
+            writer.write_codes(view, self._codes.__getitem__)  # type: ignore[arg-type]
+        except TypeError:
+            missing = next(byte for byte in view if self._codes[byte] is None)
+            raise EncodingError(f"Byte not found in codes: {missing}") from None
+        return writer
+
+    def encode(self, data: BytesLike) -> Tuple[bytes, int, List[int]]:
+        """
+        Encode bytes using Huffman coding.
+
+        Args:
+            data: Any buffer-protocol object; it is not copied
+
+        Returns:
+            Tuple of (packed_bytes, bit_length, code_lengths)
+
+        Raises:
+            EncodingError: If encoding fails
+        """
+        try:
+            counts = self.build_frequency_table(data)
+            lengths = self.build_codes(counts)
+            writer = self.encode_with_codes(data)
+            return writer.getvalue(), writer.bit_length, lengths
+
+        except Exception as e:
+            if isinstance(e, (ValueError, EncodingError)):
+                raise
+            raise EncodingError(f"Encoding failed: {str(e)}") from e
+
+    def decoder(self) -> TableDecoder:
+        """
+        Build a lookup-table decoder for the installed code table.
+
+        Returns:
+            Decoder producing ``bytes``
+        """
+        return TableDecoder(self.codes)
+
+    def decode(self, data: BytesLike, bit_length: int,
+               code_lengths: Sequence[int]) -> bytes:
+        """
+        Decode packed bytes produced by :meth:`encode`.
+
+        Args:
+            data: Packed encoded bytes
+            bit_length: Number of meaningful bits in ``data``
+            code_lengths: 256-entry list of code lengths
+
+        Returns:
+            Decoded bytes
+
+        Raises:
+            DecodingError: If decoding fails
+        """
+        try:
+            if not bit_length:
+                return b""
+
+            try:
+                self.set_code_lengths(code_lengths)
+            except ValueError as e:
+                raise DecodingError(f"Invalid code lengths: {e}") from e
+
+            return self.decoder().decode(data, bit_length)  # type: ignore[return-value]
+
+        except Exception as e:
+            if isinstance(e, DecodingError):
+                raise
+            raise DecodingError(f"Decoding failed: {str(e)}") from e
+
+    def get_compression_stats(self, original: BytesLike,
+                              bit_length: int) -> CompressionStats:
+        """
+        Calculate compression statistics from exact byte sizes.
+
+        Args:
+            original: Original input bytes
+            bit_length: Number of bits in the encoded payload
+
+        Returns:
+            CompressionStats object with detailed metrics
+        """
+        return CompressionStats(
+            original_size=len(byte_view(original)) * 8,
+            compressed_size=bit_length,
+            compression_ratio=0,  # Will be calculated in __post_init__
+            space_saved=0  # Will be calculated in __post_init__
+        )
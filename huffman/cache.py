@@ -0,0 +1,162 @@
+"""
+Process-wide LRU cache of built code tables and decoders
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Mapping, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# Defaults sized for a web worker: plenty of distinct alphabets, bounded memory
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+
+@dataclass
+class CacheStats:
+    """Counters describing cache effectiveness"""
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    bytes: int
+
+
+class CodeTableCache:
+    """
+    Thread-safe LRU cache for code tables and decoders.
+
+    Entries are keyed by a fingerprint of the frequency or code-length
+    table they were built from, so repeat clients with the same alphabet
+    statistics skip tree construction entirely. The cache is bounded both
+    by entry count and by an estimate of the memory held.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        """
+        Args:
+            max_entries: Maximum number of cached tables
+            max_bytes: Maximum estimated memory held by cached tables
+
+        Raises:
+            ValueError: If a limit is not positive
+        """
+        if max_entries < 1 or max_bytes < 1:
+            raise ValueError("Cache limits must be positive")
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def fingerprint(kind: str, table: Mapping[Any, int],
+                    *variant: Hashable) -> Tuple[Hashable, ...]:
+        """
+        Build a cache key for a table.
+
+        Table order is part of the key, because tie-breaking during tree
+        construction depends on it.
+
+        Args:
+            kind: Kind of value cached for the table
+            table: Frequency or code-length table
+            variant: Extra settings that change the built value
+
+        Returns:
+            Hashable cache key
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr(tuple(table.items())).encode("utf-8", "surrogatepass"))
+        return (kind, variant, digest.digest())
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Look up a value, marking it most recently used.
+
+        Args:
+            key: Key from :meth:`fingerprint`
+
+        Returns:
+            Cached value, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any, size: int) -> None:
+        """
+        Store a value, evicting least recently used entries over the limits.
+
+        Values larger than the whole memory budget are not cached.
+
+        Args:
+            key: Key from :meth:`fingerprint`
+            value: Value to cache (treated as immutable)
+            size: Estimated memory held by the value in bytes
+        """
+        if size > self._max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while (len(self._entries) > self._max_entries
+                   or self._bytes > self._max_bytes):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self._evictions += 1
+
+    def get_or_build(self, key: Hashable, build: Callable[[], T],
+                     sizeof: Callable[[T], int]) -> T:
+        """
+        Return the cached value for ``key``, building and storing it on a miss.
+
+        Args:
+            key: Key from :meth:`fingerprint`
+            build: Callable creating the value
+            sizeof: Callable estimating the value's memory in bytes
+
+        Returns:
+            Cached or newly built value
+        """
+        value = self.get(key)
+        if value is None:
+            value = build()
+            self.put(key, value, sizeof(value))
+        return value  # type: ignore[no-any-return]
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._hits = self._misses = self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def stats(self) -> CacheStats:
+        """Get hit/miss/eviction counters and current usage"""
+        with self._lock:
+            return CacheStats(self._hits, self._misses, self._evictions,
+                              len(self._entries), self._bytes)
+
+
+# Shared by every caller that opts into caching in this process
+default_cache = CodeTableCache()
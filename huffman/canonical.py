@@ -0,0 +1,338 @@
+"""
+Canonical Huffman code assignment and compact code-length headers
+"""
+
+from typing import Dict, List, Mapping, Optional, Tuple, TypeVar, Union
+
+from .bitio import BytesLike, read_varint, write_varint
+
+S = TypeVar("S", str, int)
+
+# Longest code length the header format can describe
+MAX_HEADER_CODE_LENGTH = 255
+
+# Longest code length accepted when parsing a header. A Huffman code this
+# long needs Fibonacci-sized frequencies summing to over 10**10, so longer
+# lengths only come from corrupt or hostile headers.
+MAX_CODE_LENGTH = 48
+
+
+def code_lengths_from_codes(codes: Mapping[S, str]) -> Dict[S, int]:
+    """
+    Extract per-symbol code lengths from a code map.
+
+    Args:
+        codes: Mapping of symbol to binary code string
+
+    Returns:
+        Mapping of symbol to code length in bits
+    """
+    return {symbol: len(code) for symbol, code in codes.items()}
+
+
+def code_lengths_from_frequencies(freqs: Mapping[S, int],
+                                  max_length: Optional[int] = None) -> Dict[S, int]:
+    """
+    Compute optimal Huffman code lengths in linear time after one sort.
+
+    Frequencies are sorted once and merged with the two-queue method:
+    merged weights are produced in non-decreasing order, so the two
+    smallest items are always at the heads of the sorted leaves and of
+    the merged queue. Nodes are plain integer ids with a parent array;
+    depths are then read back from the root since parents always
+    outnumber children. When the optimal code is deeper than
+    ``max_length``, the lengths are recomputed with package-merge,
+    giving the optimal code within the limit.
+
+    Args:
+        freqs: Mapping of symbol to frequency (zero-frequency symbols are
+            ignored)
+        max_length: Longest code length allowed, unbounded if None
+
+    Returns:
+        Mapping of symbol to code length; a lone symbol gets length 1
+
+    Raises:
+        ValueError: If ``max_length`` is too short for the alphabet
+    """
+    symbols = [symbol for symbol, freq in freqs.items() if freq > 0]
+    if not symbols:
+        return {}
+    if max_length is not None and (max_length < 1 or len(symbols) > 1 << max_length):
+        raise ValueError(f"{len(symbols)} symbols cannot be coded in {max_length} bits")
+    if len(symbols) == 1:
+        return {symbols[0]: 1}
+
+    count = len(symbols)
+    # Leaf ids 0..count-1 follow ascending frequency
+    symbols.sort(key=freqs.__getitem__)
+    weights = [freqs[symbol] for symbol in symbols]
+    merged = [0] * (count - 1)
+    parent = [0] * (2 * count - 1)
+    leaf = head = 0
+    for tail in range(count - 1):
+        node_id = count + tail
+        pair = 0
+        for _ in range(2):
+            if leaf < count and (head == tail or weights[leaf] <= merged[head]):
+                pair += weights[leaf]
+                parent[leaf] = node_id
+                leaf += 1
+            else:
+                pair += merged[head]
+                parent[count + head] = node_id
+                head += 1
+        merged[tail] = pair
+
+    depth = [0] * (2 * count - 1)
+    for node in range(2 * count - 3, -1, -1):
+        depth[node] = depth[parent[node]] + 1
+    if max_length is not None and max(depth[:count]) > max_length:
+        return _package_merge(symbols, weights, max_length)
+    return {symbol: depth[index] for index, symbol in enumerate(symbols)}
+
+
+def _package_merge(symbols: List[S], weights: List[int],
+                   max_length: int) -> Dict[S, int]:
+    """
+    Compute optimal code lengths bounded by ``max_length`` (package-merge).
+
+    Each level's list holds the sorted leaves merged with packages formed
+    by pairing adjacent items of the level below. The first ``2n - 2``
+    items of the top list determine the lengths: every leaf counts once
+    per level it is selected at, and each selected package selects its
+    two children one level down.
+
+    Args:
+        symbols: Symbols to code, at least two
+        weights: Positive weight of each symbol
+        max_length: Longest code length allowed, with ``2**max_length``
+            at least the number of symbols
+
+    Returns:
+        Mapping of symbol to code length
+    """
+    order = sorted(range(len(symbols)), key=weights.__getitem__)
+    # Items are (weight, leaf index) with -1 marking a package
+    leaves = [(weights[index], index) for index in order]
+
+    levels = [leaves]
+    current = leaves
+    for _ in range(max_length - 1):
+        packages = [(current[i][0] + current[i + 1][0], -1)
+                    for i in range(0, len(current) - 1, 2)]
+        merged = []
+        i = j = 0
+        while i < len(leaves) or j < len(packages):
+            # Leaves win ties so shorter codes stay with single symbols
+            if j == len(packages) or (i < len(leaves)
+                                      and leaves[i][0] <= packages[j][0]):
+                merged.append(leaves[i])
+                i += 1
+            else:
+                merged.append(packages[j])
+                j += 1
+        levels.append(merged)
+        current = merged
+
+    lengths = [0] * len(symbols)
+    take = 2 * len(symbols) - 2
+    for level in reversed(levels):
+        packages_taken = 0
+        for _, index in level[:take]:
+            if index < 0:
+                packages_taken += 1
+            else:
+                lengths[index] += 1
+        take = 2 * packages_taken
+    return {symbol: lengths[index] for index, symbol in enumerate(symbols)}
+
+
+def canonical_order(lengths: Mapping[S, int]) -> List[Tuple[int, S]]:
+    """
+    Sort symbols into canonical order: by code length, then by symbol.
+
+    Args:
+        lengths: Mapping of symbol to code length
+
+    Returns:
+        List of (length, symbol) pairs in canonical order
+    """
+    return sorted((length, symbol) for symbol, length in lengths.items())
+
+
+def assign_canonical_codes(lengths: Mapping[S, int]) -> Dict[S, str]:
+    """
+    Assign canonical Huffman codes from code lengths alone.
+
+    Codes are handed out in canonical order, each one the previous code
+    plus one, shifted left whenever the length grows. Any prefix code
+    with the same lengths compresses equally well, so only the lengths
+    need to travel with the message.
+
+    Args:
+        lengths: Mapping of symbol to code length
+
+    Returns:
+        Mapping of symbol to binary code string
+
+    Raises:
+        ValueError: If the lengths are invalid or oversubscribed
+    """
+    if not lengths:
+        raise ValueError("Code lengths cannot be empty")
+
+    codes: Dict[S, str] = {}
+    code = 0
+    prev_length = 0
+    for length, symbol in canonical_order(lengths):
+        if length < 1:
+            raise ValueError(f"Invalid code length {length} for {symbol!r}")
+        code <<= length - prev_length
+        if code >> length:
+            raise ValueError("Code lengths are oversubscribed")
+        codes[symbol] = format(code, f"0{length}b")
+        code += 1
+        prev_length = length
+    return codes
+
+
+def _symbol_value(symbol: Union[str, int]) -> int:
+    """Map a symbol to the integer stored in the header"""
+    if isinstance(symbol, str):
+        if len(symbol) != 1:
+            raise ValueError(
+                f"Header symbols must be single characters, got {symbol!r}")
+        return ord(symbol)
+    return symbol
+
+
+def serialize_code_lengths(lengths: Mapping[S, int]) -> bytes:
+    """
+    Serialize code lengths into a compact header.
+
+    Layout: max length (1 byte), then one varint count per length
+    1..max, then the symbols of each length in ascending order as
+    varint deltas from the previous symbol of the same length.
+    Characters are stored by code point, byte symbols by value.
+
+    Args:
+        lengths: Mapping of symbol to code length
+
+    Returns:
+        Header bytes
+
+    Raises:
+        ValueError: If lengths are empty or out of range
+    """
+    if not lengths:
+        raise ValueError("Code lengths cannot be empty")
+
+    groups: Dict[int, List[int]] = {}
+    for symbol, length in lengths.items():
+        if not 1 <= length <= MAX_HEADER_CODE_LENGTH:
+            raise ValueError(f"Code length {length} out of range")
+        groups.setdefault(length, []).append(_symbol_value(symbol))
+
+    max_length = max(groups)
+    out = bytearray((max_length,))
+    for length in range(1, max_length + 1):
+        write_varint(out, len(groups.get(length, ())))
+    for length in range(1, max_length + 1):
+        previous = 0
+        for value in sorted(groups.get(length, ())):
+            write_varint(out, value - previous)
+            previous = value
+    return bytes(out)
+
+
+def _parse_header(data: BytesLike, pos: int = 0,
+                  limit: int = MAX_CODE_LENGTH) -> Tuple[List[Tuple[int, int]], int]:
+    """
+    Parse a header into (length, symbol_value) pairs and the end position.
+
+    The length counts are checked before any symbol is read: lengths past
+    ``limit`` and counts that oversubscribe the code space (violating the
+    Kraft inequality) are rejected.
+    """
+    if pos >= len(data):
+        raise ValueError("Truncated code-length header")
+    max_length = data[pos]
+    pos += 1
+    if max_length > limit:
+        raise ValueError(f"Code length {max_length} exceeds the {limit} bit limit")
+
+    counts: List[int] = []
+    for _ in range(max_length):
+        count, pos = read_varint(data, pos)
+        counts.append(count)
+    # Each code of length l takes 2**(max_length - l) of the 2**max_length leaves
+    used = sum(count << (max_length - length)
+               for length, count in enumerate(counts, start=1))
+    if used > 1 << max_length:
+        raise ValueError("Code lengths violate the Kraft inequality")
+
+    entries: List[Tuple[int, int]] = []
+    for length, count in enumerate(counts, start=1):
+        value = 0
+        for _ in range(count):
+            delta, pos = read_varint(data, pos)
+            value += delta
+            entries.append((length, value))
+    if not entries:
+        raise ValueError("Code-length header describes no symbols")
+    return entries, pos
+
+
+def deserialize_code_lengths(data: BytesLike, binary: bool = False,
+                             limit: int = MAX_CODE_LENGTH
+                             ) -> Dict[Union[str, int], int]:
+    """
+    Parse a header produced by :func:`serialize_code_lengths`.
+
+    Args:
+        data: Header bytes
+        binary: Return integer symbols instead of characters
+        limit: Longest code length accepted
+
+    Returns:
+        Mapping of symbol to code length
+
+    Raises:
+        ValueError: If the header is malformed, has a code longer than
+            ``limit`` or violates the Kraft inequality
+    """
+    lengths, _ = read_code_lengths(data, 0, binary, limit)
+    return lengths
+
+
+def read_code_lengths(data: BytesLike, pos: int, binary: bool = False,
+                      limit: int = MAX_CODE_LENGTH
+                      ) -> Tuple[Dict[Union[str, int], int], int]:
+    """
+    Parse a code-length header embedded at ``pos`` inside a larger buffer.
+
+    Headers usually arrive with untrusted input, so they are validated
+    before any code table can be built from them.
+
+    Args:
+        data: Buffer containing the header
+        pos: Offset of the header
+        binary: Return integer symbols instead of characters
+        limit: Longest code length accepted
+
+    Returns:
+        Tuple of (mapping of symbol to code length, offset after the header)
+
+    Raises:
+        ValueError: If the header is malformed, has a code longer than
+            ``limit`` or violates the Kraft inequality
+    """
+    entries, end = _parse_header(data, pos, limit)
+    lengths: Dict[Union[str, int], int] = {}
+    try:
+        for length, value in entries:
+            lengths[value if binary else chr(value)] = length
+    except (ValueError, OverflowError) as e:
+        raise ValueError(f"Invalid symbol in code-length header: {e}") from e
+    return lengths, end
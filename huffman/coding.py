@@ -2,12 +2,82 @@
 Modern Huffman Coding Implementation with type hints and error handling
 """
 
+import functools
 import heapq
 from collections import Counter
-from typing import Dict, Tuple, Optional, Any
+from typing import (
+    Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, TypeVar, Union,
+)
 from dataclasses import dataclass
 
+from .bitio import BitWriter, BytesLike, pack_bits
+from .cache import CodeTableCache
+from .canonical import (
+    assign_canonical_codes,
+    code_lengths_from_codes,
+    code_lengths_from_frequencies,
+)
+from .decoder import TableDecoder
+# HuffmanCodingError is re-exported for code importing it from here
+from .exceptions import HuffmanCodingError, EncodingError, DecodingError  # noqa: F401
+from . import metrics, numpy_backend, profiling
 from .node import Node
+from .parallel import map_ordered, runs_inline
+from .tree import CompactTree
+
+_BINARY_DIGITS = frozenset("01")
+
+# Implementations selectable per instance
+BACKENDS = ("python", "numpy")
+
+# Longest binary string decoded by walking the tree instead of a lookup table
+_TREE_DECODE_MAX_BITS = 8192
+
+# Rough memory per symbol of a cached code map and its tree, in bytes
+_CODE_ENTRY_SIZE = 400
+
+# Items per task handed to a worker process by encode_many/decode_many
+_BATCH_SIZE = 256
+
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Tables given to decode_many: one for every item, one per item, or none
+Tables = Union[Mapping[str, int], Sequence[Optional[Dict[str, int]]], None]
+
+
+def _timed(stage: str) -> Callable[[F], F]:
+    """
+    Time a public codec method into the stage histogram and the active
+    profile, and count failures.
+    
+    Skipped after two cheap checks while metrics and profiling are off.
+    """
+    def decorator(method: F) -> F:
+        @functools.wraps(method)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not metrics.is_enabled() and not profiling.is_active():
+                return method(*args, **kwargs)
+            with profiling.stage(stage):
+                try:
+                    return method(*args, **kwargs)
+                except Exception:
+                    metrics.ERRORS.inc((stage,))
+                    raise
+        return wrapper  # type: ignore[return-value]
+    return decorator
+
+
+def _record_encode(symbols: int, bits: int, alphabet: int) -> None:
+    """Record the sizes of a successful encode in the metrics and profile"""
+    metrics.record_encode(symbols, bits, alphabet)
+    profiling.count(symbols=symbols, bits_emitted=bits)
+
+
+def _record_decode(symbols: int, bits: int) -> None:
+    """Record the sizes of a successful decode in the metrics and profile"""
+    metrics.record_decode(symbols, bits)
+    profiling.count(symbols_decoded=symbols, bits_consumed=bits)
 
 
 @dataclass
@@ -28,19 +98,28 @@ class CompressionStats:
             self.space_saved = 0
 
 
-class HuffmanCodingError(Exception):
-    """Base exception for Huffman coding errors"""
-    pass
-
-
-class EncodingError(HuffmanCodingError):
-    """Raised when encoding fails"""
-    pass
-
-
-class DecodingError(HuffmanCodingError):
-    """Raised when decoding fails"""
-    pass
+@dataclass
+class SeekIndex:
+    """Bit offsets of every ``interval``-th symbol in an encoded stream"""
+    interval: int
+    offsets: List[int]
+    
+    def span(self, start: int, stop: int, bit_length: int) -> Tuple[int, int, int]:
+        """
+        Locate the checkpoints enclosing symbols ``start:stop``.
+        
+        Args:
+            start: First symbol wanted
+            stop: Symbol after the last one wanted
+            bit_length: Total bits in the stream
+            
+        Returns:
+            Tuple of (first_symbol, start_bit, stop_bit) to decode
+        """
+        first = start // self.interval
+        last = -(-stop // self.interval)
+        stop_bit = self.offsets[last] if last < len(self.offsets) else bit_length
+        return first * self.interval, self.offsets[first], stop_bit
 
 
 class HuffmanCoding:
@@ -54,20 +133,79 @@ class HuffmanCoding:
     - Clean API design
     """
     
-    def __init__(self) -> None:
+    def __init__(self, canonical: bool = False,
+                 cache: Optional[CodeTableCache] = None,
+                 max_code_length: Optional[int] = None,
+                 backend: str = "python") -> None:
+        """
+        Args:
+            canonical: Assign canonical codes, so the code lengths alone
+                are enough to decode
+            cache: Cache of built code tables and decoders shared between
+                instances, e.g. :data:`huffman.cache.default_cache`
+            max_code_length: Longest code allowed; lengths come from
+                package-merge and codes are always canonical. Unbounded
+                if None
+            backend: ``"python"``, or ``"numpy"`` to count, pack and
+                decode with vectorized array operations. Output is
+                identical either way
+                
+        Raises:
+            ValueError: If ``max_code_length`` is not positive or the
+                backend is unknown
+            ImportError: If the numpy backend is chosen without NumPy
+        """
+        if max_code_length is not None and max_code_length < 1:
+            raise ValueError("Maximum code length must be positive")
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend {backend!r}, expected one of {BACKENDS}")
+        if backend == "numpy":
+            numpy_backend.require()
         self._codes: Dict[str, str] = {}
+        self._tree: Optional[CompactTree] = None
         self._root: Optional[Node] = None
+        self._canonical = canonical
+        self._cache = cache
+        self._max_code_length = max_code_length
+        self._backend = backend
+    
+    @property
+    def canonical(self) -> bool:
+        """Whether canonical codes are assigned"""
+        return self._canonical
+    
+    @property
+    def backend(self) -> str:
+        """Name of the backend doing the bulk array work"""
+        return self._backend
+    
+    @property
+    def max_code_length(self) -> Optional[int]:
+        """Longest code allowed, or None if unbounded"""
+        return self._max_code_length
     
     @property
     def codes(self) -> Dict[str, str]:
         """Get the generated Huffman codes"""
         return self._codes.copy()
     
+    @property
+    def code_lengths(self) -> Dict[str, int]:
+        """Get the code length of each character"""
+        return code_lengths_from_codes(self._codes)
+    
     @property
     def root(self) -> Optional[Node]:
-        """Get the root of the Huffman tree"""
+        """Get the root of the Huffman tree, expanded from the compact tree"""
+        if self._root is None and self._tree is not None:
+            self._root = self._tree.to_node()
         return self._root
     
+    @property
+    def tree(self) -> Optional[CompactTree]:
+        """Get the array-backed Huffman tree"""
+        return self._tree
+    
     def build_frequency_table(self, text: str) -> Dict[str, int]:
         """
         Count character frequencies in the text.
@@ -84,7 +222,10 @@ class HuffmanCoding:
         if not text:
             raise ValueError("Text cannot be empty")
         
-        return dict(Counter(text))
+        with profiling.stage("frequency_count"):
+            if self._backend == "numpy":
+                return numpy_backend.SymbolArray(text).frequency_table()
+            return dict(Counter(text))
     
     def _build_huffman_tree(self, freq_table: Dict[str, int]) -> Optional[Node]:
         """
@@ -115,34 +256,49 @@ class HuffmanCoding:
             )
             heapq.heappush(heap, merged)
         
+        profiling.count(nodes_created=2 * len(freq_table) - 1)
         return heap[0] if heap else None
     
-    def _generate_codes(self, node: Optional[Node], code: str = "") -> None:
+    def _generate_codes(self, node: Optional[Node], code: str = "",
+                        codes: Optional[Dict[str, str]] = None) -> None:
         """
-        Generate binary codes for each character recursively.
+        Generate binary codes for each character.
+        
+        Walks the tree with an explicit stack, so very deep trees do not
+        hit the recursion limit.
         
         Args:
-            node: Current node in the tree
-            code: Current binary code path
+            node: Root of the (sub)tree to walk
+            code: Binary code path leading to ``node``
+            codes: Mapping to fill, defaults to this instance's code map
         """
         if not node:
             return
+        if codes is None:
+            codes = self._codes
         
-        if node.is_leaf:
-            # Leaf node - assign code (handle single character case)
-            self._codes[node.char] = code if code else "0"
-        else:
-            # Internal node - recurse
-            self._generate_codes(node.left, code + "0")
-            self._generate_codes(node.right, code + "1")
+        stack = [(node, code)]
+        while stack:
+            current, path = stack.pop()
+            if current.is_leaf:
+                # Leaf node - assign code (handle single character case)
+                codes[current.char] = path if path else "0"
+                continue
+            # Internal node - push right first so the left subtree is visited first
+            if current.right:
+                stack.append((current.right, path + "1"))
+            if current.left:
+                stack.append((current.left, path + "0"))
     
-    def _serialize_tree(self, node: Optional[Node], x: float = 0, y: float = 0, 
-                       level: int = 0, side: str = "", width_factor: float = 200) -> Dict[str, Any]:
+    def _serialize_tree(self, tree: CompactTree, index: int = 0, x: float = 0,
+                        y: float = 0, level: int = 0, side: str = "",
+                        width_factor: float = 200) -> Dict[str, Any]:
         """
         Serialize tree structure for visualization.
         
         Args:
-            node: Current node to serialize
+            tree: Tree to serialize
+            index: Current node to serialize
             x: X coordinate for positioning
             y: Y coordinate for positioning
             level: Current tree level (depth)
@@ -152,43 +308,35 @@ class HuffmanCoding:
         Returns:
             Dictionary representation of the tree structure
         """
-        if not node:
-            return {}
-        
         # Calculate horizontal spacing for more compact, cubic layout
         spacing = width_factor / (2.2 ** (level + 1))
         spacing = max(spacing, 30)  # Reduced minimum spacing for more compact layout
         
+        char = tree.symbol(index)
+        is_leaf = char is not None
         result = {
-            'id': f"node_{id(node)}",
+            'id': f"node_{index}",
             'x': x,
             'y': y,
             'level': level,
             'side': side,
-            'frequency': node.freq,
-            'is_leaf': node.is_leaf,
-            'char': node.char if node.is_leaf else None,
-            'code': self._codes.get(node.char, '') if node.is_leaf else '',
+            'frequency': tree.frequency(index),
+            'is_leaf': is_leaf,
+            'char': char,
+            'code': self._codes.get(char, '') if is_leaf else '',
             'children': []
         }
         
         # Add children if internal node
-        if not node.is_leaf:
-            left_x = x - spacing
-            right_x = x + spacing
+        if not is_leaf:
             child_y = y + 75  # Slightly reduced for more cubic proportions
-            
-            if node.left:
-                left_child = self._serialize_tree(node.left, left_x, child_y, 
-                                                level + 1, 'left', width_factor)
-                if left_child:
-                    result['children'].append(left_child)
-            
-            if node.right:
-                right_child = self._serialize_tree(node.right, right_x, child_y, 
-                                                 level + 1, 'right', width_factor)
-                if right_child:
-                    result['children'].append(right_child)
+            sides = ((0, 'left', x - spacing), (1, 'right', x + spacing))
+            for bit, child_side, child_x in sides:
+                child = tree.child(index, bit)
+                if child is not None:
+                    result['children'].append(self._serialize_tree(
+                        tree, child, child_x, child_y, level + 1, child_side,
+                        width_factor))
         
         return result
 
@@ -199,26 +347,150 @@ class HuffmanCoding:
         Returns:
             Dictionary containing the complete tree structure
         """
-        if not hasattr(self, '_root') or not self._root:
+        if self._tree is None:
             return {}
         
         # Calculate tree width for more cubic layout - less wide, more proportional
-        leaf_count = self._count_leaf_nodes(self._root)
-        tree_width = min(1000, max(600, leaf_count * 60))
+        tree_width = min(1000, max(600, self._tree.leaf_count * 60))
         
-        return self._serialize_tree(self._root, tree_width / 2, 50, 0, "", tree_width * 0.6)
+        with profiling.stage("tree_layout"):
+            return self._serialize_tree(self._tree, 0, tree_width / 2, 50, 0, "",
+                                        tree_width * 0.6)
     
-    def _count_leaf_nodes(self, node: Optional[Node]) -> int:
-        """Count the number of leaf nodes in the tree."""
-        if not node:
-            return 0
-        if node.is_leaf:
-            return 1
+    def _prepare(self, text: str) -> Dict[str, int]:
+        """
+        Build the frequency table, tree and code map for ``text``.
+        
+        Args:
+            text: Text that is about to be encoded
+            
+        Returns:
+            Frequency table of the text
+            
+        Raises:
+            ValueError: If text is empty
+            EncodingError: If the tree cannot be built
+        """
+        if not text:
+            raise ValueError("Text cannot be empty")
+        
+        # Build frequency table
+        freq_table = self.build_frequency_table(text)
+        self._load_codes(freq_table)
+        return freq_table
+    
+    def _load_codes(self, freq_table: Dict[str, int]) -> None:
+        """Build (or fetch from the cache) the tree and code map for a table"""
+        self._root = None
+        codes, self._tree = self._code_table(freq_table)
+        # Cached maps are shared, so keep a private copy for this instance
+        self._codes = dict(codes) if self._cache is not None else codes
+    
+    def _code_table(self,
+                    freq_table: Dict[str, int]) -> Tuple[Dict[str, str], CompactTree]:
+        """Build, or fetch from the cache, the codes and tree for a table"""
+        if self._cache is None:
+            return self._build_code_table(freq_table)
+        key = self._cache.fingerprint("codes", freq_table, self._canonical,
+                                      self._max_code_length)
+        return self._cache.get_or_build(
+            key, lambda: self._build_code_table(freq_table),
+            lambda built: _CODE_ENTRY_SIZE * len(built[0]))
+    
+    def code_lengths_for(self, freq_table: Dict[str, int]) -> Dict[str, int]:
+        """
+        Get the code lengths :meth:`encode` assigns for a frequency table.
+        
+        Lets batch callers send the compact canonical header for each
+        item without re-encoding it. Uses the cache when there is one.
+        
+        Args:
+            freq_table: Character frequency mapping
+            
+        Returns:
+            Character to code length mapping
+            
+        Raises:
+            ValueError: If the frequency table is empty
+            EncodingError: If the codes cannot be built
+        """
+        if not freq_table:
+            raise ValueError("Frequency table cannot be empty")
+        return code_lengths_from_codes(self._code_table(freq_table)[0])
+    
+    def _encode_array(self, text: str,
+                      packed: bool = False) -> Optional[Tuple[Any, Dict[str, int]]]:
+        """
+        Encode with the numpy backend.
+        
+        Args:
+            text: Text to encode
+            packed: Pack the bits chunk by chunk instead of returning them
+            
+        Returns:
+            Tuple of (0/1 bit array, or (packed_bytes, bit_length) when
+            ``packed``, frequency_table), or None if the codes are too
+            long for the vectorized path
+            
+        Raises:
+            ValueError: If text is empty
+        """
+        if not text:
+            raise ValueError("Text cannot be empty")
+        with profiling.stage("frequency_count"):
+            symbols = numpy_backend.SymbolArray(text)
+            freq_table = symbols.frequency_table()
+        self._load_codes(freq_table)
+        if max(map(len, self._codes.values())) > numpy_backend.MAX_ENCODE_BITS:
+            return None
+        with profiling.stage("bit_packing"):
+            if packed:
+                return numpy_backend.encode_packed(symbols, self._codes), freq_table
+            return numpy_backend.encode_bits(symbols, self._codes), freq_table
+    
+    def _build_code_table(
+            self, freq_table: Dict[str, int]) -> Tuple[Dict[str, str], CompactTree]:
+        """
+        Build the tree and code map for a frequency table.
+        
+        Args:
+            freq_table: Character frequency mapping
+            
+        Returns:
+            Tuple of (codes, tree)
+            
+        Raises:
+            ValueError: If the alphabet does not fit in ``max_code_length``
+            EncodingError: If the tree cannot be built
+        """
+        # Handle single character case
+        if len(freq_table) == 1:
+            char = next(iter(freq_table))
+            # A single leaf as root for visualization
+            return {char: "0"}, CompactTree.from_codes({char: "0"}, freq_table)
+        
+        if self._canonical or self._max_code_length is not None:
+            # Canonical codes only need the lengths, so no Node tree is built
+            with profiling.stage("tree_build"):
+                lengths = code_lengths_from_frequencies(freq_table,
+                                                        self._max_code_length)
+            with profiling.stage("code_generation"):
+                codes = assign_canonical_codes(lengths)
+                # Shape the tree so visualized paths match the canonical codes
+                return codes, CompactTree.from_codes(codes, freq_table)
+        
+        # Build tree and generate codes
+        with profiling.stage("tree_build"):
+            root = self._build_huffman_tree(freq_table)
+        if not root:
+            raise EncodingError("Failed to build Huffman tree")
         
-        left_count = self._count_leaf_nodes(node.left) if node.left else 0
-        right_count = self._count_leaf_nodes(node.right) if node.right else 0
-        return left_count + right_count
+        with profiling.stage("code_generation"):
+            codes: Dict[str, str] = {}
+            self._generate_codes(root, codes=codes)
+            return codes, CompactTree.from_node(root)
     
+    @_timed("encode")
     def encode(self, text: str) -> Tuple[str, Dict[str, int]]:
         """
         Encode text using Huffman coding.
@@ -233,36 +505,23 @@ class HuffmanCoding:
             EncodingError: If encoding fails
         """
         try:
-            if not text:
-                raise ValueError("Text cannot be empty")
-            
-            # Build frequency table
-            freq_table = self.build_frequency_table(text)
-            
-            # Handle single character case
-            if len(freq_table) == 1:
-                char = next(iter(freq_table))
-                freq = freq_table[char]
-                # Create a single leaf node as root for visualization
-                from .node import Node
-                self._root = Node(char=char, freq=freq)
-                self._codes = {char: "0"}
-                return "0" * len(text), freq_table
-            
-            # Build tree and generate codes
-            self._root = self._build_huffman_tree(freq_table)
-            if not self._root:
-                raise EncodingError("Failed to build Huffman tree")
-            
-            self._codes = {}
-            self._generate_codes(self._root)
+            if self._backend == "numpy":
+                result = self._encode_array(text)
+                if result is not None:
+                    bits, freq_table = result
+                    _record_encode(len(text), len(bits), len(freq_table))
+                    return numpy_backend.bits_to_string(bits), freq_table
+            
+            freq_table = self._prepare(text)
             
             # Encode the text
             try:
-                encoded = "".join(self._codes[char] for char in text)
+                with profiling.stage("bit_packing"):
+                    encoded = "".join(self._codes[char] for char in text)
             except KeyError as e:
                 raise EncodingError(f"Character not found in codes: {e}")
             
+            _record_encode(len(text), len(encoded), len(freq_table))
             return encoded, freq_table
             
         except Exception as e:
@@ -270,13 +529,234 @@ class HuffmanCoding:
                 raise
             raise EncodingError(f"Encoding failed: {str(e)}") from e
     
-    def decode(self, encoded_text: str, freq_table: Dict[str, int]) -> str:
+    @_timed("encode")
+    def encode_packed(self, text: str) -> Tuple[bytes, int, Dict[str, int]]:
         """
-        Decode binary text using frequency table.
+        Encode text into packed bytes instead of a '0'/'1' string.
+        
+        The bit stream is identical to :meth:`encode`, packed MSB-first
+        and zero-padded to a whole number of bytes.
+        
+        Args:
+            text: Text to encode
+            
+        Returns:
+            Tuple of (packed_bytes, bit_length, frequency_table)
+            
+        Raises:
+            EncodingError: If encoding fails
+        """
+        try:
+            if self._backend == "numpy":
+                result = self._encode_array(text, packed=True)
+                if result is not None:
+                    (packed, bit_length), freq_table = result
+                    _record_encode(len(text), bit_length, len(freq_table))
+                    return packed, bit_length, freq_table
+            
+            freq_table = self._prepare(text)
+            writer = BitWriter()
+            
+            with profiling.stage("bit_packing"):
+                if len(freq_table) == 1:
+                    writer.write(0, len(text))
+                else:
+                    writer.write_codes(text, self._codes.__getitem__)
+            
+            _record_encode(len(text), writer.bit_length, len(freq_table))
+            return writer.getvalue(), writer.bit_length, freq_table
+            
+        except Exception as e:
+            if isinstance(e, (ValueError, EncodingError)):
+                raise
+            raise EncodingError(f"Encoding failed: {str(e)}") from e
+    
+    def encode_many(self, texts: Sequence[str], shared: bool = False,
+                    workers: Optional[int] = 1) -> List[Tuple[str, Dict[str, int]]]:
+        """
+        Encode a batch of texts in one call.
+        
+        By default each text gets its own frequency table, as with
+        :meth:`encode`, but texts with identical tables reuse the built
+        codes through the instance cache, or a cache local to the call.
+        With ``shared`` one table is counted over the whole batch, so it
+        is built (and needs sending) only once and this instance holds
+        its codes afterwards; otherwise the instance state is untouched.
+        
+        Args:
+            texts: Texts to encode
+            shared: Code every text with one table for the whole batch
+            workers: Worker processes; None uses every CPU, 0 or 1 codes
+                in this thread. Pays off only for large batches, since each
+                worker builds its own codes
+            
+        Returns:
+            List of (encoded_binary_string, frequency_table), one per text
+            
+        Raises:
+            ValueError: If a text is empty
+            EncodingError: If encoding fails
+        """
+        texts = list(texts)
+        freq_table = None
+        if shared:
+            for index, text in enumerate(texts):
+                if not text:
+                    raise ValueError(f"Item {index}: Text cannot be empty")
+            counts: Counter = Counter()
+            for text in texts:
+                counts.update(text)
+            if not counts:
+                return []
+            freq_table = dict(counts)
+            self._load_codes(freq_table)
+        
+        if runs_inline(workers):
+            coder = self if shared else self._batch_coder()
+            return coder._encode_items(texts, freq_table)
+        jobs = ((self._options(), texts[start:start + _BATCH_SIZE], freq_table, start)
+                for start in range(0, len(texts), _BATCH_SIZE))
+        return [result for batch in map_ordered(_encode_batch, jobs, workers)
+                for result in batch]
+    
+    def _encode_items(self, texts: List[str], freq_table: Optional[Dict[str, int]],
+                      offset: int = 0) -> List[Tuple[str, Dict[str, int]]]:
+        """Encode texts in-process for :meth:`encode_many`, naming failed items"""
+        if freq_table is not None:
+            self._load_codes(freq_table)
+            lookup = self._codes.__getitem__
+            return [("".join(map(lookup, text)), freq_table) for text in texts]
+        
+        results = []
+        for index, text in enumerate(texts, offset):
+            try:
+                results.append(self.encode(text))
+            except (ValueError, EncodingError) as e:
+                raise type(e)(f"Item {index}: {e}") from e
+        return results
+    
+    def _options(self) -> Dict[str, Any]:
+        """Constructor arguments that shape the codes, for worker processes"""
+        return {'canonical': self._canonical, 'max_code_length': self._max_code_length,
+                'backend': self._backend}
+    
+    def _batch_coder(self) -> "HuffmanCoding":
+        """A fresh instance configured like this one, always with a cache"""
+        return HuffmanCoding(cache=self._cache or CodeTableCache(), **self._options())
+    
+    def _decoder_for(self, freq_table: Optional[Dict[str, int]],
+                     code_lengths: Optional[Dict[str, int]] = None,
+                     vectorized: bool = False) -> Any:
+        """
+        Recover the code table and wrap it in a decoder.
+        
+        Code lengths always describe canonical codes and only need a sort.
+        A frequency table is replayed through the tree build, yielding the
+        same codes :meth:`encode` assigned on an instance configured like
+        this one.
+        
+        Args:
+            freq_table: Character frequency mapping
+            code_lengths: Character to code length mapping, used instead
+                of ``freq_table`` when given
+            vectorized: Prefer a :class:`NumpyDecoder` when the codes
+                are short enough
+            
+        Returns:
+            Lookup-table decoder for the recovered codes, with a
+            ``decode(data, bit_length)`` method
+            
+        Raises:
+            ValueError: If neither table is provided
+            DecodingError: If the codes cannot be recovered
+        """
+        if code_lengths:
+            table, kind, variant = code_lengths, "decoder-lengths", ()
+        elif not freq_table:
+            raise ValueError("Frequency table cannot be empty")
+        else:
+            table, kind = freq_table, "decoder-freqs"
+            variant = (self._canonical, self._max_code_length)
+        
+        if vectorized:
+            kind += "-numpy"
+        if self._cache is None:
+            return self._build_decoder(freq_table, code_lengths, vectorized)
+        return self._cache.get_or_build(
+            self._cache.fingerprint(kind, table, *variant),
+            lambda: self._build_decoder(freq_table, code_lengths, vectorized),
+            lambda decoder: decoder.approximate_size)
+    
+    def _build_decoder(self, freq_table: Optional[Dict[str, int]],
+                       code_lengths: Optional[Dict[str, int]],
+                       vectorized: bool = False) -> Any:
+        """Build the decoder for :meth:`_decoder_for` without consulting the cache"""
+        codes = self._recover_codes(freq_table, code_lengths)[0]
+        with profiling.stage("decoder_build"):
+            longest = max(map(len, codes.values()))
+            if vectorized and longest <= numpy_backend.MAX_TABLE_BITS:
+                return numpy_backend.NumpyDecoder(codes)
+            return TableDecoder(codes)
+    
+    def _recover_codes(
+            self, freq_table: Optional[Dict[str, int]],
+            code_lengths: Optional[Dict[str, int]]
+    ) -> Tuple[Dict[str, str], Optional[CompactTree]]:
+        """
+        Recover the codes :meth:`encode` assigned, and the tree if it was built.
+        
+        Raises:
+            DecodingError: If the codes cannot be recovered
+        """
+        if code_lengths:
+            try:
+                return assign_canonical_codes(code_lengths), None
+            except ValueError as e:
+                raise DecodingError(f"Invalid code lengths: {e}") from e
+        assert freq_table
+        try:
+            return self._build_code_table(freq_table)
+        except (ValueError, EncodingError) as e:
+            raise DecodingError(f"Invalid frequency table: {e}") from e
+    
+    def _tree_for(self, freq_table: Optional[Dict[str, int]],
+                  code_lengths: Optional[Dict[str, int]]) -> CompactTree:
+        """
+        Recover the tree :meth:`encode` used, sharing cached code tables.
+        
+        A frequency table maps to the same cache entry as encoding it, so
+        short messages decode without building anything after a hit.
+        
+        Raises:
+            DecodingError: If the codes cannot be recovered
+        """
+        if code_lengths:
+            def build() -> CompactTree:
+                codes = self._recover_codes(None, code_lengths)[0]
+                return CompactTree.from_codes(codes)
+            
+            if self._cache is None:
+                return build()
+            return self._cache.get_or_build(
+                self._cache.fingerprint("tree-lengths", code_lengths), build,
+                lambda tree: _CODE_ENTRY_SIZE * tree.leaf_count)
+        assert freq_table
+        try:
+            return self._code_table(freq_table)[1]
+        except (ValueError, EncodingError) as e:
+            raise DecodingError(f"Invalid frequency table: {e}") from e
+    
+    @_timed("decode")
+    def decode(self, encoded_text: str, freq_table: Optional[Dict[str, int]] = None,
+               code_lengths: Optional[Dict[str, int]] = None) -> str:
+        """
+        Decode binary text using frequency table or canonical code lengths.
         
         Args:
             encoded_text: Binary string to decode
             freq_table: Character frequency mapping
+            code_lengths: Character to code length mapping of canonical
+                codes, used instead of ``freq_table`` when given
             
         Returns:
             Decoded text
@@ -288,46 +768,206 @@ class HuffmanCoding:
             if not encoded_text:
                 return ""
             
-            if not freq_table:
+            if not freq_table and not code_lengths:
                 raise ValueError("Frequency table cannot be empty")
             
             # Validate binary string
-            if not all(bit in '01' for bit in encoded_text):
+            if not set(encoded_text) <= _BINARY_DIGITS:
                 raise DecodingError("Encoded text must contain only 0s and 1s")
             
-            # Handle single character case
-            if len(freq_table) == 1:
-                char = next(iter(freq_table))
-                return char * len(encoded_text)
+            # Short inputs: walking the tree beats building lookup tables
+            if len(encoded_text) <= _TREE_DECODE_MAX_BITS:
+                tree = self._tree_for(freq_table, code_lengths)
+                with profiling.stage("symbol_decode"):
+                    decoded = tree.decode(encoded_text)
+            elif self._backend == "numpy":
+                decoder = self._decoder_for(freq_table, code_lengths, vectorized=True)
+                with profiling.stage("symbol_decode"):
+                    decoded = decoder.decode(numpy_backend.pack_string(encoded_text),
+                                             len(encoded_text))
+            else:
+                decoder = self._decoder_for(freq_table, code_lengths)
+                with profiling.stage("symbol_decode"):
+                    decoded = decoder.decode(pack_bits(encoded_text), len(encoded_text))
             
-            # Rebuild tree
-            root = self._build_huffman_tree(freq_table)
-            if not root:
-                raise DecodingError("Failed to rebuild Huffman tree")
+            _record_decode(len(decoded), len(encoded_text))
+            return decoded
             
-            # Decode bit by bit
-            decoded = []
-            current = root
+        except Exception as e:
+            if isinstance(e, (ValueError, DecodingError)):
+                raise
+            raise DecodingError(f"Decoding failed: {str(e)}") from e
+    
+    @_timed("decode")
+    def decode_packed(self, data: BytesLike, bit_length: int,
+                      freq_table: Optional[Dict[str, int]] = None,
+                      code_lengths: Optional[Dict[str, int]] = None) -> str:
+        """
+        Decode packed bytes produced by :meth:`encode_packed`.
+        
+        Args:
+            data: Packed encoded bytes
+            bit_length: Number of meaningful bits in ``data``
+            freq_table: Character frequency mapping
+            code_lengths: Character to code length mapping of canonical
+                codes, used instead of ``freq_table`` when given
             
-            for bit in encoded_text:
-                if bit == "0":
-                    current = current.left
-                else:
-                    current = current.right
-                
-                if not current:
-                    raise DecodingError("Invalid binary sequence")
-                
-                # If we reach a leaf node
-                if current.is_leaf:
-                    decoded.append(current.char)
-                    current = root
+        Returns:
+            Decoded text
             
-            # Check if we ended at root (complete decode)
-            if current != root:
-                raise DecodingError("Incomplete binary sequence")
+        Raises:
+            DecodingError: If decoding fails
+        """
+        try:
+            if not bit_length:
+                return ""
             
-            return "".join(decoded)
+            decoder = self._decoder_for(freq_table, code_lengths,
+                                        vectorized=self._backend == "numpy")
+            with profiling.stage("symbol_decode"):
+                decoded = decoder.decode(data, bit_length)
+            _record_decode(len(decoded), bit_length)
+            return decoded
+            
+        except Exception as e:
+            if isinstance(e, (ValueError, DecodingError)):
+                raise
+            raise DecodingError(f"Decoding failed: {str(e)}") from e
+    
+    def decode_many(self, encoded: Sequence[str], freq_tables: Tables = None,
+                    code_lengths: Tables = None,
+                    workers: Optional[int] = 1) -> List[str]:
+        """
+        Decode a batch of binary strings in one call.
+        
+        Tables are given per item as sequences, or once as a single
+        mapping shared by every item. An item uses its code lengths when
+        present and its frequency table otherwise. Items with identical
+        tables share the recovered codes and decoders.
+        
+        Args:
+            encoded: Binary strings to decode
+            freq_tables: Frequency table per item, or one for all items
+            code_lengths: Canonical code lengths per item, or one for all
+            workers: Worker processes; None uses every CPU, 0 or 1 decodes
+                in this thread
+            
+        Returns:
+            Decoded texts, one per item
+            
+        Raises:
+            ValueError: If a table sequence does not match the items, or
+                an item has no table
+            DecodingError: If decoding an item fails
+        """
+        encoded = list(encoded)
+        freqs = _per_item(freq_tables, len(encoded))
+        lengths = _per_item(code_lengths, len(encoded))
+        
+        if runs_inline(workers):
+            return self._batch_coder()._decode_items(encoded, freqs, lengths)
+        jobs = ((self._options(), encoded[start:start + _BATCH_SIZE],
+                 freqs[start:start + _BATCH_SIZE], lengths[start:start + _BATCH_SIZE],
+                 start)
+                for start in range(0, len(encoded), _BATCH_SIZE))
+        batches = map_ordered(_decode_batch, jobs, workers)
+        return [text for batch in batches for text in batch]
+    
+    def _decode_items(self, encoded: List[str],
+                      freq_tables: List[Optional[Dict[str, int]]],
+                      code_lengths: List[Optional[Dict[str, int]]],
+                      offset: int = 0) -> List[str]:
+        """Decode items in-process for :meth:`decode_many`, naming failed items"""
+        results = []
+        for index, item in enumerate(zip(encoded, freq_tables, code_lengths), offset):
+            try:
+                results.append(self.decode(*item))
+            except (ValueError, DecodingError) as e:
+                raise type(e)(f"Item {index}: {e}") from e
+        return results
+    
+    def build_seek_index(self, text: str, interval: int = 1024) -> SeekIndex:
+        """
+        Record the bit offset of every ``interval``-th character.
+        
+        Uses the codes from the last :meth:`encode` of ``text``, so
+        :meth:`decode_range` can start decoding at a checkpoint instead
+        of bit 0.
+        
+        Args:
+            text: The text that was encoded
+            interval: Characters between checkpoints
+            
+        Returns:
+            SeekIndex with one offset per checkpoint
+            
+        Raises:
+            ValueError: If the interval is not positive
+            EncodingError: If no codes are available for the text
+        """
+        if interval < 1:
+            raise ValueError("Seek interval must be positive")
+        
+        lengths = self.code_lengths
+        offsets = []
+        position = 0
+        try:
+            for start in range(0, len(text), interval):
+                offsets.append(position)
+                position += sum(map(lengths.__getitem__, text[start:start + interval]))
+        except KeyError as e:
+            raise EncodingError(f"Character not found in codes: {e}") from None
+        return SeekIndex(interval=interval, offsets=offsets)
+    
+    def decode_range(self, encoded: Union[str, BytesLike], start: int, stop: int,
+                     seek_index: SeekIndex, freq_table: Optional[Dict[str, int]] = None,
+                     code_lengths: Optional[Dict[str, int]] = None,
+                     bit_length: Optional[int] = None) -> str:
+        """
+        Decode characters ``start:stop`` without decoding from bit 0.
+        
+        Only the checkpoint intervals overlapping the range are decoded.
+        
+        Args:
+            encoded: Binary string, or packed bytes with ``bit_length``
+            start: Index of the first character wanted
+            stop: Index after the last character wanted
+            seek_index: Checkpoints from :meth:`build_seek_index`
+            freq_table: Character frequency mapping
+            code_lengths: Character to code length mapping of canonical
+                codes, used instead of ``freq_table`` when given
+            bit_length: Number of meaningful bits for packed input
+            
+        Returns:
+            The decoded slice
+            
+        Raises:
+            DecodingError: If decoding fails
+        """
+        try:
+            if start < 0 or stop < start:
+                raise ValueError("Invalid range")
+            if stop == start or not seek_index.offsets:
+                return ""
+            
+            if isinstance(encoded, str):
+                if not set(encoded) <= _BINARY_DIGITS:
+                    raise DecodingError("Encoded text must contain only 0s and 1s")
+                bit_length = len(encoded)
+            elif bit_length is None:
+                raise ValueError("Bit length is required for packed input")
+            
+            last_entry = seek_index.interval * (len(seek_index.offsets) - 1)
+            first, start_bit, stop_bit = seek_index.span(
+                min(start, last_entry), stop, bit_length)
+            decoder = self._decoder_for(freq_table, code_lengths)
+            
+            if isinstance(encoded, str):
+                bits = encoded[start_bit:stop_bit]
+                decoded = decoder.decode(pack_bits(bits), len(bits))
+            else:
+                decoded = decoder.decode(encoded, stop_bit, start_bit)
+            return decoded[start - first:stop - first]  # type: ignore[return-value]
             
         except Exception as e:
             if isinstance(e, (ValueError, DecodingError)):
@@ -354,3 +994,31 @@ class HuffmanCoding:
             compression_ratio=0,  # Will be calculated in __post_init__
             space_saved=0  # Will be calculated in __post_init__
         )
+
+
+def _per_item(tables: Tables, count: int) -> List[Optional[Dict[str, int]]]:
+    """Expand a shared table, or check a per-item sequence, to one entry per item"""
+    if tables is None:
+        return [None] * count
+    if isinstance(tables, Mapping):
+        return [dict(tables)] * count
+    tables = list(tables)
+    if len(tables) != count:
+        raise ValueError(f"Expected {count} tables, got {len(tables)}")
+    return tables
+
+
+def _encode_batch(job: Tuple[Dict[str, Any], List[str], Optional[Dict[str, int]], int]
+                  ) -> List[Tuple[str, Dict[str, int]]]:
+    """Encode one task of :meth:`HuffmanCoding.encode_many` in a worker process"""
+    options, texts, freq_table, offset = job
+    coder = HuffmanCoding(cache=CodeTableCache(), **options)
+    return coder._encode_items(texts, freq_table, offset)
+
+
+def _decode_batch(job: Tuple[Dict[str, Any], List[str], List[Optional[Dict[str, int]]],
+                             List[Optional[Dict[str, int]]], int]) -> List[str]:
+    """Decode one task of :meth:`HuffmanCoding.decode_many` in a worker process"""
+    options, encoded, freq_tables, code_lengths, offset = job
+    coder = HuffmanCoding(cache=CodeTableCache(), **options)
+    return coder._decode_items(encoded, freq_tables, code_lengths, offset)
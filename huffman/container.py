@@ -0,0 +1,731 @@
+"""
+Versioned binary .huff container with streaming file compression
+"""
+
+import bisect
+import io
+import os
+import struct
+import zlib
+from collections import Counter
+from dataclasses import dataclass
+from typing import BinaryIO, Iterator, List, Optional, Sequence, Tuple
+
+from .bitio import BitWriter, BytesLike, byte_view
+from .byte_coding import ALPHABET_SIZE, ByteHuffmanCoding
+from .canonical import read_code_lengths, serialize_code_lengths
+from .coding import CompressionStats
+from .exceptions import DecodingError, EncodingError
+from .parallel import map_ordered, runs_inline
+
+MAGIC = b"HUFF"
+FORMAT_VERSION = 1
+BLOCK_FORMAT_VERSION = 2
+
+# magic, version, flags, original length, CRC-32 of original, payload bit length
+_FIXED_HEADER = struct.Struct(">4sBBQIQ")
+
+# Block containers: magic, version, flags, block size
+_BLOCK_FILE_HEADER = struct.Struct(">4sBBI")
+# Per block: original length, CRC-32 of original, payload bit length, body length
+_BLOCK_HEADER = struct.Struct(">IIQI")
+# Block index entry: container offset of the block record, original offset
+_INDEX_ENTRY = struct.Struct(">QQ")
+# Trailer: index offset, original length, block count, trailer magic
+_TRAILER = struct.Struct(">QQI4s")
+TRAILER_MAGIC = b"HIDX"
+
+# Read size for streaming compression and decompression
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+# Uncompressed size of each independently coded block
+DEFAULT_BLOCK_SIZE = 4 << 20
+
+
+@dataclass
+class ContainerHeader:
+    """Metadata stored at the start of a .huff container"""
+    version: int
+    flags: int
+    original_length: int
+    crc32: int
+    bit_length: int
+    code_lengths: List[int]
+
+    @property
+    def payload_length(self) -> int:
+        """Size of the packed payload in bytes"""
+        return (self.bit_length + 7) // 8
+
+    def to_bytes(self) -> bytes:
+        """Serialize the fixed header followed by the code-length header"""
+        fixed = _FIXED_HEADER.pack(MAGIC, self.version, self.flags,
+                                   self.original_length, self.crc32, self.bit_length)
+        if not self.original_length:
+            return fixed
+        used = {byte: length for byte, length in enumerate(self.code_lengths) if length}
+        return fixed + serialize_code_lengths(used)
+
+
+def _read_byte_code_lengths(data: BytesLike, pos: int) -> Tuple[List[int], int]:
+    """Parse an embedded code-length header into a 256-entry list"""
+    try:
+        table, pos = read_code_lengths(data, pos, binary=True)
+    except ValueError as e:
+        raise DecodingError(f"Invalid code-length header: {e}") from e
+
+    lengths = [0] * ALPHABET_SIZE
+    for byte, length in table.items():
+        if not 0 <= byte < ALPHABET_SIZE:  # type: ignore[operator]
+            raise DecodingError(f"Invalid byte symbol {byte} in header")
+        lengths[byte] = length  # type: ignore[index]
+    return lengths, pos
+
+
+def _peek_version(data: BytesLike) -> int:
+    """Return the format version of the container starting ``data``"""
+    if len(data) < 5:
+        raise DecodingError("Truncated container header")
+    if bytes(data[:4]) != MAGIC:
+        raise DecodingError("Not a Huffman container (bad magic)")
+    return data[4]
+
+
+def parse_header(data: BytesLike) -> Tuple[ContainerHeader, int]:
+    """
+    Parse a single-block container header from the start of ``data``.
+
+    Args:
+        data: Buffer starting with a container header
+
+    Returns:
+        Tuple of (header, offset of the payload)
+
+    Raises:
+        DecodingError: If the header is malformed or unsupported
+    """
+    version = _peek_version(data)
+    if version != FORMAT_VERSION:
+        raise DecodingError(f"Unsupported container version {version}")
+    if len(data) < _FIXED_HEADER.size:
+        raise DecodingError("Truncated container header")
+    fields = _FIXED_HEADER.unpack_from(data)
+    _, version, flags, original_length, crc, bit_length = fields
+
+    lengths = [0] * ALPHABET_SIZE
+    pos = _FIXED_HEADER.size
+    if original_length:
+        lengths, pos = _read_byte_code_lengths(data, pos)
+
+    header = ContainerHeader(version, flags, original_length, crc, bit_length, lengths)
+    return header, pos
+
+
+def _payload_bits(counts: Sequence[int], lengths: Sequence[int]) -> int:
+    """Exact payload size implied by byte counts and code lengths"""
+    return sum(count * length for count, length in zip(counts, lengths))
+
+
+def compress(data: BytesLike) -> bytes:
+    """
+    Compress a buffer into a complete container.
+
+    Args:
+        data: Bytes to compress
+
+    Returns:
+        Container bytes
+    """
+    view = byte_view(data)
+    codec = ByteHuffmanCoding()
+    if not len(view):
+        header = ContainerHeader(FORMAT_VERSION, 0, 0, 0, 0, [0] * ALPHABET_SIZE)
+        return header.to_bytes()
+
+    counts = codec.build_frequency_table(view)
+    lengths = codec.build_codes(counts)
+    writer = codec.encode_with_codes(view)
+    header = ContainerHeader(FORMAT_VERSION, 0, len(view), zlib.crc32(view),
+                             writer.bit_length, lengths)
+    return header.to_bytes() + writer.getvalue()
+
+
+def decompress(data: BytesLike) -> bytes:
+    """
+    Decompress a complete container held in memory.
+
+    Args:
+        data: Container bytes
+
+    Returns:
+        Original bytes
+
+    Raises:
+        DecodingError: If the container is malformed or fails its checksum
+    """
+    if _peek_version(data) == BLOCK_FORMAT_VERSION:
+        reader = _PrefixedReader(bytes(data), io.BytesIO())
+        return b"".join(_iter_decompress_blocks(reader, workers=1))
+
+    header, pos = parse_header(data)
+    payload = memoryview(data)[pos:]
+    if len(payload) < header.payload_length:
+        raise DecodingError("Truncated container payload")
+    output = b"".join(_decode_chunks(header, [payload[:header.payload_length]]))
+    _verify(header, len(output), zlib.crc32(output))
+    return output
+
+
+def _decode_chunks(header: ContainerHeader,
+                   chunks: Iterator[BytesLike]) -> Iterator[bytes]:
+    """Decode payload chunks with the header's code table"""
+    if not header.original_length:
+        return iter(())
+    codec = ByteHuffmanCoding()
+    try:
+        codec.set_code_lengths(header.code_lengths)
+    except ValueError as e:
+        raise DecodingError(f"Invalid code lengths: {e}") from e
+    pieces = codec.decoder().decode_stream(chunks, header.bit_length)
+    return pieces  # type: ignore[return-value]
+
+
+def _verify(header: ContainerHeader, length: int, crc: int) -> None:
+    """Check decoded size and checksum against the header"""
+    if length != header.original_length:
+        raise DecodingError(
+            f"Decoded length {length} does not match header ({header.original_length})")
+    if crc != header.crc32:
+        raise DecodingError("Checksum mismatch: container is corrupted")
+
+
+def _read_chunks(stream: BinaryIO, chunk_size: int, limit: int = -1) -> Iterator[bytes]:
+    """Yield chunks from ``stream``, stopping after ``limit`` bytes when given"""
+    while limit:
+        size = chunk_size if limit < 0 else min(chunk_size, limit)
+        chunk = stream.read(size)
+        if not chunk:
+            return
+        if limit > 0:
+            limit -= len(chunk)
+        yield chunk
+
+
+def compress_stream(src: BinaryIO, dst: BinaryIO,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE) -> CompressionStats:
+    """
+    Compress a seekable binary stream into a container.
+
+    The input is read twice, a chunk at a time: once to count bytes and
+    compute the checksum, then again to encode. Memory use is bounded by
+    the chunk size regardless of input size.
+
+    Args:
+        src: Seekable binary input stream
+        dst: Binary output stream
+        chunk_size: Bytes read per step
+
+    Returns:
+        CompressionStats comparing input and container sizes
+
+    Raises:
+        EncodingError: If the input is not seekable
+    """
+    if not src.seekable():
+        raise EncodingError("Input stream must be seekable for two-pass compression")
+    start = src.tell()
+
+    # Pass 1: frequencies, length and checksum
+    counter: Counter = Counter()
+    crc = 0
+    original_length = 0
+    for chunk in _read_chunks(src, chunk_size):
+        counter.update(chunk)
+        crc = zlib.crc32(chunk, crc)
+        original_length += len(chunk)
+
+    codec = ByteHuffmanCoding()
+    counts = [counter.get(byte, 0) for byte in range(ALPHABET_SIZE)]
+    lengths = codec.build_codes(counts) if original_length else [0] * ALPHABET_SIZE
+    header = ContainerHeader(FORMAT_VERSION, 0, original_length, crc,
+                             _payload_bits(counts, lengths), lengths)
+    header_bytes = header.to_bytes()
+    dst.write(header_bytes)
+
+    # Pass 2: encode, flushing whole bytes after every chunk
+    src.seek(start)
+    writer = BitWriter()
+    for chunk in _read_chunks(src, chunk_size, original_length):
+        codec.encode_with_codes(chunk, writer)
+        dst.write(writer.take())
+    dst.write(writer.getvalue())
+
+    if writer.bit_length != header.bit_length:
+        raise EncodingError("Input changed while it was being compressed")
+
+    return CompressionStats(
+        original_size=original_length * 8,
+        compressed_size=(len(header_bytes) + header.payload_length) * 8,
+        compression_ratio=0,  # Will be calculated in __post_init__
+        space_saved=0  # Will be calculated in __post_init__
+    )
+
+
+def decompress_stream(src: BinaryIO, dst: BinaryIO,
+                      chunk_size: int = DEFAULT_CHUNK_SIZE,
+                      workers: Optional[int] = 1) -> int:
+    """
+    Decompress a container stream, verifying length and checksum.
+
+    Args:
+        src: Binary input stream positioned at a container
+        dst: Binary output stream
+        chunk_size: Bytes read per step
+        workers: Processes decoding blocks of a block container in
+            parallel; ``None`` uses every CPU
+
+    Returns:
+        Number of bytes written
+
+    Raises:
+        DecodingError: If the container is malformed or corrupted
+    """
+    written = 0
+    for piece in iter_decompress(src, chunk_size, workers):
+        written += dst.write(piece)
+    return written
+
+
+def iter_decompress(src: BinaryIO, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    workers: Optional[int] = 1) -> Iterator[bytes]:
+    """
+    Decompress a container stream lazily, yielding decoded pieces.
+
+    Blocks of a block container are verified before they are yielded. A
+    single-table container is verified once its last piece is out, so a
+    consumer must treat the output as untrusted until the iterator ends.
+    When ``src`` is seekable, truncation is caught before anything is
+    yielded: a block container must end with its index and trailer, and
+    a single-table container must hold its whole payload.
+
+    Args:
+        src: Binary input stream positioned at a container
+        chunk_size: Bytes read per step
+        workers: Processes decoding blocks of a block container in
+            parallel; ``None`` uses every CPU
+
+    Returns:
+        Iterator over decoded byte strings
+
+    Raises:
+        DecodingError: If the container is malformed or corrupted
+    """
+    # The code-length header is variable sized, so parse it from the first read
+    head = src.read(max(chunk_size, 4096))
+    if _peek_version(head) == BLOCK_FORMAT_VERSION:
+        if src.seekable():
+            _check_trailer(src, len(head))
+        yield from _iter_decompress_blocks(_PrefixedReader(head, src), workers)
+        return
+    header, pos = parse_header(head)
+    if src.seekable() and _remaining(src, len(head)) < pos + header.payload_length:
+        raise DecodingError("Truncated container payload")
+
+    def payload() -> Iterator[BytesLike]:
+        first = memoryview(head)[pos:pos + header.payload_length]
+        yield first
+        yield from _read_chunks(src, chunk_size, header.payload_length - len(first))
+
+    written = 0
+    crc = 0
+    for piece in _decode_chunks(header, payload()):
+        crc = zlib.crc32(piece, crc)
+        written += len(piece)
+        yield piece
+
+    _verify(header, written, crc)
+
+
+def _remaining(src: BinaryIO, consumed: int) -> int:
+    """Bytes of a seekable stream from ``consumed`` bytes before its position"""
+    pos = src.tell()
+    end = src.seek(0, os.SEEK_END)
+    src.seek(pos)
+    return end - pos + consumed
+
+
+def _check_trailer(src: BinaryIO, consumed: int) -> None:
+    """
+    Check a seekable block container ends with a trailer locating its index.
+
+    Args:
+        src: Stream positioned ``consumed`` bytes into the container; its
+            position is restored
+
+    Raises:
+        DecodingError: If the trailer is missing or the size does not match
+    """
+    pos = src.tell()
+    size = _remaining(src, consumed)
+    if size < _BLOCK_FILE_HEADER.size + _BLOCK_HEADER.size + _TRAILER.size:
+        raise DecodingError("Missing block container trailer")
+    src.seek(pos - consumed + size - _TRAILER.size)
+    index_offset, _, count, magic = _TRAILER.unpack(src.read(_TRAILER.size))
+    src.seek(pos)
+    if magic != TRAILER_MAGIC:
+        raise DecodingError("Missing block container trailer")
+    if index_offset + count * _INDEX_ENTRY.size + _TRAILER.size != size:
+        raise DecodingError("Block container size does not match its trailer")
+
+
+def encode_block(data: bytes) -> bytes:
+    """
+    Encode one independent block of a block container.
+
+    Args:
+        data: Block contents (non-empty)
+
+    Returns:
+        Block record: block header, code-length header and packed payload
+    """
+    codec = ByteHuffmanCoding()
+    payload, bit_length, lengths = codec.encode(data)
+    used = {byte: length for byte, length in enumerate(lengths) if length}
+    body = serialize_code_lengths(used) + payload
+    return _BLOCK_HEADER.pack(len(data), zlib.crc32(data), bit_length, len(body)) + body
+
+
+def decode_block(record: bytes) -> bytes:
+    """
+    Decode and verify one block record produced by :func:`encode_block`.
+
+    Args:
+        record: Block header followed by its body
+
+    Returns:
+        Block contents
+
+    Raises:
+        DecodingError: If the block is malformed or fails its checksum
+    """
+    if len(record) < _BLOCK_HEADER.size:
+        raise DecodingError("Truncated block header")
+    original_length, crc, bit_length, body_length = _BLOCK_HEADER.unpack_from(record)
+    body = memoryview(record)[_BLOCK_HEADER.size:]
+    if len(body) != body_length:
+        raise DecodingError("Truncated block")
+
+    lengths, pos = _read_byte_code_lengths(body, 0)
+    header = ContainerHeader(BLOCK_FORMAT_VERSION, 0, original_length, crc,
+                             bit_length, lengths)
+    if len(body) - pos < header.payload_length:
+        raise DecodingError("Truncated block payload")
+    output = b"".join(_decode_chunks(header, [body[pos:pos + header.payload_length]]))
+    _verify(header, len(output), zlib.crc32(output))
+    return output
+
+
+class _PrefixedReader:
+    """Exact-size reads from already-buffered bytes followed by a stream"""
+
+    def __init__(self, head: bytes, stream: BinaryIO) -> None:
+        self._head = memoryview(head)
+        self._stream = stream
+
+    def read(self, size: int) -> bytes:
+        """Read up to ``size`` bytes, short only at end of input"""
+        taken = bytes(self._head[:size])
+        self._head = self._head[len(taken):]
+        if len(taken) < size:
+            taken += self._stream.read(size - len(taken))
+        return taken
+
+
+def compress_blocks_stream(src: BinaryIO, dst: BinaryIO,
+                           block_size: int = DEFAULT_BLOCK_SIZE,
+                           workers: Optional[int] = None) -> CompressionStats:
+    """
+    Compress a stream into a block container, coding blocks in parallel.
+
+    The input is split into ``block_size`` blocks that are counted, coded
+    and packed independently in a process pool. Records are written in
+    order, followed by an end marker, a block index and a trailer that
+    locates the index. The input does not need to be seekable.
+
+    Args:
+        src: Binary input stream
+        dst: Binary output stream
+        block_size: Uncompressed bytes per block
+        workers: Worker processes; ``None`` uses every CPU, 0 or 1 stays in-process
+
+    Returns:
+        CompressionStats comparing input and container sizes
+
+    Raises:
+        ValueError: If the block size is out of range
+    """
+    written = 0
+    for piece in iter_compress_blocks(src, block_size, workers):
+        written += dst.write(piece)
+    # The last piece is always the trailer
+    _, original_length, _, _ = _TRAILER.unpack(piece)
+
+    return CompressionStats(
+        original_size=original_length * 8,
+        compressed_size=written * 8,
+        compression_ratio=0,  # Will be calculated in __post_init__
+        space_saved=0  # Will be calculated in __post_init__
+    )
+
+
+def iter_compress_blocks(src: BinaryIO, block_size: int = DEFAULT_BLOCK_SIZE,
+                         workers: Optional[int] = None) -> Iterator[bytes]:
+    """
+    Compress a stream into a block container lazily, yielding its pieces.
+
+    Produces the same bytes as :func:`compress_blocks_stream`, one block
+    record at a time, so output can be sent while input is still being
+    read. At most a few blocks per worker are held in memory.
+
+    Args:
+        src: Binary input stream
+        block_size: Uncompressed bytes per block
+        workers: Worker processes; ``None`` uses every CPU, 0 or 1 stays in-process
+
+    Returns:
+        Iterator over container byte strings, ending with the trailer
+
+    Raises:
+        ValueError: If the block size is out of range
+    """
+    if not 0 < block_size <= 0xFFFFFFFF:
+        raise ValueError("Block size must be between 1 byte and 4 GiB")
+
+    head = _BLOCK_FILE_HEADER.pack(MAGIC, BLOCK_FORMAT_VERSION, 0, block_size)
+    yield head
+    written = len(head)
+    original_length = 0
+    index: List[Tuple[int, int]] = []
+    for record in map_ordered(encode_block, _read_chunks(src, block_size), workers):
+        index.append((written, original_length))
+        original_length += _BLOCK_HEADER.unpack_from(record)[0]
+        written += len(record)
+        yield record
+
+    # A zero-length block header ends the records for sequential readers
+    end_marker = _BLOCK_HEADER.pack(0, 0, 0, 0)
+    index_offset = written + len(end_marker)
+    yield end_marker + b"".join(_INDEX_ENTRY.pack(*entry) for entry in index)
+    yield _TRAILER.pack(index_offset, original_length, len(index), TRAILER_MAGIC)
+
+
+def _iter_block_records(src: "_PrefixedReader") -> Iterator[bytes]:
+    """Read block records sequentially up to the end marker"""
+    while True:
+        head = src.read(_BLOCK_HEADER.size)
+        if len(head) < _BLOCK_HEADER.size:
+            raise DecodingError("Truncated block container")
+        original_length, _, _, body_length = _BLOCK_HEADER.unpack(head)
+        if not original_length:
+            return
+        body = src.read(body_length)
+        if len(body) < body_length:
+            raise DecodingError("Truncated block")
+        yield head + body
+
+
+def _iter_decompress_blocks(reader: "_PrefixedReader",
+                            workers: Optional[int]) -> Iterator[bytes]:
+    """Decode a block container, fanning blocks out across workers"""
+    head = reader.read(_BLOCK_FILE_HEADER.size)
+    if len(head) < _BLOCK_FILE_HEADER.size:
+        raise DecodingError("Truncated container header")
+
+    written = 0
+    count = 0
+    for block in map_ordered(decode_block, _iter_block_records(reader), workers):
+        written += len(block)
+        count += 1
+        yield block
+
+    # Skip the index; the trailer must agree with what was decoded
+    reader.read(count * _INDEX_ENTRY.size)
+    trailer = reader.read(_TRAILER.size)
+    if len(trailer) < _TRAILER.size:
+        raise DecodingError("Missing block container trailer")
+    _, original_length, block_count, magic = _TRAILER.unpack(trailer)
+    if magic != TRAILER_MAGIC or original_length != written or block_count != count:
+        raise DecodingError("Block container trailer does not match its blocks")
+
+
+class BlockContainerReader:
+    """
+    Random access to a block container on a seekable stream.
+
+    The trailer and block index are read once; :meth:`decode_range` then
+    seeks straight to the blocks overlapping the requested byte range and
+    decodes only those.
+    """
+
+    def __init__(self, stream: BinaryIO) -> None:
+        """
+        Args:
+            stream: Seekable binary stream holding a block container
+
+        Raises:
+            DecodingError: If the stream is not a block container
+        """
+        self._stream = stream
+        stream.seek(0)
+        head = stream.read(_BLOCK_FILE_HEADER.size)
+        if (_peek_version(head) != BLOCK_FORMAT_VERSION
+                or len(head) < _BLOCK_FILE_HEADER.size):
+            raise DecodingError("Random access needs a block container")
+        self.block_size: int = _BLOCK_FILE_HEADER.unpack(head)[3]
+
+        end = stream.seek(0, os.SEEK_END)
+        if end < _BLOCK_FILE_HEADER.size + _TRAILER.size:
+            raise DecodingError("Missing block container trailer")
+        stream.seek(end - _TRAILER.size)
+        index_offset, self.original_length, count, magic = _TRAILER.unpack(
+            stream.read(_TRAILER.size))
+        if magic != TRAILER_MAGIC:
+            raise DecodingError("Missing block container trailer")
+
+        stream.seek(index_offset)
+        raw = stream.read(count * _INDEX_ENTRY.size)
+        if len(raw) < count * _INDEX_ENTRY.size:
+            raise DecodingError("Truncated block index")
+        entries = [_INDEX_ENTRY.unpack_from(raw, i * _INDEX_ENTRY.size)
+                   for i in range(count)]
+        self._record_offsets = [offset for offset, _ in entries]
+        self._original_offsets = [original for _, original in entries]
+
+    @classmethod
+    def open(cls, path: str) -> "BlockContainerReader":
+        """Open a block container file; close it with :meth:`close`"""
+        stream = open(path, "rb")
+        try:
+            return cls(stream)
+        except Exception:
+            stream.close()
+            raise
+
+    def __enter__(self) -> "BlockContainerReader":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the underlying stream"""
+        self._stream.close()
+
+    def __len__(self) -> int:
+        return self.original_length
+
+    @property
+    def block_count(self) -> int:
+        """Number of blocks in the container"""
+        return len(self._record_offsets)
+
+    def read_block(self, index: int) -> bytes:
+        """
+        Decode a single block.
+
+        Args:
+            index: Block number
+
+        Returns:
+            Block contents
+
+        Raises:
+            DecodingError: If the block is corrupted
+        """
+        self._stream.seek(self._record_offsets[index])
+        head = self._stream.read(_BLOCK_HEADER.size)
+        if len(head) < _BLOCK_HEADER.size:
+            raise DecodingError("Truncated block header")
+        body_length = _BLOCK_HEADER.unpack(head)[3]
+        return decode_block(head + self._stream.read(body_length))
+
+    def decode_range(self, start: int, stop: int) -> bytes:
+        """
+        Decode original bytes ``start:stop``.
+
+        Args:
+            start: Offset of the first byte wanted
+            stop: Offset after the last byte wanted (clamped to the length)
+
+        Returns:
+            The requested bytes
+
+        Raises:
+            ValueError: If the range is invalid
+            DecodingError: If a needed block is corrupted
+        """
+        if start < 0 or stop < start:
+            raise ValueError("Invalid range")
+        stop = min(stop, self.original_length)
+        if start >= stop:
+            return b""
+
+        first = bisect.bisect_right(self._original_offsets, start) - 1
+        last = bisect.bisect_left(self._original_offsets, stop)
+        data = b"".join(self.read_block(i) for i in range(first, last))
+        base = self._original_offsets[first]
+        return data[start - base:stop - base]
+
+
+def compress_file(src_path: str, dst_path: str,
+                  chunk_size: int = DEFAULT_CHUNK_SIZE,
+                  block_size: Optional[int] = None,
+                  workers: Optional[int] = 1) -> CompressionStats:
+    """
+    Compress a file into a .huff container.
+
+    A single-table container is written unless a block size or more than
+    one worker is requested, in which case a block container is coded in
+    parallel.
+
+    Args:
+        src_path: Path of the file to compress
+        dst_path: Path of the container to write
+        chunk_size: Bytes read per step (single-table containers)
+        block_size: Uncompressed bytes per block (block containers)
+        workers: Worker processes for block containers; ``None`` uses every CPU
+
+    Returns:
+        CompressionStats comparing input and container sizes
+    """
+    with open(src_path, "rb") as src, open(dst_path, "wb") as dst:
+        if block_size is None and runs_inline(workers):
+            return compress_stream(src, dst, chunk_size)
+        return compress_blocks_stream(src, dst, block_size or DEFAULT_BLOCK_SIZE,
+                                      workers)
+
+
+def decompress_file(src_path: str, dst_path: str,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    workers: Optional[int] = 1) -> int:
+    """
+    Decompress a .huff container into a file.
+
+    The output file is removed if the container turns out to be corrupted.
+
+    Args:
+        src_path: Path of the container
+        dst_path: Path of the file to write
+        chunk_size: Bytes read per step
+        workers: Worker processes for block containers; ``None`` uses every CPU
+
+    Returns:
+        Number of bytes written
+    """
+    try:
+        with open(src_path, "rb") as src, open(dst_path, "wb") as dst:
+            return decompress_stream(src, dst, chunk_size, workers)
+    except DecodingError:
+        if os.path.exists(dst_path):
+            os.remove(dst_path)
+        raise
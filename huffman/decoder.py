@@ -0,0 +1,382 @@
+"""
+Table-driven Huffman decoder resolving several bits per lookup
+"""
+
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+
+from .bitio import BytesLike
+from .exceptions import DecodingError
+
+# Default width of the primary lookup table in bits
+DEFAULT_PRIMARY_BITS = 10
+
+# Symbols are single characters/strings for text codecs and ints for byte codecs
+Symbol = Union[str, int]
+Piece = Union[str, bytes]
+Entry = Tuple[Optional[Piece], int]
+# (index bits, entries, deeper subtables by index); deeper ones nest the same way
+SubTable = Tuple[int, List[Entry], Dict[int, Any]]
+
+
+class DecodeState:
+    """
+    Bits carried between calls when decoding a stream in chunks.
+
+    ``remaining`` counts payload bits not yet decoded; bits past it are
+    padding and are never decoded.
+    """
+
+    __slots__ = ("acc", "nbits", "remaining")
+
+    def __init__(self, bit_length: int) -> None:
+        self.acc = 0
+        self.nbits = 0
+        self.remaining = bit_length
+
+
+class TableDecoder:
+    """
+    Lookup-table decoder built once per code table.
+
+    The primary table is indexed by the next ``primary_bits`` bits of the
+    stream and yields every complete code inside that window at once, so a
+    single lookup can emit several symbols. Codes longer than the primary
+    window are resolved through secondary tables indexed by the bits that
+    follow the primary prefix. Secondary tables are at most
+    ``primary_bits`` wide and chain into deeper ones for longer codes, so
+    memory grows with the number of long codes rather than exponentially
+    with the longest one.
+
+    Works on packed MSB-first bytes; '0'/'1' strings are packed first.
+    """
+
+    def __init__(self, codes: Mapping[Symbol, str],
+                 primary_bits: int = DEFAULT_PRIMARY_BITS) -> None:
+        """
+        Build the lookup tables.
+
+        Args:
+            codes: Mapping of symbol to binary code string (prefix-free)
+            primary_bits: Width of the primary table in bits
+
+        Raises:
+            ValueError: If the code table is empty or invalid
+        """
+        if not codes:
+            raise ValueError("Code table cannot be empty")
+        if primary_bits < 1:
+            raise ValueError("Primary table width must be positive")
+
+        first = next(iter(codes))
+        self._binary = isinstance(first, int)
+        self._empty: Piece = b"" if self._binary else ""
+
+        self._max_len = max(len(code) for code in codes.values())
+        if not self._max_len:
+            raise ValueError("Codes cannot be empty strings")
+        self._bits = primary_bits
+        # Bits that must be buffered before the fast path can take a step
+        self._need = max(primary_bits, self._max_len)
+
+        self._single: List[Entry] = []
+        self._multi: List[Tuple[Piece, int]] = []
+        self._sub: Dict[int, SubTable] = {}
+        self._build(codes)
+
+    @property
+    def primary_bits(self) -> int:
+        """Width of the primary lookup table"""
+        return self._bits
+
+    @property
+    def max_code_length(self) -> int:
+        """Longest code in the table"""
+        return self._max_len
+
+    @property
+    def approximate_size(self) -> int:
+        """Rough memory held by the lookup tables in bytes, for cache budgets"""
+        slots = len(self._single) + sum(map(_slots, self._sub.values()))
+        # A pointer per slot plus one tuple and joined fragment per multi entry
+        return 8 * slots + 120 * len(self._multi)
+
+    def _piece(self, symbol: Symbol) -> Piece:
+        """Convert a symbol to an output fragment"""
+        if self._binary:
+            return bytes((symbol,))  # type: ignore[arg-type]
+        return symbol  # type: ignore[return-value]
+
+    def _build(self, codes: Mapping[Symbol, str]) -> None:
+        """Fill the primary, multi-symbol and secondary tables"""
+        bits = self._bits
+        size = 1 << bits
+        single: List[Entry] = [(None, 0)] * size
+        long_codes: Dict[int, List[Tuple[Piece, int, int]]] = {}
+
+        for symbol, code in codes.items():
+            length = len(code)
+            value = int(code, 2)
+            piece = self._piece(symbol)
+            if length <= bits:
+                shift = bits - length
+                start = value << shift
+                for index in range(start, start + (1 << shift)):
+                    if single[index][1]:
+                        raise ValueError("Codes are not prefix-free")
+                    single[index] = (piece, length)
+            else:
+                prefix = value >> (length - bits)
+                long_codes.setdefault(prefix, []).append((piece, value, length))
+
+        # Secondary tables for codes longer than the primary window
+        for prefix, entries in long_codes.items():
+            if single[prefix][1]:
+                raise ValueError("Codes are not prefix-free")
+            self._sub[prefix] = self._build_sub(entries, bits)
+
+        # Multi-symbol entries: every whole code that fits inside the window
+        mask = size - 1
+        multi: List[Tuple[Piece, int]] = []
+        empty = self._empty
+        for index in range(size):
+            parts = []
+            used = 0
+            while used < bits:
+                piece, length = single[(index << used) & mask]
+                if not length or length > bits - used:
+                    break
+                parts.append(piece)
+                used += length
+            multi.append((empty.join(parts), used))  # type: ignore[arg-type]
+
+        self._single = single
+        self._multi = multi
+
+    def _build_sub(self, entries: List[Tuple[Piece, int, int]],
+                   consumed: int) -> SubTable:
+        """
+        Build the subtable for codes sharing their first ``consumed`` bits.
+
+        Args:
+            entries: (piece, code value, code length) of each code
+            consumed: Bits of every code already resolved by parent tables
+
+        Returns:
+            Subtable indexing at most ``primary_bits`` further bits
+        """
+        sub_bits = min(self._bits, max(length for _, _, length in entries) - consumed)
+        table: List[Entry] = [(None, 0)] * (1 << sub_bits)
+        deeper: Dict[int, List[Tuple[Piece, int, int]]] = {}
+        for piece, value, length in entries:
+            rest = length - consumed
+            if rest > sub_bits:
+                index = (value >> (rest - sub_bits)) & ((1 << sub_bits) - 1)
+                deeper.setdefault(index, []).append((piece, value, length))
+                continue
+            shift = sub_bits - rest
+            start = (value & ((1 << rest) - 1)) << shift
+            for index in range(start, start + (1 << shift)):
+                if table[index][1]:
+                    raise ValueError("Codes are not prefix-free")
+                table[index] = (piece, length)
+
+        children: Dict[int, SubTable] = {}
+        for index, group in deeper.items():
+            if table[index][1]:
+                raise ValueError("Codes are not prefix-free")
+            children[index] = self._build_sub(group, consumed + sub_bits)
+        return sub_bits, table, children
+
+    def decode(self, data: BytesLike, bit_length: int, start_bit: int = 0) -> Piece:
+        """
+        Decode a packed bit stream.
+
+        Args:
+            data: Packed MSB-first bytes
+            bit_length: Number of meaningful bits in ``data``
+            start_bit: Bit offset to start decoding at; must fall on a
+                code boundary
+
+        Returns:
+            Decoded text (``str``) or bytes for integer symbol tables
+
+        Raises:
+            DecodingError: If the stream is invalid or incomplete
+        """
+        if bit_length < 0 or bit_length > len(data) * 8:
+            raise DecodingError("Bit length does not match packed data size")
+        if not 0 <= start_bit <= bit_length:
+            raise DecodingError("Start bit is outside the bit stream")
+
+        state = DecodeState(bit_length - start_bit)
+        first, skip = divmod(start_bit, 8)
+        if skip:
+            state.acc = data[first] & (0xFF >> skip)
+            state.nbits = 8 - skip
+            first += 1
+        out: List[Piece] = []
+        self._run(state, memoryview(data)[first:], out, final=True)
+        return self._empty.join(out)  # type: ignore[arg-type]
+
+    def decode_stream(self, chunks: Iterable[BytesLike],
+                      bit_length: int) -> Iterator[Piece]:
+        """
+        Decode a packed bit stream delivered in chunks.
+
+        Only the current chunk and a few carried bits are held at a time.
+
+        Args:
+            chunks: Consecutive pieces of the packed payload
+            bit_length: Total number of meaningful bits in the stream
+
+        Yields:
+            Decoded text or bytes for each chunk
+
+        Raises:
+            DecodingError: If the stream is invalid or incomplete
+        """
+        state = DecodeState(bit_length)
+        for chunk in chunks:
+            piece = self.feed(state, chunk)
+            if piece:
+                yield piece
+        piece = self.feed(state, b"", final=True)
+        if piece:
+            yield piece
+
+    def feed(self, state: DecodeState, data: BytesLike, final: bool = False) -> Piece:
+        """
+        Decode the next chunk of a stream.
+
+        Bits of a code split across chunks are carried in ``state``.
+
+        Args:
+            state: Stream state created with the total bit length
+            data: Next chunk of packed bytes
+            final: Whether this is the last chunk of the stream
+
+        Returns:
+            Text or bytes decoded from this chunk
+
+        Raises:
+            DecodingError: If the stream is invalid or incomplete
+        """
+        out: List[Piece] = []
+        self._run(state, data, out, final)
+        return self._empty.join(out)  # type: ignore[arg-type]
+
+    def _run(self, state: DecodeState, data: BytesLike, out: List[Piece],
+             final: bool) -> None:
+        """
+        Decode as many symbols as possible from ``data`` plus carried bits.
+
+        Args:
+            state: Carried accumulator; updated in place
+            data: Next chunk of packed bytes
+            out: List receiving decoded fragments
+            final: Whether this is the last chunk of the stream
+        """
+        bits = self._bits
+        mask = (1 << bits) - 1
+        need = self._need
+        multi = self._multi
+        lookup_long = self._lookup_long
+        append = out.append
+
+        acc = state.acc
+        nbits = state.nbits
+        remaining = state.remaining
+        pos = 0
+        end = len(data)
+
+        while True:
+            # Refill up to 7 bytes at a time
+            if nbits < need and pos < end:
+                take = min(7, end - pos)
+                acc = ((acc & ((1 << nbits) - 1)) << (take * 8)) | int.from_bytes(
+                    data[pos:pos + take], "big")
+                nbits += take * 8
+                pos += take
+                continue
+
+            if nbits < need or remaining < need:
+                break
+
+            piece, used = multi[(acc >> (nbits - bits)) & mask]
+            if used:
+                append(piece)
+                nbits -= used
+                remaining -= used
+                continue
+
+            symbol, length = lookup_long(acc, nbits)
+            append(symbol)  # type: ignore[arg-type]
+            nbits -= length
+            remaining -= length
+
+        if final:
+            # Too few bits left for a full window: resolve one symbol at a time
+            if remaining > nbits:
+                raise DecodingError("Incomplete binary sequence")
+            nbits_avail = remaining
+            acc = (acc & ((1 << nbits) - 1)) >> (nbits - nbits_avail)
+            nbits = nbits_avail
+            while nbits:
+                symbol, length = self._lookup_tail(acc, nbits)
+                if length > nbits:
+                    raise DecodingError("Incomplete binary sequence")
+                append(symbol)  # type: ignore[arg-type]
+                nbits -= length
+                acc &= (1 << nbits) - 1
+            remaining = 0
+
+        state.acc = acc & ((1 << nbits) - 1)
+        state.nbits = nbits
+        state.remaining = remaining
+
+    def _lookup_tail(self, acc: int, nbits: int) -> Tuple[Optional[Piece], int]:
+        """Resolve one symbol from the last ``nbits`` bits, zero-padding the window"""
+        bits = self._bits
+        window = acc << (bits - nbits) if nbits < bits else acc >> (nbits - bits)
+        symbol, length = self._single[window & ((1 << bits) - 1)]
+        if length:
+            return symbol, length
+        if nbits <= bits:
+            if window & ((1 << bits) - 1) in self._sub:
+                raise DecodingError("Incomplete binary sequence")
+            raise DecodingError("Invalid binary sequence")
+        return self._lookup_long(acc, nbits)
+
+    def _lookup_long(self, acc: int, nbits: int) -> Entry:
+        """
+        Resolve a code longer than the primary window through the subtables.
+
+        Args:
+            acc: Bit buffer whose top ``nbits`` bits start with the code;
+                bits past the end of the buffer read as zeros
+
+        Returns:
+            Tuple of (symbol, code length)
+
+        Raises:
+            DecodingError: If no code matches
+        """
+        width = self._need
+        acc = acc << (width - nbits) if nbits < width else acc >> (nbits - width)
+        consumed = self._bits
+        entry = self._sub.get((acc >> (width - consumed)) & ((1 << consumed) - 1))
+        while entry is not None:
+            sub_bits, table, children = entry
+            index = (acc >> (width - consumed - sub_bits)) & ((1 << sub_bits) - 1)
+            symbol, length = table[index]
+            if length:
+                return symbol, length
+            entry = children.get(index)
+            consumed += sub_bits
+        raise DecodingError("Invalid binary sequence")
+
+
+def _slots(entry: SubTable) -> int:
+    """Count the slots of a subtable and every subtable below it"""
+    _, table, children = entry
+    return len(table) + sum(map(_slots, children.values()))
@@ -0,0 +1,295 @@
+"""
+Static code tables trained from sample text and shared by dictionary ID
+"""
+
+import hashlib
+import struct
+from collections import Counter
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from .bitio import BitWriter, BytesLike, read_varint, write_varint
+from .canonical import (
+    assign_canonical_codes,
+    code_lengths_from_frequencies,
+    read_code_lengths,
+    serialize_code_lengths,
+)
+from .decoder import TableDecoder
+from .exceptions import DecodingError
+
+DICTIONARY_MAGIC = b"HDIC"
+DICTIONARY_VERSION = 1
+
+# magic, version, dictionary ID, escape code point
+_DICTIONARY_HEADER = struct.Struct(">4sBII")
+
+# Escape symbols are picked from the private use area, skipping trained characters
+_ESCAPE_START = 0xE000
+
+
+class HuffmanDictionary:
+    """
+    Canonical code table shared out of band between encoder and decoder.
+
+    Messages encoded against a dictionary carry only its ID, the payload
+    bit length and any escaped characters, never a frequency table.
+    Characters absent from the training corpus are coded with a reserved
+    escape symbol and their code points are stored after the header.
+
+    Message layout (all integers are varints): dictionary ID, payload bit
+    length, escape count, escaped code points, then the packed payload.
+    """
+
+    def __init__(self, code_lengths: Mapping[str, int], escape: str,
+                 dict_id: Optional[int] = None) -> None:
+        """
+        Args:
+            code_lengths: Character to canonical code length mapping,
+                including the escape symbol
+            escape: Character reserved as the escape symbol
+            dict_id: 32-bit dictionary ID, derived from the table if omitted
+
+        Raises:
+            ValueError: If the table is invalid or lacks the escape symbol
+        """
+        if escape not in code_lengths:
+            raise ValueError("Code lengths must include the escape symbol")
+        self._code_lengths = dict(code_lengths)
+        self._codes = assign_canonical_codes(self._code_lengths)
+        self._escape = escape
+        if dict_id is None:
+            digest = hashlib.blake2b(self._table_bytes(), digest_size=4).digest()
+            dict_id = int.from_bytes(digest, "big")
+        if not 0 <= dict_id <= 0xFFFFFFFF:
+            raise ValueError("Dictionary ID must fit in 32 bits")
+        self._dict_id = dict_id
+        self._decoder: Optional[TableDecoder] = None
+
+    @classmethod
+    def train(cls, samples: Iterable[str],
+              dict_id: Optional[int] = None) -> "HuffmanDictionary":
+        """
+        Build a dictionary from the character statistics of sample messages.
+
+        Args:
+            samples: Representative messages
+            dict_id: 32-bit dictionary ID, derived from the table if omitted
+
+        Returns:
+            Trained dictionary
+
+        Raises:
+            ValueError: If the samples contain no text
+        """
+        freq_table: Counter = Counter()
+        for sample in samples:
+            freq_table.update(sample)
+        if not freq_table:
+            raise ValueError("Training samples cannot be empty")
+
+        escape = chr(_ESCAPE_START)
+        while escape in freq_table:
+            escape = chr(ord(escape) + 1)
+        # Rarest symbol: unseen characters are expected to be uncommon
+        freq_table[escape] = 1
+        return cls(code_lengths_from_frequencies(dict(freq_table)), escape, dict_id)
+
+    @property
+    def dict_id(self) -> int:
+        """Get the dictionary ID carried by every message"""
+        return self._dict_id
+
+    @property
+    def escape(self) -> str:
+        """Get the character reserved as the escape symbol"""
+        return self._escape
+
+    @property
+    def code_lengths(self) -> Dict[str, int]:
+        """Get the code length of each character, including the escape"""
+        return self._code_lengths.copy()
+
+    @property
+    def codes(self) -> Dict[str, str]:
+        """Get the canonical code of each character, including the escape"""
+        return self._codes.copy()
+
+    def _table_bytes(self) -> bytes:
+        """Serialize the escape symbol and code lengths"""
+        escape = ord(self._escape).to_bytes(4, "big")
+        return escape + serialize_code_lengths(self._code_lengths)
+
+    def to_bytes(self) -> bytes:
+        """Serialize the dictionary for storage or distribution"""
+        return (_DICTIONARY_HEADER.pack(DICTIONARY_MAGIC, DICTIONARY_VERSION,
+                                        self._dict_id, ord(self._escape))
+                + serialize_code_lengths(self._code_lengths))
+
+    @classmethod
+    def from_bytes(cls, data: BytesLike) -> "HuffmanDictionary":
+        """
+        Parse a dictionary produced by :meth:`to_bytes`.
+
+        Args:
+            data: Serialized dictionary
+
+        Returns:
+            Loaded dictionary
+
+        Raises:
+            DecodingError: If the data is not a valid dictionary
+        """
+        if len(data) < _DICTIONARY_HEADER.size:
+            raise DecodingError("Truncated dictionary header")
+        magic, version, dict_id, escape = _DICTIONARY_HEADER.unpack_from(data)
+        if magic != DICTIONARY_MAGIC:
+            raise DecodingError("Not a Huffman dictionary (bad magic)")
+        if version != DICTIONARY_VERSION:
+            raise DecodingError(f"Unsupported dictionary version {version}")
+        try:
+            lengths, _ = read_code_lengths(data, _DICTIONARY_HEADER.size)
+            return cls(lengths, chr(escape), dict_id)  # type: ignore[arg-type]
+        except (ValueError, OverflowError) as e:
+            raise DecodingError(f"Invalid dictionary: {e}") from e
+
+    def save(self, path: str) -> None:
+        """Write the dictionary to ``path``"""
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str) -> "HuffmanDictionary":
+        """Read a dictionary written by :meth:`save`"""
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+    def encode(self, text: str) -> bytes:
+        """
+        Encode a message against this dictionary.
+
+        Args:
+            text: Message to encode
+
+        Returns:
+            Self-describing message bytes without a code table
+        """
+        codes = self._codes
+        lookup = codes.__getitem__
+        escape_code = codes[self._escape]
+        escaped: List[int] = []
+        writer = BitWriter()
+
+        step = BitWriter.JOIN_SIZE
+        for start in range(0, len(text), step):
+            chunk = text[start:start + step]
+            try:
+                if self._escape in chunk:
+                    raise KeyError(self._escape)
+                bits = "".join(map(lookup, chunk))
+            except KeyError:
+                # The escape character itself must be escaped like any unknown one
+                parts = []
+                for char in chunk:
+                    code = codes.get(char)
+                    if code is None or char == self._escape:
+                        code = escape_code
+                        escaped.append(ord(char))
+                    parts.append(code)
+                bits = "".join(parts)
+            writer.write_bits(bits)
+
+        out = bytearray()
+        write_varint(out, self._dict_id)
+        write_varint(out, writer.bit_length)
+        write_varint(out, len(escaped))
+        for value in escaped:
+            write_varint(out, value)
+        return bytes(out) + writer.getvalue()
+
+    def decode(self, message: BytesLike) -> str:
+        """
+        Decode a message encoded against this dictionary.
+
+        Args:
+            message: Bytes produced by :meth:`encode`
+
+        Returns:
+            Decoded text
+
+        Raises:
+            DecodingError: If the message is malformed or uses another dictionary
+        """
+        dict_id, bit_length, escaped, pos = _read_message_header(message)
+        if dict_id != self._dict_id:
+            raise DecodingError(
+                f"Message uses dictionary {dict_id}, not {self._dict_id}")
+        if len(message) - pos != (bit_length + 7) // 8:
+            raise DecodingError("Payload size does not match bit length")
+        if not bit_length:
+            return ""
+
+        if self._decoder is None:
+            self._decoder = TableDecoder(self._codes)
+        text = self._decoder.decode(memoryview(message)[pos:], bit_length)
+        parts = text.split(self._escape)  # type: ignore[union-attr,arg-type]
+        if len(parts) - 1 != len(escaped):
+            raise DecodingError("Escape count does not match payload")
+        if not escaped:
+            return text  # type: ignore[return-value]
+        try:
+            literals = [chr(value) for value in escaped] + [""]
+        except (ValueError, OverflowError) as e:
+            raise DecodingError(f"Invalid escaped character: {e}") from e
+        return "".join(part + literal for part, literal in zip(parts, literals))
+
+
+def _read_message_header(message: BytesLike) -> Tuple[int, int, List[int], int]:
+    """Parse (dict_id, bit_length, escaped code points, payload offset)"""
+    try:
+        dict_id, pos = read_varint(message, 0)
+        bit_length, pos = read_varint(message, pos)
+        count, pos = read_varint(message, pos)
+        if count > len(message) - pos:
+            raise ValueError("Escape count exceeds message size")
+        escaped = []
+        for _ in range(count):
+            value, pos = read_varint(message, pos)
+            escaped.append(value)
+    except ValueError:
+        raise DecodingError("Truncated dictionary message header") from None
+    return dict_id, bit_length, escaped, pos
+
+
+def message_dictionary_id(message: BytesLike) -> int:
+    """
+    Get the ID of the dictionary a message was encoded against.
+
+    Raises:
+        DecodingError: If the message header is malformed
+    """
+    try:
+        return read_varint(message, 0)[0]
+    except ValueError:
+        raise DecodingError("Truncated dictionary message header") from None
+
+
+def decode_message(message: BytesLike,
+                   dictionaries: Mapping[int, HuffmanDictionary]) -> str:
+    """
+    Decode a message with whichever of ``dictionaries`` it names.
+
+    Args:
+        message: Bytes produced by :meth:`HuffmanDictionary.encode`
+        dictionaries: Known dictionaries keyed by ID
+
+    Returns:
+        Decoded text
+
+    Raises:
+        DecodingError: If the dictionary is unknown or the message is malformed
+    """
+    dict_id = message_dictionary_id(message)
+    dictionary = dictionaries.get(dict_id)
+    if dictionary is None:
+        raise DecodingError(f"Unknown dictionary ID {dict_id}")
+    return dictionary.decode(message)
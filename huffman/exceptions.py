@@ -0,0 +1,18 @@
+"""
+Exception hierarchy shared by the Huffman coding modules
+"""
+
+
+class HuffmanCodingError(Exception):
+    """Base exception for Huffman coding errors"""
+    pass
+
+
+class EncodingError(HuffmanCodingError):
+    """Raised when encoding fails"""
+    pass
+
+
+class DecodingError(HuffmanCodingError):
+    """Raised when decoding fails"""
+    pass
@@ -0,0 +1,510 @@
+"""
+Lightweight Prometheus-style metrics for the codec and HTTP hot paths
+
+Disabled by default. While disabled every update returns after a single
+flag check and :func:`time` hands out a shared no-op context, so the
+instrumented code pays a few tens of nanoseconds per call.
+
+Values live in the recording process. Processes serving the same app,
+such as gunicorn workers, publish them to a directory with :func:`share`
+and :func:`render` sums every published file, so any worker can answer
+a scrape for all of them.
+"""
+
+import atexit
+import bisect
+import json
+import os
+import threading
+from time import perf_counter
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+LabelValues = Tuple[str, ...]
+
+# Recorded values by metric name, then label set, as exchanged between processes
+Snapshot = Dict[str, Dict[LabelValues, Any]]
+
+# Latency buckets in seconds, 50 microseconds to 10 seconds
+TIME_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+                0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Distinct symbols per table, 1 to 64Ki
+ALPHABET_BUCKETS = tuple(float(1 << shift) for shift in range(0, 17, 2))
+
+# Encoded bits over 8 bits per input symbol
+RATIO_BUCKETS = (0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0, 1.5, 2.0)
+
+_enabled = False
+
+
+def enable() -> None:
+    """Start recording"""
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    """Stop recording; values collected so far are kept"""
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    """Whether updates are being recorded"""
+    return _enabled
+
+
+def _format_labels(names: Sequence[str], values: LabelValues, extra: str = "") -> str:
+    """Render ``{name="value",...}``, or nothing without labels"""
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the text exposition format"""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    """Render a sample value, integers without a trailing .0"""
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Counter:
+    """Monotonically increasing total, optionally split by labels"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str,
+                 labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: LabelValues = (), amount: float = 1) -> None:
+        """
+        Add to the total for ``labels``.
+
+        Args:
+            labels: One value per label name
+            amount: Non-negative increment
+        """
+        if not _enabled:
+            return
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, labels: LabelValues = ()) -> float:
+        """Current total for ``labels``"""
+        return self._values.get(labels, 0)
+
+    def reset(self) -> None:
+        """Forget every recorded value"""
+        with self._lock:
+            self._values.clear()
+
+    def snapshot(self) -> Dict[LabelValues, float]:
+        """Copy of the totals by label set"""
+        with self._lock:
+            return dict(self._values)
+
+    def merge(self, values: Dict[LabelValues, float]) -> None:
+        """Add totals recorded elsewhere, e.g. by a worker process"""
+        with self._lock:
+            for labels, value in values.items():
+                self._values[labels] = self._values.get(labels, 0) + value
+
+    def samples(self, values: Optional[Dict[LabelValues, float]] = None
+                ) -> Iterator[str]:
+        """Yield exposition lines for every label set of ``values`` or this counter"""
+        if values is None:
+            values = self.snapshot()
+        for labels, value in sorted(values.items()):
+            label_text = _format_labels(self.labelnames, labels)
+            yield f"{self.name}{label_text} {_format_value(value)}"
+
+
+class Histogram:
+    """Distribution of observations in cumulative buckets, optionally by labels"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str,
+                 buckets: Sequence[float] = TIME_BUCKETS,
+                 labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [count per bucket (+Inf last)..., sum]
+        self._values: Dict[LabelValues, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, labels: LabelValues = ()) -> None:
+        """
+        Record one observation.
+
+        Args:
+            value: Observed value
+            labels: One value per label name
+        """
+        if not _enabled:
+            return
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            row = self._values.get(labels)
+            if row is None:
+                row = self._values[labels] = [0.0] * (len(self.buckets) + 2)
+            row[index] += 1
+            row[-1] += value
+
+    def count(self, labels: LabelValues = ()) -> int:
+        """Number of observations for ``labels``"""
+        row = self._values.get(labels)
+        return int(sum(row[:-1])) if row else 0
+
+    def reset(self) -> None:
+        """Forget every recorded value"""
+        with self._lock:
+            self._values.clear()
+
+    def snapshot(self) -> Dict[LabelValues, List[float]]:
+        """Copy of the bucket counts and sum by label set"""
+        with self._lock:
+            return {labels: list(row) for labels, row in self._values.items()}
+
+    def merge(self, values: Dict[LabelValues, List[float]]) -> None:
+        """Add observations recorded elsewhere, e.g. by a worker process"""
+        with self._lock:
+            for labels, row in values.items():
+                _add_row(self._values.setdefault(labels, [0.0] * len(row)), row)
+
+    def samples(self, values: Optional[Dict[LabelValues, List[float]]] = None
+                ) -> Iterator[str]:
+        """Yield cumulative bucket, sum and count lines for every label set"""
+        if values is None:
+            values = self.snapshot()
+        for labels, row in sorted(values.items()):
+            cumulative = 0.0
+            bounds = [_format_value(bound) for bound in self.buckets] + ["+Inf"]
+            for bound, count in zip(bounds, row):
+                cumulative += count
+                le = _format_labels(self.labelnames, labels, f'le="{bound}"')
+                yield f"{self.name}_bucket{le} {_format_value(cumulative)}"
+            suffix = _format_labels(self.labelnames, labels)
+            yield f"{self.name}_sum{suffix} {_format_value(row[-1])}"
+            yield f"{self.name}_count{suffix} {_format_value(cumulative)}"
+
+
+def _add_row(total: List[float], row: Sequence[float]) -> None:
+    """Add histogram ``row`` to ``total`` bucket by bucket"""
+    if len(total) != len(row):
+        raise ValueError("Histogram buckets do not match")
+    for index, value in enumerate(row):
+        total[index] += value
+
+
+class _Timer:
+    """Context manager observing its own duration"""
+
+    __slots__ = ("_histogram", "_labels", "_start")
+
+    def __init__(self, histogram: Histogram, labels: LabelValues) -> None:
+        self._histogram = histogram
+        self._labels = labels
+
+    def __enter__(self) -> "_Timer":
+        self._start = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._histogram.observe(perf_counter() - self._start, self._labels)
+
+
+class _NullTimer:
+    """Shared do-nothing stand-in for :class:`_Timer` while disabled"""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullTimer":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        return None
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def time(histogram: Histogram, *labels: str) -> Union[_Timer, _NullTimer]:
+    """
+    Time a ``with`` block into ``histogram``.
+
+    Args:
+        histogram: Histogram of durations in seconds
+        *labels: One value per label name
+
+    Returns:
+        Context manager; a shared no-op while metrics are disabled
+    """
+    return _Timer(histogram, labels) if _enabled else _NULL_TIMER
+
+
+Metric = Union[Counter, Histogram]
+
+
+class Registry:
+    """Named collection of metrics rendered together"""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        """
+        Add a metric.
+
+        Raises:
+            ValueError: If the name is already taken
+        """
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name!r} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def get(self, name: str) -> Optional[Metric]:
+        """Look up a metric by name"""
+        return self._metrics.get(name)
+
+    def reset(self) -> None:
+        """Forget every recorded value, keeping the metrics"""
+        for metric in self._metrics.values():
+            metric.reset()
+
+    def snapshot(self) -> Snapshot:
+        """Copy of every recorded value, picklable and JSON friendly"""
+        return {name: metric.snapshot() for name, metric in self._metrics.items()}
+
+    def merge(self, snapshot: Snapshot) -> None:
+        """
+        Add values recorded elsewhere; unknown metric names are skipped.
+
+        Merging is not gated by :func:`enable`, so values a worker process
+        recorded are kept whatever this process is doing.
+        """
+        for name, values in snapshot.items():
+            metric = self._metrics.get(name)
+            if metric is not None:
+                metric.merge(values)  # type: ignore[arg-type]
+
+    def render(self, snapshot: Optional[Snapshot] = None) -> str:
+        """
+        Render every metric in the Prometheus text exposition format.
+
+        Args:
+            snapshot: Values to render instead of the recorded ones
+
+        Returns:
+            Exposition text, newline terminated
+        """
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            values = None if snapshot is None else snapshot.get(metric.name, {})
+            lines.extend(metric.samples(values))  # type: ignore[arg-type]
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def counter(name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+    """Create and register a counter in :data:`REGISTRY`"""
+    metric = Counter(name, help_text, labelnames)
+    REGISTRY.register(metric)
+    return metric
+
+
+def histogram(name: str, help_text: str, buckets: Sequence[float] = TIME_BUCKETS,
+              labelnames: Sequence[str] = ()) -> Histogram:
+    """Create and register a histogram in :data:`REGISTRY`"""
+    metric = Histogram(name, help_text, buckets, labelnames)
+    REGISTRY.register(metric)
+    return metric
+
+
+# Codec metrics, updated by HuffmanCoding
+STAGE_SECONDS = histogram(
+    "huffman_stage_seconds",
+    "Time spent per codec stage (frequency_count, tree_build, code_generation, "
+    "bit_packing, tree_layout, decoder_build, symbol_decode, encode, decode, "
+    "json_serialization)",
+    labelnames=("stage",))
+SYMBOLS = counter("huffman_symbols_total", "Symbols encoded or decoded", ("operation",))
+PAYLOAD_BITS = counter("huffman_payload_bits_total",
+                       "Encoded payload bits produced or consumed", ("operation",))
+ALPHABET_SIZE = histogram("huffman_alphabet_size", "Distinct symbols per encoded text",
+                          ALPHABET_BUCKETS)
+COMPRESSION_RATIO = histogram("huffman_compression_ratio",
+                              "Encoded bits over 8 bits per input symbol",
+                              RATIO_BUCKETS)
+ERRORS = counter("huffman_errors_total", "Failed encode and decode calls",
+                 ("operation",))
+
+# HTTP metrics, updated by the Flask app
+HTTP_REQUESTS = counter("http_requests_total", "HTTP requests handled",
+                        ("endpoint", "method", "status"))
+HTTP_SECONDS = histogram("http_request_seconds", "HTTP request handling time",
+                         labelnames=("endpoint",))
+HTTP_BYTES_IN = counter("http_request_bytes_total", "Request body bytes received",
+                        ("endpoint",))
+HTTP_BYTES_OUT = counter("http_response_bytes_total", "Response body bytes sent",
+                         ("endpoint",))
+
+
+def record_encode(symbols: int, bits: int, alphabet: int) -> None:
+    """Record the sizes of one successful encode"""
+    if not _enabled:
+        return
+    SYMBOLS.inc(("encode",), symbols)
+    PAYLOAD_BITS.inc(("encode",), bits)
+    ALPHABET_SIZE.observe(alphabet)
+    COMPRESSION_RATIO.observe(bits / (8 * symbols))
+
+
+def record_decode(symbols: int, bits: int) -> None:
+    """Record the sizes of one successful decode"""
+    if not _enabled:
+        return
+    SYMBOLS.inc(("decode",), symbols)
+    PAYLOAD_BITS.inc(("decode",), bits)
+
+
+# Directory, owning process and stop event of share(); None while not sharing
+_sharing: Optional[Tuple[str, int, threading.Event]] = None
+_share_lock = threading.Lock()
+
+
+def share(directory: str, interval: float = 5.0) -> None:
+    """
+    Publish this process's values to ``directory`` for :func:`render`.
+
+    Values are written as ``<pid>.json`` every ``interval`` seconds from
+    a daemon thread and once more at exit, so a scrape sees the other
+    processes at most ``interval`` seconds late. Call it in each worker
+    after forking, e.g. from gunicorn's ``post_fork`` hook; a forked
+    child inherits the setting but not the thread and publishes nothing.
+    Files of exited workers are kept so totals never go backwards.
+
+    Args:
+        directory: Directory shared by every process of the app
+        interval: Seconds between writes
+    """
+    global _sharing
+    stop_sharing()
+    os.makedirs(directory, exist_ok=True)
+    stop = threading.Event()
+    _sharing = (directory, os.getpid(), stop)
+    threading.Thread(target=_flush_until, args=(stop, interval),
+                     name="metrics-share", daemon=True).start()
+
+
+def stop_sharing() -> None:
+    """Write this process's values a last time and stop publishing them"""
+    global _sharing
+    if _sharing is None:
+        return
+    flush()
+    _sharing[2].set()
+    _sharing = None
+
+
+atexit.register(stop_sharing)
+
+
+def clear_shared(directory: str) -> None:
+    """
+    Delete the values published to ``directory``.
+
+    Run once before any worker starts, e.g. from gunicorn's
+    ``on_starting`` hook, so a restarted server begins from zero.
+    """
+    if not os.path.isdir(directory):
+        return
+    for entry in os.scandir(directory):
+        if entry.name.endswith((".json", ".tmp")):
+            os.remove(entry.path)
+
+
+def _flush_until(stop: threading.Event, interval: float) -> None:
+    """Body of the publishing thread"""
+    while not stop.wait(interval):
+        flush()
+
+
+def _own_path() -> Optional[str]:
+    """File this process publishes to, None unless it called :func:`share`"""
+    if _sharing is None or _sharing[1] != os.getpid():
+        return None
+    return os.path.join(_sharing[0], f"{_sharing[1]}.json")
+
+
+def flush() -> None:
+    """Publish this process's values now; a no-op while not sharing"""
+    path = _own_path()
+    if path is None:
+        return
+    rows = {name: [[list(labels), value] for labels, value in values.items()]
+            for name, values in REGISTRY.snapshot().items() if values}
+    with _share_lock:
+        # Readers only ever see a complete file
+        with open(f"{path}.tmp", "w") as f:
+            json.dump(rows, f, separators=(",", ":"))
+        os.replace(f"{path}.tmp", path)
+
+
+def _read_snapshot(path: str) -> Snapshot:
+    """Load values written by :func:`flush`"""
+    with open(path) as f:
+        rows = json.load(f)
+    return {name: {tuple(labels): value for labels, value in values}
+            for name, values in rows.items()}
+
+
+def _combine(total: Snapshot, snapshot: Snapshot) -> None:
+    """Add ``snapshot`` into ``total``, counters by value, histograms by bucket"""
+    for name, values in snapshot.items():
+        into = total.setdefault(name, {})
+        for labels, value in values.items():
+            if isinstance(value, list):
+                _add_row(into.setdefault(labels, [0.0] * len(value)), value)
+            else:
+                into[labels] = into.get(labels, 0) + value
+
+
+def render() -> str:
+    """
+    Render :data:`REGISTRY` in the Prometheus text exposition format.
+
+    While sharing, the values published by every other process in the
+    directory are added to this process's own.
+
+    Returns:
+        Exposition text, newline terminated
+    """
+    path = _own_path()
+    if path is None:
+        return REGISTRY.render()
+    total = REGISTRY.snapshot()
+    for entry in os.scandir(os.path.dirname(path)):
+        if entry.name.endswith(".json") and entry.path != path:
+            try:
+                _combine(total, _read_snapshot(entry.path))
+            except (OSError, ValueError):
+                # Vanished, or not written by a compatible version
+                continue
+    return REGISTRY.render(total)
@@ -0,0 +1,435 @@
+"""
+Optional NumPy backend: vectorized counting, bit packing and table decoding
+"""
+
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+from .bitio import BytesLike
+from .decoder import TableDecoder
+from .exceptions import DecodingError
+
+# Symbols gathered per step, bounding temporary arrays to a few tens of MB
+_ENCODE_CHUNK = 1 << 18
+
+# Symbols gathered per step when packing, where the output itself is small
+_PACK_CHUNK = 1 << 15
+
+# Bit positions decoded per step, bounding the per-step matrices
+_DECODE_CHUNK = 1 << 23
+
+# Target segment size and count when decoding segments in lock-step
+_SEGMENT_BITS = 1024
+_MAX_SEGMENTS = 1 << 14
+
+# Re-decoding rounds before falling back to the sequential decoder
+_MAX_ROUNDS = 4
+
+# Position recorded for segments that have finished
+_FINISHED = 1 << 62
+
+# Longest code handled by the flat decode table (2**bits entries); windows
+# are cut from 32-bit words at byte offsets, so this must stay <= 25
+MAX_TABLE_BITS = 20
+
+# Longest code that fits the 64-bit gather during encoding
+MAX_ENCODE_BITS = 63
+
+
+def available() -> bool:
+    """Whether NumPy can be imported"""
+    return np is not None
+
+
+def require() -> None:
+    """
+    Raise if NumPy is missing.
+
+    Raises:
+        ImportError: If NumPy is not installed
+    """
+    if np is None:
+        raise ImportError("The numpy backend requires NumPy (pip install numpy)")
+
+
+class SymbolArray:
+    """
+    Text viewed as an array of code points with its alphabet.
+
+    :meth:`indices` maps positions to indexes into ``alphabet``, which
+    is ordered by first occurrence so frequency tables match
+    ``Counter(text)`` exactly and tree tie-breaking is unchanged. Code
+    points and indexes are converted a chunk at a time, so nothing is
+    held per position beyond the text itself.
+    """
+
+    def __init__(self, text: str) -> None:
+        self._text = text
+        counts = np.zeros(0, dtype=np.int64)
+        first = np.zeros(0, dtype=np.int64)
+        for start in range(0, len(text), _ENCODE_CHUNK):
+            points = self._points(start, start + _ENCODE_CHUNK)
+            chunk_counts = np.bincount(points)
+            if len(chunk_counts) > len(counts):
+                grow = len(chunk_counts) - len(counts)
+                counts = np.concatenate((counts, np.zeros(grow, dtype=np.int64)))
+                unseen = np.full(grow, len(text), dtype=np.int64)
+                first = np.concatenate((first, unseen))
+            # Code points seen for the first time in this chunk
+            new = np.flatnonzero((chunk_counts > 0) & (counts[:len(chunk_counts)] == 0))
+            if new.size:
+                order = np.argsort(points, kind="stable")
+                found = np.searchsorted(points[order], new)
+                first[new] = start + order[found]
+            counts[:len(chunk_counts)] += chunk_counts
+        present = np.flatnonzero(counts)
+        present = present[np.argsort(first[present], kind="stable")]
+        # Alphabet index of every code point, for gathering codes per position
+        self._rank = np.zeros(len(counts), dtype=np.min_scalar_type(len(present)))
+        self._rank[present] = np.arange(len(present))
+        self.alphabet: List[str] = [chr(point) for point in present.tolist()]
+        self.counts: List[int] = counts[present].tolist()
+
+    def __len__(self) -> int:
+        """Number of symbols"""
+        return len(self._text)
+
+    def _points(self, start: int, stop: int) -> "np.ndarray":
+        """Get the code point of each position in ``start:stop``"""
+        data = self._text[start:stop].encode("utf-32-le", "surrogatepass")
+        return np.frombuffer(data, dtype="<u4")
+
+    def indices(self, start: int, stop: int) -> "np.ndarray":
+        """Get the alphabet index of each position in ``start:stop``"""
+        return self._rank[self._points(start, stop)]
+
+    def frequency_table(self) -> Dict[str, int]:
+        """Get the frequency of each character, in first-occurrence order"""
+        return dict(zip(self.alphabet, self.counts))
+
+
+def _code_arrays(alphabet: List[str],
+                 codes: Mapping[str, str]) -> Tuple["np.ndarray", "np.ndarray"]:
+    """Code values and lengths per alphabet index"""
+    values = np.array([int(codes[char], 2) for char in alphabet], dtype=np.uint64)
+    lengths = np.array([len(codes[char]) for char in alphabet], dtype=np.int64)
+    return values, lengths
+
+
+def _chunk_bits(symbols: SymbolArray, codes: Mapping[str, str],
+                chunk_size: int) -> Iterator["np.ndarray"]:
+    """
+    Yield the bits of ``chunk_size`` symbols at a time.
+
+    Each chunk repeats each code value once per bit, and shifts it by
+    the distance from that bit to the end of its code.
+    """
+    values, lengths = _code_arrays(symbols.alphabet, codes)
+    for start in range(0, len(symbols), chunk_size):
+        index = symbols.indices(start, start + chunk_size)
+        lens = lengths[index]
+        ends = np.cumsum(lens)
+        total = int(ends[-1])
+        shifts = np.repeat(ends, lens) - 1 - np.arange(total)
+        bits = np.repeat(values[index], lens) >> shifts.astype(np.uint64)
+        bits &= np.uint64(1)
+        yield bits.astype(np.uint8)
+
+
+def encode_bits(symbols: SymbolArray, codes: Mapping[str, str]) -> "np.ndarray":
+    """
+    Gather every symbol's code into a flat array of bits.
+
+    Args:
+        symbols: Text to encode
+        codes: Character to binary code mapping, no code longer than
+            :data:`MAX_ENCODE_BITS`
+
+    Returns:
+        uint8 array of 0/1 values, MSB-first per code
+    """
+    parts = list(_chunk_bits(symbols, codes, _ENCODE_CHUNK))
+    if not parts:
+        return np.zeros(0, dtype=np.uint8)
+    return np.concatenate(parts)
+
+
+def encode_packed(symbols: SymbolArray, codes: Mapping[str, str]) -> Tuple[bytes, int]:
+    """
+    Encode straight into packed bytes, one chunk at a time.
+
+    Whole bytes are packed as each chunk is gathered and the bits of an
+    unfinished byte are carried into the next chunk, so memory stays
+    bounded by the chunk rather than one byte per bit of output.
+
+    Args:
+        symbols: Text to encode
+        codes: Character to binary code mapping, no code longer than
+            :data:`MAX_ENCODE_BITS`
+
+    Returns:
+        Tuple of (packed bytes MSB-first and zero-padded, bit length)
+    """
+    out = bytearray()
+    carry = np.zeros(0, dtype=np.uint8)
+    bit_length = 0
+    for bits in _chunk_bits(symbols, codes, _PACK_CHUNK):
+        bit_length += len(bits)
+        if carry.size:
+            bits = np.concatenate((carry, bits))
+        whole = len(bits) & ~7
+        out += np.packbits(bits[:whole]).tobytes()
+        carry = bits[whole:]
+    if carry.size:
+        out += np.packbits(carry).tobytes()
+    return bytes(out), bit_length
+
+
+def pack(bits: "np.ndarray") -> bytes:
+    """Pack a 0/1 array MSB-first with zero padding"""
+    return np.packbits(bits).tobytes()
+
+
+def bits_to_string(bits: "np.ndarray") -> str:
+    """Render a 0/1 array as a '0'/'1' string"""
+    return (bits + ord("0")).tobytes().decode("ascii")
+
+
+def pack_string(bits: str) -> bytes:
+    """Pack a '0'/'1' string MSB-first with zero padding"""
+    return pack(np.frombuffer(bits.encode("ascii"), dtype=np.uint8) - ord("0"))
+
+
+class NumpyDecoder:
+    """
+    Flat lookup-table decoder that advances many bit positions at once.
+
+    Each chunk of the payload is cut into segments that are all decoded
+    in lock-step, one vectorized table gather per symbol step, each
+    speculatively starting at its first bit. Huffman codes resynchronize
+    quickly, so a segment's speculative chain almost always passes
+    through the true code boundary where the previous segment ends; the
+    few segments that do not are re-decoded from that boundary. Codes
+    that fail to resynchronize within a few rounds fall back to the
+    pure-Python :class:`TableDecoder` for the rest of the stream.
+    """
+
+    def __init__(self, codes: Mapping[str, str]) -> None:
+        """
+        Args:
+            codes: Character to binary code mapping, no code longer than
+                :data:`MAX_TABLE_BITS`
+
+        Raises:
+            ValueError: If the codes are too long or not prefix-free
+        """
+        require()
+        self._codes = dict(codes)
+        self._fallback: Optional[TableDecoder] = None
+        lengths = [len(code) for code in codes.values()]
+        self._max_len = max(lengths)
+        self._fixed_len = self._max_len if min(lengths) == self._max_len else 0
+        if self._max_len > MAX_TABLE_BITS:
+            raise ValueError(
+                f"Codes longer than {MAX_TABLE_BITS} bits need the table decoder")
+        self._drop = np.uint32(32 - self._max_len)
+
+        size = 1 << self._max_len
+        self._points = np.zeros(size, dtype=np.uint32)
+        self._lengths = np.zeros(size, dtype=np.int64)
+        for char, code in codes.items():
+            shift = self._max_len - len(code)
+            start = int(code, 2) << shift
+            stop = start + (1 << shift)
+            if self._lengths[start:stop].any():
+                raise ValueError("Codes are not prefix-free")
+            self._points[start:stop] = ord(char)
+            self._lengths[start:stop] = len(code)
+
+    @property
+    def approximate_size(self) -> int:
+        """Memory held by the lookup tables in bytes, for cache budgets"""
+        return self._points.nbytes + self._lengths.nbytes
+
+    def decode(self, data: BytesLike, bit_length: int) -> str:
+        """
+        Decode packed bytes.
+
+        Args:
+            data: Packed payload, MSB-first
+            bit_length: Number of meaningful bits in ``data``
+
+        Returns:
+            Decoded text
+
+        Raises:
+            DecodingError: If the bits are invalid or end mid-code
+        """
+        if bit_length < 0 or bit_length > len(data) * 8:
+            raise DecodingError("Bit length does not match packed data size")
+        if not bit_length:
+            return ""
+        raw = np.frombuffer(data, dtype=np.uint8)[:(bit_length + 7) // 8]
+        # Zero padding lets windows run past the payload
+        raw = np.concatenate((raw, np.zeros(8, dtype=np.uint8))).astype(np.uint32)
+        words = (raw[:-3] << 24) | (raw[1:-2] << 16) | (raw[2:-1] << 8) | raw[3:]
+
+        if self._fixed_len:
+            if bit_length % self._fixed_len:
+                raise DecodingError("Incomplete binary sequence")
+            window = self._windows(words, np.arange(0, bit_length, self._fixed_len))
+            if not self._lengths[window].all():
+                raise DecodingError("Invalid binary sequence")
+            return _to_text([self._points[window]])
+
+        pieces = []
+        pos = 0
+        for stop in range(_DECODE_CHUNK, bit_length + _DECODE_CHUNK, _DECODE_CHUNK):
+            stop = min(stop, bit_length)
+            if pos >= stop:
+                continue
+            points, pos, complete = self._decode_span(words, pos, stop)
+            pieces.append(points)
+            if not complete:
+                rest = self._table_decoder().decode(data, bit_length, start_bit=pos)
+                return _to_text(pieces) + rest  # type: ignore[operator]
+        if pos != bit_length:
+            raise DecodingError("Incomplete binary sequence")
+        return _to_text(pieces)
+
+    def _table_decoder(self) -> TableDecoder:
+        """Pure-Python decoder for streams that do not resynchronize"""
+        if self._fallback is None:
+            self._fallback = TableDecoder(self._codes)
+        return self._fallback
+
+    def _windows(self, words: "np.ndarray", positions: "np.ndarray") -> "np.ndarray":
+        """Get the ``max_len``-bit window starting at each bit position"""
+        shifts = (positions & 7).astype(np.uint32)
+        return (words[positions >> 3] << shifts) >> self._drop
+
+    def _run(self, words: "np.ndarray", starts: "np.ndarray",
+             ends: "np.ndarray") -> Tuple["np.ndarray", ...]:
+        """
+        Decode segments in lock-step from ``starts`` until each passes its end.
+
+        Returns:
+            Tuple of (code positions, code points, exit positions, stuck
+            flags). Positions and points are (steps, segments) matrices;
+            finished steps hold a position beyond every end. A stuck
+            segment reached a bit pattern that is not a code.
+        """
+        position = starts.copy()
+        stuck = np.zeros(len(starts), dtype=bool)
+        rows_position = []
+        rows_point = []
+        while True:
+            active = position < ends
+            if not active.any():
+                break
+            window = self._windows(words, position)
+            length = self._lengths[window]
+            invalid = active & (length == 0)
+            if invalid.any():
+                stuck |= invalid
+                active &= ~invalid
+                position[invalid] = ends[invalid]
+            rows_position.append(np.where(active, position, _FINISHED))
+            rows_point.append(self._points[window])
+            position += np.where(active, length, 0)
+        if not rows_position:
+            empty = np.zeros((0, len(starts)), dtype=np.int64)
+            return empty, empty.astype(np.uint32), position, stuck
+        return np.array(rows_position), np.array(rows_point), position, stuck
+
+    def _decode_span(self, words: "np.ndarray", first: int,
+                     stop: int) -> Tuple["np.ndarray", int, bool]:
+        """
+        Decode the codes starting in ``first:stop``.
+
+        Args:
+            words: Big-endian 32-bit word at every byte of the payload
+            first: Code boundary to start at
+            stop: End of the span
+
+        Returns:
+            Tuple of (code points, position after the last code, whether
+            the whole span was decoded). An incomplete span stops at a
+            true code boundary.
+
+        Raises:
+            DecodingError: If a bit pattern that is not a code is reached
+        """
+        count = max(1, min((stop - first) // _SEGMENT_BITS, _MAX_SEGMENTS))
+        steps = np.arange(count + 1, dtype=np.int64)
+        bounds = first + ((stop - first) * steps) // count
+        ends = bounds[1:]
+        entry = bounds[:-1].copy()
+
+        columns = np.arange(count)
+        positions, points, exits, stuck = self._run(words, entry, ends)
+        rounds = [(columns, positions, points)]
+        round_of = np.zeros(count, dtype=np.int64)
+
+        for attempt in range(_MAX_ROUNDS + 1):
+            # The true boundary entering each segment is where the previous one exits
+            entry[1:] = exits[:-1]
+            reached = np.zeros(count, dtype=bool)
+            for index, (cols, positions, _) in enumerate(rounds):
+                mine = round_of[cols] == index
+                hits = positions[:, mine] == entry[cols[mine]]
+                reached[cols[mine]] = hits.any(axis=0)
+            bad = ~reached | stuck
+            if not bad.any():
+                collected = self._collect(rounds, round_of, entry, ends, count)
+                return collected, int(exits[-1]), True
+            first_bad = int(np.argmax(bad))
+            if reached[first_bad]:
+                # Its entry is a true boundary, so the invalid code is real
+                raise DecodingError("Invalid binary sequence")
+            if attempt == _MAX_ROUNDS:
+                break
+            redo = np.flatnonzero(bad)
+            positions, points, exits[redo], stuck[redo] = self._run(
+                words, entry[redo], ends[redo])
+            round_of[redo] = len(rounds)
+            rounds.append((redo, positions, points))
+
+        collected = self._collect(rounds, round_of, entry, ends, first_bad)
+        return collected, int(entry[first_bad]), False
+
+    @staticmethod
+    def _collect(rounds: List[Tuple["np.ndarray", "np.ndarray", "np.ndarray"]],
+                 round_of: "np.ndarray", entry: "np.ndarray", ends: "np.ndarray",
+                 upto: int) -> "np.ndarray":
+        """Gather the code points of segments ``0:upto`` along the true chain"""
+        parts = []
+        owners = []
+        for index, (cols, positions, points) in enumerate(rounds):
+            mine = (round_of[cols] == index) & (cols < upto)
+            if not mine.any():
+                continue
+            # Transposed so each segment's codes are contiguous and in order
+            positions = positions[:, mine].T
+            keep = ((positions >= entry[cols[mine], None])
+                    & (positions < ends[cols[mine], None]))
+            parts.append(points[:, mine].T[keep])
+            owners.append(np.repeat(cols[mine], keep.sum(axis=1)))
+        if not parts:
+            return np.zeros(0, dtype=np.uint32)
+        if len(parts) == 1:
+            return parts[0]
+        order = np.argsort(np.concatenate(owners), kind="stable")
+        return np.concatenate(parts)[order]
+
+
+def _to_text(pieces: List["np.ndarray"]) -> str:
+    """Join arrays of code points into a string"""
+    if not pieces:
+        return ""
+    points = np.concatenate(pieces).astype("<u4")
+    return points.tobytes().decode("utf-32-le", "surrogatepass")
@@ -0,0 +1,133 @@
+"""
+Order-preserving process pool helper
+
+Worker counts follow one convention across the package and the app:
+``None`` uses every CPU, 0 runs in the calling thread without a pool and
+a positive count uses up to that many processes.
+"""
+
+import atexit
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Deque, Dict, Iterable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Executors shared by every map_ordered call of this process, by size
+_pools: Dict[int, ProcessPoolExecutor] = {}
+_pools_pid = os.getpid()
+_pools_lock = threading.Lock()
+
+
+def resolve_workers(workers: Optional[int]) -> int:
+    """
+    Turn a worker setting into a process count.
+
+    Args:
+        workers: Worker processes; None uses every CPU, 0 none
+
+    Returns:
+        Number of worker processes, 0 meaning in-thread
+
+    Raises:
+        ValueError: If ``workers`` is negative
+    """
+    if workers is None:
+        return os.cpu_count() or 1
+    if workers < 0:
+        raise ValueError("Worker count cannot be negative")
+    return workers
+
+
+def runs_inline(workers: Optional[int]) -> bool:
+    """
+    Whether :func:`map_ordered` does its work in the calling thread.
+
+    A single worker process could not overlap any work, so one worker
+    runs inline just like zero.
+    """
+    return resolve_workers(workers) <= 1
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    """Get the shared executor with ``workers`` processes, starting it once"""
+    global _pools_pid
+    with _pools_lock:
+        if _pools_pid != os.getpid():
+            # Forked: the parent's worker processes are not ours to use
+            _pools.clear()
+            _pools_pid = os.getpid()
+        pool = _pools.get(workers)
+        if pool is None:
+            pool = _pools[workers] = ProcessPoolExecutor(max_workers=workers)
+        return pool
+
+
+def _discard_pool(workers: int, pool: ProcessPoolExecutor) -> None:
+    """Forget a broken executor so the next call starts a fresh one"""
+    with _pools_lock:
+        if _pools.get(workers) is pool:
+            del _pools[workers]
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown() -> None:
+    """Stop the shared worker processes; later calls start new ones"""
+    with _pools_lock:
+        pools = list(_pools.values()) if _pools_pid == os.getpid() else []
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+atexit.register(shutdown)
+
+
+def map_ordered(fn: Callable[[T], R], items: Iterable[T],
+                workers: Optional[int]) -> Iterator[R]:
+    """
+    Apply ``fn`` across a process pool, yielding results in input order.
+
+    At most two tasks per worker are in flight, so input is consumed
+    lazily and memory stays bounded by the task size times the backlog.
+    The worker processes are started on first use and shared by later
+    calls with the same worker count; tasks of an abandoned iterator
+    are cancelled.
+
+    Args:
+        fn: Picklable module-level function to apply
+        items: Picklable arguments, consumed lazily
+        workers: Worker processes; None uses every CPU, 0 and 1 run
+            in-process without a pool
+
+    Returns:
+        Iterator over ``fn(item)`` for each item, in order
+
+    Raises:
+        ValueError: If ``workers`` is negative
+    """
+    count = resolve_workers(workers)
+    if count <= 1:
+        for item in items:
+            yield fn(item)
+        return
+
+    pool = _get_pool(count)
+    pending: Deque[Future] = deque()
+    try:
+        for item in items:
+            pending.append(pool.submit(fn, item))
+            if len(pending) >= count * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    except BrokenProcessPool:
+        _discard_pool(count, pool)
+        raise
+    finally:
+        for future in pending:
+            future.cancel()
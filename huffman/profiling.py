@@ -0,0 +1,286 @@
+"""
+Opt-in per-stage profiling of HuffmanCoding calls
+
+    with profile() as report:
+        huffman.encode(text)
+    print(report.format())
+
+Stages are the same points :mod:`huffman.metrics` times. While no profile
+is active a stage costs one context-variable lookup on top of its metric.
+"""
+
+import json
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from time import perf_counter_ns
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+from . import metrics
+from .metrics import STAGE_SECONDS
+
+Sink = Callable[["Profile"], None]
+
+
+def _kib(size: Optional[int]) -> str:
+    """Format a byte count in KiB, blank when untraced"""
+    return "" if size is None else f"{size / 1024:.1f}"
+
+
+@dataclass
+class StageTiming:
+    """Totals for one stage path, e.g. ``encode.frequency_count``"""
+    name: str
+    calls: int = 0
+    nanoseconds: int = 0
+    # Net bytes still allocated when the stage ended, and the highest
+    # point above its starting level; None without memory tracing
+    allocated_bytes: Optional[int] = None
+    peak_bytes: Optional[int] = None
+
+    @property
+    def milliseconds(self) -> float:
+        """Total wall time in milliseconds"""
+        return self.nanoseconds / 1e6
+
+
+@dataclass
+class Profile:
+    """Per-stage wall time, allocations and counts of a profiled block"""
+    stages: Dict[str, StageTiming] = field(default_factory=dict)
+    counts: Dict[str, int] = field(default_factory=dict)
+    total_nanoseconds: int = 0
+    # Another profile traced memory at the same time, so allocations could
+    # not be told apart and the stages carry none
+    memory_unavailable: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable breakdown"""
+        return {
+            "total_ms": round(self.total_nanoseconds / 1e6, 3),
+            "stages": {
+                name: {key: value for key, value in (
+                    ("calls", stage.calls),
+                    ("ms", round(stage.milliseconds, 3)),
+                    ("allocated_bytes", stage.allocated_bytes),
+                    ("peak_bytes", stage.peak_bytes),
+                ) if value is not None}
+                for name, stage in self.stages.items()
+            },
+            "counts": dict(self.counts),
+            **({"memory_unavailable": True} if self.memory_unavailable else {}),
+        }
+
+    def server_timing(self) -> str:
+        """Render stage times as a ``Server-Timing`` header value"""
+        return ", ".join(f"{name};dur={stage.milliseconds:.3f}"
+                         for name, stage in self.stages.items())
+
+    def format(self) -> str:
+        """Human-readable table of stages and counts"""
+        lines = [f"{'stage':<36} {'calls':>6} {'ms':>10} "
+                 f"{'alloc KiB':>10} {'peak KiB':>10}"]
+        for name, stage in self.stages.items():
+            alloc = _kib(stage.allocated_bytes)
+            peak = _kib(stage.peak_bytes)
+            lines.append(f"{name:<36} {stage.calls:>6} {stage.milliseconds:>10.3f} "
+                         f"{alloc:>10} {peak:>10}")
+        lines.extend(f"{name:<36} {value:>6}" for name, value in self.counts.items())
+        return "\n".join(lines)
+
+
+class _Frame:
+    """Bookkeeping for one open stage"""
+
+    __slots__ = ("path", "start", "memory_start", "memory_peak")
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.start = 0
+        self.memory_start = 0
+        self.memory_peak = 0
+
+
+class _Session:
+    """State of the active profile: the report and the open stages"""
+
+    def __init__(self, report: Profile, memory: bool) -> None:
+        self.report = report
+        self.memory = memory
+        self.stack: List[_Frame] = []
+
+    def overlap(self) -> None:
+        """Give up memory figures because another profile traces too"""
+        self.memory = False
+        self.report.memory_unavailable = True
+
+    def enter(self, name: str) -> _Frame:
+        path = f"{self.stack[-1].path}.{name}" if self.stack else name
+        frame = _Frame(path)
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if self.stack:
+                # tracemalloc has a single peak; keep the parent's before resetting it
+                parent = self.stack[-1]
+                parent.memory_peak = max(parent.memory_peak, peak)
+            tracemalloc.reset_peak()
+            frame.memory_start = frame.memory_peak = current
+        self.stack.append(frame)
+        frame.start = perf_counter_ns()
+        return frame
+
+    def exit(self, frame: _Frame) -> None:
+        elapsed = perf_counter_ns() - frame.start
+        self.stack.pop()
+        stage = self.report.stages.get(frame.path)
+        if stage is None:
+            stage = self.report.stages[frame.path] = StageTiming(frame.path)
+        stage.calls += 1
+        stage.nanoseconds += elapsed
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            frame.memory_peak = max(frame.memory_peak, peak)
+            allocated = current - frame.memory_start
+            stage.allocated_bytes = (stage.allocated_bytes or 0) + allocated
+            stage.peak_bytes = max(stage.peak_bytes or 0,
+                                   frame.memory_peak - frame.memory_start)
+            if self.stack:
+                parent = self.stack[-1]
+                parent.memory_peak = max(parent.memory_peak, frame.memory_peak)
+
+
+_active: ContextVar[Optional[_Session]] = ContextVar("huffman_profile", default=None)
+
+# tracemalloc and its peak are process-wide. Profiles tracing memory are
+# tracked so tracing starts with the first and stops with the last, and
+# profiles running at the same time as another drop their memory figures
+_memory_lock = threading.Lock()
+_memory_sessions: List[_Session] = []
+_memory_started = False
+
+
+def _join_memory(session: _Session) -> None:
+    """Register a profile tracing memory, starting tracemalloc for the first"""
+    global _memory_started
+    with _memory_lock:
+        if not _memory_sessions:
+            # Tracing someone else started is used but left running
+            _memory_started = not tracemalloc.is_tracing()
+            if _memory_started:
+                tracemalloc.start()
+        else:
+            for other in _memory_sessions:
+                other.overlap()
+            session.overlap()
+        _memory_sessions.append(session)
+
+
+def _leave_memory(session: _Session) -> None:
+    """Unregister a profile, stopping tracemalloc after the last"""
+    global _memory_started
+    with _memory_lock:
+        _memory_sessions.remove(session)
+        if not _memory_sessions and _memory_started:
+            tracemalloc.stop()
+            _memory_started = False
+
+
+class _ProfiledStage:
+    """Context manager timing a stage into the active profile and the metrics"""
+
+    __slots__ = ("_session", "_name", "_frame", "_timer")
+
+    def __init__(self, session: _Session, name: str) -> None:
+        self._session = session
+        self._name = name
+
+    def __enter__(self) -> "_ProfiledStage":
+        self._timer = metrics.time(STAGE_SECONDS, self._name)
+        self._timer.__enter__()
+        self._frame = self._session.enter(self._name)
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._session.exit(self._frame)
+        self._timer.__exit__(*exc_info)
+
+
+def stage(name: str) -> Union[_ProfiledStage, "metrics._Timer", "metrics._NullTimer"]:
+    """
+    Mark a codec stage for the active profile and the stage histogram.
+
+    Args:
+        name: Stage name, e.g. ``"tree_build"``
+
+    Returns:
+        Context manager; just the metrics timer when not profiling
+    """
+    session = _active.get()
+    if session is None:
+        return metrics.time(STAGE_SECONDS, name)
+    return _ProfiledStage(session, name)
+
+
+def is_active() -> bool:
+    """Whether a profile is being recorded in this context"""
+    return _active.get() is not None
+
+
+def count(**amounts: int) -> None:
+    """Add to the named counts of the active profile, if any"""
+    session = _active.get()
+    if session is None:
+        return
+    counts = session.report.counts
+    for name, amount in amounts.items():
+        counts[name] = counts.get(name, 0) + amount
+
+
+@contextmanager
+def profile(sink: Optional[Sink] = None, memory: bool = True) -> Iterator[Profile]:
+    """
+    Profile the HuffmanCoding calls made inside the block.
+
+    Args:
+        sink: Called with the finished profile, e.g. to log or export it
+        memory: Trace allocations with :mod:`tracemalloc`, which slows
+            allocation-heavy stages down noticeably. Tracing is global, so
+            when profiles overlap, e.g. on concurrent request threads,
+            each reports ``memory_unavailable`` instead of allocations
+
+    Returns:
+        Context manager yielding the Profile, filled in when the block ends
+    """
+    report = Profile()
+    session = _Session(report, memory)
+    if memory:
+        _join_memory(session)
+    token = _active.set(session)
+    start = perf_counter_ns()
+    try:
+        yield report
+    finally:
+        report.total_nanoseconds = perf_counter_ns() - start
+        _active.reset(token)
+        if memory:
+            _leave_memory(session)
+        if report.memory_unavailable:
+            for timing in report.stages.values():
+                timing.allocated_bytes = timing.peak_bytes = None
+        if sink is not None:
+            sink(report)
+
+
+def json_sink(write: Callable[[str], Any]) -> Sink:
+    """
+    Build a sink writing each profile as one line of JSON.
+
+    Args:
+        write: Receives the JSON text, e.g. ``logger.info`` or ``file.write``
+
+    Returns:
+        Sink for :func:`profile`
+    """
+    return lambda report: write(json.dumps(report.to_dict(), separators=(",", ":")))
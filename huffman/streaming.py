@@ -0,0 +1,291 @@
+"""
+Incremental Huffman encoding and decoding with bounded memory
+"""
+
+import sys
+from collections import Counter
+from typing import IO, Dict, Iterator, Mapping, Optional, Union
+
+from .bitio import BitWriter, BytesLike, byte_view
+from .canonical import (
+    assign_canonical_codes,
+    code_lengths_from_codes,
+    code_lengths_from_frequencies,
+)
+from .decoder import DEFAULT_PRIMARY_BITS, DecodeState, Piece, Symbol, TableDecoder
+from .exceptions import DecodingError, EncodingError
+
+# Default number of characters or bytes read per step
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+# Stand-in for the payload size while it is still unknown
+_UNKNOWN_LENGTH = sys.maxsize
+
+Chunk = Union[str, BytesLike]
+
+
+def count_frequencies(stream: IO,
+                      chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[Symbol, int]:
+    """
+    Count symbol frequencies of a stream without loading it whole.
+
+    This is the first pass of two-pass streaming compression: text
+    streams yield character counts, binary streams byte-value counts.
+
+    Args:
+        stream: Text or binary file-like object
+        chunk_size: Characters or bytes read per step
+
+    Returns:
+        Mapping of symbol to frequency
+    """
+    counter: Counter = Counter()
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        counter.update(chunk if isinstance(chunk, str) else byte_view(chunk))
+    return dict(counter)
+
+
+class HuffmanEncoder:
+    """
+    Incremental encoder over a fixed code table.
+
+    Each :meth:`update` returns the whole bytes completed by that chunk;
+    at most 7 bits are carried over, so memory is bounded by the chunk
+    size plus the code table. Text tables take ``str`` chunks, byte
+    tables (integer symbols) take buffer-protocol chunks.
+    """
+
+    def __init__(self, codes: Mapping[Symbol, str]) -> None:
+        """
+        Args:
+            codes: Mapping of symbol to binary code string
+
+        Raises:
+            ValueError: If the code table is empty
+        """
+        if not codes:
+            raise ValueError("Code table cannot be empty")
+        self._codes: Dict[Symbol, str] = dict(codes)
+        self._binary = isinstance(next(iter(codes)), int)
+        if self._binary:
+            table = [None] * 256
+            for byte, code in codes.items():
+                table[byte] = code  # type: ignore[index,call-overload]
+            self._lookup = table.__getitem__
+        else:
+            self._lookup = self._codes.__getitem__  # type: ignore[assignment]
+        self._writer = BitWriter()
+        self._finished = False
+
+    @classmethod
+    def from_code_lengths(cls, code_lengths: Mapping[Symbol, int]) -> "HuffmanEncoder":
+        """Create an encoder for the canonical codes with these lengths"""
+        return cls(assign_canonical_codes(code_lengths))  # type: ignore[type-var]
+
+    @classmethod
+    def from_frequencies(cls, freq_table: Mapping[Symbol, int]) -> "HuffmanEncoder":
+        """Create an encoder for canonical codes built from frequencies"""
+        if not freq_table:
+            raise ValueError("Frequency table cannot be empty")
+        lengths = code_lengths_from_frequencies(freq_table)  # type: ignore[type-var]
+        return cls.from_code_lengths(lengths)
+
+    @property
+    def codes(self) -> Dict[Symbol, str]:
+        """Get the code table"""
+        return self._codes.copy()
+
+    @property
+    def code_lengths(self) -> Dict[Symbol, int]:
+        """Get the code length of each symbol"""
+        return code_lengths_from_codes(self._codes)  # type: ignore[type-var]
+
+    @property
+    def bit_length(self) -> int:
+        """Number of payload bits produced so far"""
+        return self._writer.bit_length
+
+    def update(self, chunk: Chunk) -> bytes:
+        """
+        Encode the next chunk.
+
+        Args:
+            chunk: Text (text tables) or bytes (byte tables)
+
+        Returns:
+            Packed bytes completed by this chunk
+
+        Raises:
+            EncodingError: If a symbol has no code or the encoder is flushed
+        """
+        if self._finished:
+            raise EncodingError("Encoder has already been flushed")
+        symbols = byte_view(chunk) if self._binary else chunk  # type: ignore[arg-type]
+        try:
+            self._writer.write_codes(symbols, self._lookup)  # type: ignore[arg-type]
+        except (KeyError, TypeError):
+            missing = self._find_missing(symbols)
+            raise EncodingError(f"Symbol not found in codes: {missing!r}") from None
+        return self._writer.take()
+
+    def _find_missing(self, symbols: Chunk) -> Optional[Symbol]:
+        """Return the first symbol in ``symbols`` without a code"""
+        for symbol in symbols:
+            try:
+                if self._lookup(symbol) is None:  # type: ignore[arg-type]
+                    return symbol
+            except KeyError:
+                return symbol
+        return None
+
+    def flush(self) -> bytes:
+        """
+        Finish the stream.
+
+        Returns:
+            The last, zero-padded partial byte (empty if none)
+        """
+        self._finished = True
+        return self._writer.getvalue()
+
+
+class HuffmanDecoder:
+    """
+    Incremental decoder over a fixed code table.
+
+    The payload bit length may be given up front or only at
+    :meth:`flush`; in the latter case the last byte of each chunk is
+    held back, since only the final byte can contain padding.
+    """
+
+    def __init__(self, codes: Mapping[Symbol, str], bit_length: Optional[int] = None,
+                 primary_bits: int = DEFAULT_PRIMARY_BITS) -> None:
+        """
+        Args:
+            codes: Mapping of symbol to binary code string
+            bit_length: Total payload bits, if already known
+            primary_bits: Width of the decoder's primary lookup table
+        """
+        self._decoder = TableDecoder(codes, primary_bits)
+        self._bit_length = bit_length
+        self._state = DecodeState(_UNKNOWN_LENGTH if bit_length is None else bit_length)
+        self._held = b""
+        self._finished = False
+
+    @classmethod
+    def from_code_lengths(cls, code_lengths: Mapping[Symbol, int],
+                          bit_length: Optional[int] = None) -> "HuffmanDecoder":
+        """Create a decoder for the canonical codes with these lengths"""
+        codes = assign_canonical_codes(code_lengths)  # type: ignore[type-var]
+        return cls(codes, bit_length)
+
+    def update(self, data: BytesLike) -> Piece:
+        """
+        Decode the next chunk of packed bytes.
+
+        Args:
+            data: Next chunk of the payload
+
+        Returns:
+            Text or bytes completed by this chunk
+
+        Raises:
+            DecodingError: If the stream is invalid or already flushed
+        """
+        if self._finished:
+            raise DecodingError("Decoder has already been flushed")
+        if self._bit_length is not None:
+            return self._decoder.feed(self._state, data)
+
+        view = byte_view(data)
+        if not len(view):
+            return self._decoder.feed(self._state, b"")
+        head = self._decoder.feed(self._state, self._held)
+        body = self._decoder.feed(self._state, view[:-1])
+        piece = head + body  # type: ignore[operator]
+        self._held = bytes(view[-1:])
+        return piece
+
+    def flush(self, bit_length: Optional[int] = None) -> Piece:
+        """
+        Finish the stream and decode the remaining bits.
+
+        Args:
+            bit_length: Total payload bits, required if not given at creation
+
+        Returns:
+            Remaining decoded text or bytes
+
+        Raises:
+            DecodingError: If the stream is incomplete or the length is unknown
+        """
+        if self._finished:
+            raise DecodingError("Decoder has already been flushed")
+        self._finished = True
+
+        if self._bit_length is None:
+            if bit_length is None:
+                raise DecodingError("Bit length is required to finish the stream")
+            consumed = _UNKNOWN_LENGTH - self._state.remaining
+            self._state.remaining = bit_length - consumed
+            if self._state.remaining < 0:
+                raise DecodingError("Bit length is shorter than the decoded stream")
+        return self._decoder.feed(self._state, self._held, final=True)
+
+
+def iter_encode(stream: IO, encoder: HuffmanEncoder,
+                chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Encode a file-like object chunk by chunk.
+
+    ``encoder.bit_length`` holds the payload size once the iterator is
+    exhausted.
+
+    Args:
+        stream: Text or binary file-like object matching the code table
+        encoder: Encoder holding the code table
+        chunk_size: Characters or bytes read per step
+
+    Yields:
+        Packed payload bytes
+    """
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        data = encoder.update(chunk)
+        if data:
+            yield data
+    tail = encoder.flush()
+    if tail:
+        yield tail
+
+
+def iter_decode(stream: IO, decoder: HuffmanDecoder,
+                chunk_size: int = DEFAULT_CHUNK_SIZE,
+                bit_length: Optional[int] = None) -> Iterator[Piece]:
+    """
+    Decode a binary file-like object chunk by chunk.
+
+    Args:
+        stream: Binary file-like object positioned at the payload
+        decoder: Decoder holding the code table
+        chunk_size: Bytes read per step
+        bit_length: Total payload bits, if not given to the decoder
+
+    Yields:
+        Decoded text or bytes
+    """
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        piece = decoder.update(chunk)
+        if piece:
+            yield piece
+    piece = decoder.flush(bit_length)
+    if piece:
+        yield piece
@@ -0,0 +1,211 @@
+"""
+Compact array-backed Huffman tree
+"""
+
+from array import array
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
+
+from .exceptions import DecodingError
+from .node import Node
+
+# Child slot marking a missing branch
+_NO_CHILD = -1
+
+
+class CompactTree:
+    """
+    Huffman tree stored as parallel integer arrays instead of Node objects.
+
+    Node ``i`` has children ``children[2*i]`` (bit 0) and
+    ``children[2*i + 1]`` (bit 1), ``-1`` when absent. ``leaf[i]`` is the
+    index of its symbol in :attr:`symbols`, or ``-1`` for internal nodes.
+    Node 0 is the root. A tree costs a few machine words per node rather
+    than a Python object with a ``__dict__``.
+    """
+
+    __slots__ = ("_children", "_leaf", "_freq", "_symbols")
+
+    def __init__(self) -> None:
+        self._children = array("i")
+        self._leaf = array("i")
+        self._freq = array("q")
+        self._symbols: List[str] = []
+
+    def _add(self, freq: int = 0, symbol: Optional[str] = None) -> int:
+        """Append a node and return its index"""
+        self._children.extend((_NO_CHILD, _NO_CHILD))
+        if symbol is None:
+            self._leaf.append(-1)
+        else:
+            self._leaf.append(len(self._symbols))
+            self._symbols.append(symbol)
+        self._freq.append(freq)
+        return len(self._leaf) - 1
+
+    @classmethod
+    def from_node(cls, root: Node) -> "CompactTree":
+        """
+        Flatten a Node tree, numbering nodes in pre-order.
+
+        Args:
+            root: Root of the tree
+
+        Returns:
+            Equivalent compact tree
+        """
+        tree = cls()
+        stack: List[Tuple[Node, int]] = [(root, -1)]
+        while stack:
+            node, slot = stack.pop()
+            index = tree._add(node.freq, node.char if node.is_leaf else None)
+            if slot >= 0:
+                tree._children[slot] = index
+            if node.right:
+                stack.append((node.right, 2 * index + 1))
+            if node.left:
+                stack.append((node.left, 2 * index))
+        return tree
+
+    @classmethod
+    def from_codes(cls, codes: Mapping[str, str],
+                   freq_table: Optional[Mapping[str, int]] = None) -> "CompactTree":
+        """
+        Build the tree whose root-to-leaf paths spell out ``codes``.
+
+        Args:
+            codes: Character to binary code mapping (prefix-free)
+            freq_table: Character frequency mapping for leaf weights;
+                internal weights are the sums of their leaves
+
+        Returns:
+            Compact tree for the codes
+        """
+        freq_table = freq_table or {}
+        tree = cls()
+        if len(codes) == 1:
+            # A lone symbol is its own root, as in the Node tree
+            char = next(iter(codes))
+            tree._add(freq_table.get(char, 0), char)
+            return tree
+
+        tree._add()
+        children, freqs = tree._children, tree._freq
+        for char, code in codes.items():
+            freq = freq_table.get(char, 0)
+            node = 0
+            freqs[0] += freq
+            for bit in code[:-1]:
+                slot = 2 * node + (bit == "1")
+                if children[slot] == _NO_CHILD:
+                    children[slot] = tree._add()
+                node = children[slot]
+                freqs[node] += freq
+            children[2 * node + (code[-1] == "1")] = tree._add(freq, char)
+        return tree
+
+    def __len__(self) -> int:
+        return len(self._leaf)
+
+    @property
+    def symbols(self) -> List[str]:
+        """Get the symbols in leaf order"""
+        return list(self._symbols)
+
+    @property
+    def leaf_count(self) -> int:
+        """Number of leaves in the tree"""
+        return len(self._symbols)
+
+    def is_leaf(self, index: int) -> bool:
+        """Check whether node ``index`` is a leaf"""
+        return self._leaf[index] >= 0
+
+    def symbol(self, index: int) -> Optional[str]:
+        """Get the symbol of node ``index``, None for internal nodes"""
+        leaf = self._leaf[index]
+        return self._symbols[leaf] if leaf >= 0 else None
+
+    def frequency(self, index: int) -> int:
+        """Get the weight of node ``index``"""
+        return self._freq[index]
+
+    def child(self, index: int, bit: int) -> Optional[int]:
+        """Get the child of node ``index`` along ``bit``, None if absent"""
+        child = self._children[2 * index + bit]
+        return None if child == _NO_CHILD else child
+
+    def codes(self) -> Dict[str, str]:
+        """Read the code of every leaf off the tree"""
+        if self._leaf[0] >= 0:
+            return {self._symbols[self._leaf[0]]: "0"}
+        codes: Dict[str, str] = {}
+        for index, path in self._walk():
+            leaf = self._leaf[index]
+            if leaf >= 0:
+                codes[self._symbols[leaf]] = path
+        return codes
+
+    def _walk(self) -> Iterator[Tuple[int, str]]:
+        """Yield (index, path) for every node in pre-order"""
+        stack = [(0, "")]
+        children = self._children
+        while stack:
+            index, path = stack.pop()
+            yield index, path
+            for bit in (1, 0):
+                child = children[2 * index + bit]
+                if child != _NO_CHILD:
+                    stack.append((child, path + "01"[bit]))
+
+    def to_node(self) -> Node:
+        """Expand the tree back into Node objects"""
+        nodes = [Node(char=self.symbol(index), freq=self._freq[index])
+                 for index in range(len(self._leaf))]
+        children = self._children
+        for index, node in enumerate(nodes):
+            left, right = children[2 * index], children[2 * index + 1]
+            node.left = nodes[left] if left != _NO_CHILD else None
+            node.right = nodes[right] if right != _NO_CHILD else None
+        return nodes[0]
+
+    def decode(self, bits: str) -> str:
+        """
+        Decode a '0'/'1' string by walking the tree.
+
+        Costs nothing to set up, so it suits short messages where
+        building a lookup-table decoder would dominate.
+
+        Args:
+            bits: Binary string to decode
+
+        Returns:
+            Decoded text
+
+        Raises:
+            DecodingError: If the bits do not follow the tree
+        """
+        if bits.strip("01"):
+            raise DecodingError("Invalid binary sequence")
+        symbols = self._symbols
+        leaf = self._leaf
+        if leaf[0] >= 0:
+            if bits.strip("0"):
+                raise DecodingError("Invalid binary sequence")
+            return symbols[leaf[0]] * len(bits)
+
+        children = self._children
+        out = []
+        append = out.append
+        node = 0
+        # ord('0') == 48, so each byte minus 48 is the branch taken
+        for byte in bits.encode("ascii"):
+            node = children[2 * node + byte - 48]
+            if node < 0:
+                raise DecodingError("Invalid binary sequence")
+            symbol = leaf[node]
+            if symbol >= 0:
+                append(symbols[symbol])
+                node = 0
+        if node:
+            raise DecodingError("Incomplete binary sequence")
+        return "".join(out)
@@ -11,12 +11,8 @@ def main() -> None:
     # Get configuration from environment
     config_name = os.environ.get('FLASK_ENV', 'development')
     
-    # Create application
-    app = create_app()
-    app.config.from_object(config.get(config_name, config['default']))
-    
-    # Initialize configuration
-    config[config_name].init_app(app)
+    # Create and configure application
+    app = create_app(config_name if config_name in config else 'default')
     
     # Run the application
     # Use 0.0.0.0 for production to allow external connections (required by Render)
@@ -0,0 +1,140 @@
+"""Tests for single-pass adaptive Huffman coding"""
+
+import io
+import random
+
+import pytest
+from huffman import adaptive
+from huffman.adaptive import AdaptiveDecoder, AdaptiveEncoder, AdaptiveTree
+from huffman.coding import HuffmanCoding
+from huffman.exceptions import DecodingError, EncodingError
+from huffman.streaming import iter_decode, iter_encode
+
+
+def _check_invariant(tree):
+    """Assert the sibling property and Vitter's ordering of ``tree``"""
+    order = tree._order
+    for rank, node in enumerate(order):
+        assert node.rank == rank
+        if node.left is not None:
+            assert node.weight == node.left.weight + node.right.weight
+            assert node.left.parent is node and node.right.parent is node
+            assert node.left.rank > rank and node.right.rank > rank
+    for higher, lower in zip(order, order[1:]):
+        assert higher.weight >= lower.weight
+        if higher.weight == lower.weight:
+            # Internal nodes lead their weight class
+            assert higher.left is not None or lower.left is None
+    assert order[-1] is tree.nyt
+
+
+class TestAdaptiveTree:
+    """Test the tree update keeps Algorithm V's invariant"""
+
+    @pytest.mark.parametrize("seed", range(10))
+    def test_invariant(self, seed):
+        """Test the invariant holds after every update on skewed inputs"""
+        rng = random.Random(seed)
+        symbols = [chr(97 + i) for i in range(rng.randint(1, 40))]
+        weights = [rng.choice([1, 2, 5, 50]) for _ in symbols]
+        tree = AdaptiveTree()
+
+        for symbol in rng.choices(symbols, weights, k=300):
+            tree.update(symbol)
+            _check_invariant(tree)
+
+        assert len(tree) == len(set(tree._leaves))
+
+    def test_codes_prefix_free(self, sample_text):
+        """Test the current codes form a prefix-free set"""
+        tree = AdaptiveTree()
+        for char in sample_text:
+            tree.update(char)
+
+        codes = [format(code, f"0{length}b") for code, length in
+                 (tree.code(tree.leaf(char)) for char in set(sample_text))]
+        assert not any(a != b and b.startswith(a) for a in codes for b in codes)
+
+
+class TestAdaptiveCoding:
+    """Test one-shot and incremental adaptive coding"""
+
+    @pytest.mark.parametrize("text", [
+        "", "a", "aaaa", "HELLO WORLD",
+        "mixed 日本語 text with emoji \U0001F600 " * 50,
+        "lone surrogate \ud800",
+    ])
+    def test_round_trip(self, text):
+        """Test text survives encoding and decoding"""
+        assert adaptive.decode(adaptive.encode(text)) == text
+
+    def test_bytes(self):
+        """Test binary streams code byte values"""
+        data = bytes(range(256)) * 4 + b"\x00" * 1000
+
+        assert adaptive.decode(adaptive.encode(data), binary=True) == data
+
+    def test_ratio_close_to_static(self, sample_text):
+        """Test one pass compresses about as well as two, without a table"""
+        text = sample_text * 200
+        static_bits = len(HuffmanCoding().encode(text)[0])
+
+        assert len(adaptive.encode(text)) * 8 < static_bits * 1.1
+
+    def test_incremental(self, sample_text):
+        """Test byte-at-a-time feeding matches the one-shot stream"""
+        text = sample_text * 20
+        encoder = AdaptiveEncoder()
+        stream = b"".join(encoder.update(char) for char in text) + encoder.flush()
+        decoder = AdaptiveDecoder()
+
+        decoded = "".join(decoder.update(stream[i:i + 1]) for i in range(len(stream)))
+
+        assert stream == adaptive.encode(text)
+        assert decoded == text
+        assert decoder.eof
+
+    def test_unused_data(self):
+        """Test bytes after the end marker are left over"""
+        decoder = AdaptiveDecoder()
+
+        assert decoder.update(adaptive.encode("abc") + b"next") == "abc"
+        assert decoder.update(b"!") == ""
+        assert decoder.unused_data == b"next!"
+
+    def test_file_streams(self, sample_text):
+        """Test the streaming helpers drive adaptive coders"""
+        text = sample_text * 100
+        encoded = b"".join(
+            iter_encode(io.StringIO(text), AdaptiveEncoder(), chunk_size=7))
+        decoded = "".join(
+            iter_decode(io.BytesIO(encoded), AdaptiveDecoder(), chunk_size=3))
+
+        assert decoded == text
+
+    def test_truncated(self):
+        """Test a stream cut before its end marker is rejected"""
+        stream = adaptive.encode("abracadabra")
+
+        with pytest.raises(DecodingError, match="end marker"):
+            adaptive.decode(stream[:-1])
+
+    def test_invalid_escape(self):
+        """Test a new symbol that is not UTF-8 is rejected"""
+        with pytest.raises(DecodingError):
+            adaptive.decode(b"\x7f\xc0")
+
+    def test_misuse(self):
+        """Test wrong chunk types and use after flush"""
+        encoder = AdaptiveEncoder(binary=True)
+        with pytest.raises(EncodingError):
+            encoder.update("text")
+        encoder.flush()
+        with pytest.raises(EncodingError):
+            encoder.update(b"bytes")
+
+        decoder = AdaptiveDecoder()
+        decoder.update(adaptive.encode(""))
+        decoder.flush()
+        with pytest.raises(DecodingError):
+            decoder.update(b"")
@@ -1,7 +1,12 @@
 """Tests for the Flask API endpoints"""
 
+import base64
 import json
 import pytest
+from app import routes
+from huffman.canonical import serialize_code_lengths
+from huffman.coding import DecodingError, HuffmanCoding
+from huffman.dictionary import HuffmanDictionary
 
 
 class TestAPIEndpoints:
@@ -48,6 +53,13 @@ class TestAPIEndpoints:
         data = json.loads(response.data)
         assert 'error' in data
     
+    def test_encode_endpoint_non_string_text(self, client):
+        """Test encoding rejects text that is not a string"""
+        response = client.post('/encode', json={'text': 5})
+        
+        assert response.status_code == 400
+        assert 'string' in response.get_json()['error']
+    
     def test_encode_endpoint_no_json(self, client):
         """Test encoding without JSON data"""
         response = client.post('/encode')
@@ -80,6 +92,91 @@ class TestAPIEndpoints:
         data = json.loads(response.data)
         assert data['decoded'] == sample_text
     
+    def test_decode_endpoint_code_lengths(self, client, sample_text):
+        """Test decoding with the compact code-length header"""
+        encode_response = client.post(
+            '/encode',
+            data=json.dumps({'text': sample_text, 'canonical': True}),
+            content_type='application/json'
+        )
+        encode_data = json.loads(encode_response.data)
+        
+        response = client.post(
+            '/decode',
+            data=json.dumps({
+                'encoded': encode_data['encoded'],
+                'code_lengths': encode_data['code_lengths']
+            }),
+            content_type='application/json'
+        )
+        
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['decoded'] == sample_text
+    
+    @pytest.mark.parametrize("text", [
+        "abracadabra", "Hello World! This is a test.", "mississippi river",
+    ])
+    def test_decode_baseline_payload(self, client, text):
+        """Test payloads from the classic tree codes decode with just the table"""
+        encoded, freq_table = HuffmanCoding().encode(text)
+        
+        response = client.post('/decode', json={
+            'encoded': encoded,
+            'frequency_table': [{'char': c, 'freq': f} for c, f in freq_table.items()],
+        })
+        
+        assert response.status_code == 200
+        assert response.get_json()['decoded'] == text
+    
+    def test_encode_full_mode_codes(self, client):
+        """Test full mode keeps the tree codes unless canonical ones are asked for"""
+        text = "mississippi river"
+        classic = client.post('/encode', json={'text': text}).get_json()
+        canonical = client.post(
+            '/encode', json={'text': text, 'canonical': True}).get_json()
+        
+        assert classic['encoded'] == HuffmanCoding().encode(text)[0]
+        assert not classic['canonical'] and 'code_lengths' not in classic
+        assert canonical['canonical'] and 'code_lengths' in canonical
+        
+        # A canonical payload decodes from its frequency table when flagged
+        response = client.post('/decode', json={
+            'encoded': canonical['encoded'],
+            'frequency_table': canonical['frequency_table'],
+            'canonical': True,
+        })
+        assert response.get_json()['decoded'] == text
+    
+    def test_decode_endpoint_invalid_code_lengths(self, client):
+        """Test decoding with a malformed code-length header"""
+        response = client.post(
+            '/decode',
+            data=json.dumps({'encoded': '0101', 'code_lengths': '!!!'}),
+            content_type='application/json'
+        )
+        
+        assert response.status_code == 400
+        data = json.loads(response.data)
+        assert 'error' in data
+    
+    @pytest.mark.parametrize('lengths', [
+        {'a': 1, 'b': 200},
+        {'a': 1, 'b': 1, 'c': 1},
+    ])
+    def test_decode_endpoint_untrusted_code_lengths(self, client, monkeypatch, lengths):
+        """Test overlong or oversubscribed headers are refused before decoding"""
+        def fail():
+            raise AssertionError('No decoder may be built')
+        
+        monkeypatch.setattr(routes, 'get_pool', fail)
+        header = base64.b64encode(serialize_code_lengths(lengths)).decode('ascii')
+        response = client.post('/decode',
+                               json={'encoded': '0101', 'code_lengths': header})
+        
+        assert response.status_code == 400
+        assert response.get_json()['error'] == 'Invalid code lengths format'
+    
     def test_decode_endpoint_missing_data(self, client):
         """Test decoding with missing data"""
         response = client.post(
@@ -92,6 +189,16 @@ class TestAPIEndpoints:
         data = json.loads(response.data)
         assert 'error' in data
     
+    @pytest.mark.parametrize("extra", [{}, {'bit_length': 3}])
+    def test_decode_endpoint_non_string_encoded(self, client, extra):
+        """Test decoding rejects an encoded payload that is not a string"""
+        response = client.post('/decode', json={
+            'encoded': 5, 'frequency_table': [{'char': 'a', 'freq': 1}], **extra,
+        })
+        
+        assert response.status_code == 400
+        assert 'string' in response.get_json()['error']
+    
     def test_decode_endpoint_invalid_frequency_table(self, client):
         """Test decoding with invalid frequency table"""
         response = client.post(
@@ -107,6 +214,171 @@ class TestAPIEndpoints:
         data = json.loads(response.data)
         assert 'error' in data
     
+    def test_encode_lean_round_trip(self, client, sample_text):
+        """Test lean responses carry only the packed payload and header"""
+        response = client.post('/encode', json={'text': sample_text, 'mode': 'lean'})
+        
+        assert response.status_code == 200
+        data = response.get_json()
+        assert set(data) == {'encoded', 'bit_length', 'code_lengths'}
+        
+        response = client.post('/decode', json=data)
+        
+        assert response.status_code == 200
+        assert response.get_json()['decoded'] == sample_text
+    
+    def test_encode_tree_on_request(self, client, sample_text):
+        """Test the tree layout is built only when asked for"""
+        lean = client.post('/encode', json={'text': sample_text, 'mode': 'lean',
+                                            'include_tree': True}).get_json()
+        full = client.post('/encode', json={'text': sample_text,
+                                            'include_tree': False}).get_json()
+        
+        assert lean['tree_structure']['frequency'] == len(sample_text)
+        assert 'tree_structure' not in full
+        assert 'huffman_codes' in full
+    
+    @pytest.mark.parametrize("body, message", [
+        ({'encoded': '!!', 'bit_length': 3, 'code_lengths': 'AA=='},
+         'Invalid packed payload'),
+        ({'encoded': 'AA==', 'bit_length': 9, 'code_lengths': 'AA=='},
+         'Invalid bit length'),
+        ({'encoded': 'AA==', 'bit_length': '8', 'code_lengths': 'AA=='},
+         'Invalid bit length'),
+    ])
+    def test_decode_invalid_packed(self, client, body, message):
+        """Test malformed packed payloads are rejected"""
+        response = client.post('/decode', json=body)
+        
+        assert response.status_code == 400
+        assert message in response.get_json()['error']
+    
+    def test_encode_unknown_mode(self, client):
+        """Test unknown response modes are rejected"""
+        response = client.post('/encode', json={'text': 'abc', 'mode': 'tiny'})
+        
+        assert response.status_code == 400
+    
+    @pytest.mark.parametrize("shared", [False, True])
+    def test_batch_round_trip(self, client, shared):
+        """Test batches encode and decode item by item"""
+        texts = ['Hello', 'World!', 'Hello']
+        response = client.post('/encode/batch',
+                               json={'items': texts, 'shared_table': shared})
+        
+        assert response.status_code == 200
+        data = response.get_json()
+        assert len(data['items']) == 3
+        assert ('code_lengths' in data) == shared
+        
+        response = client.post('/decode/batch', json=data)
+        
+        assert response.status_code == 200
+        assert [item['decoded'] for item in response.get_json()['items']] == texts
+    
+    @pytest.mark.parametrize("path, body, message", [
+        ('/encode/batch', {'items': []}, 'No items'),
+        ('/encode/batch', {'items': ['a', '']}, 'Item 1'),
+        ('/decode/batch', {'items': [{'encoded': '01'}]}, 'Item 0'),
+        ('/decode/batch', {'items': [{'encoded': '01', 'code_lengths': '!!'}]},
+         'Item 0'),
+        ('/decode/batch', [1, 2], 'No JSON'),
+    ])
+    def test_batch_invalid_items(self, client, path, body, message):
+        """Test malformed batches are rejected with the failing item"""
+        response = client.post(path, json=body)
+        
+        assert response.status_code == 400
+        assert message in response.get_json()['error']
+    
+    def test_batch_item_limit(self, app, client):
+        """Test batches over the configured size are refused"""
+        app.config['BATCH_MAX_ITEMS'] = 2
+        response = client.post('/encode/batch', json={'items': ['a', 'b', 'c']})
+        
+        assert response.status_code == 400
+        assert 'Too many items' in response.get_json()['error']
+    
+    def test_compress_round_trip(self, app, client):
+        """Test raw bodies compress and decompress as streamed binary"""
+        app.config['STREAM_BLOCK_SIZE'] = 4096
+        body = b'Hello World! ' * 2000 + bytes(range(256))
+        
+        response = client.post('/compress', data=body,
+                               content_type='application/octet-stream')
+        
+        assert response.status_code == 200
+        assert response.is_streamed
+        assert response.mimetype == 'application/octet-stream'
+        assert response.data[:4] == b'HUFF'
+        
+        response = client.post('/decompress', data=response.data,
+                               content_type='application/octet-stream')
+        
+        assert response.status_code == 200
+        assert response.data == body
+    
+    def test_compress_ignores_json_size_cap(self, app, client):
+        """Test raw bodies are limited only by the streaming limit"""
+        app.config['MAX_CONTENT_LENGTH'] = 16
+        assert client.post('/compress', data=bytes(1000)).status_code == 200
+        
+        app.config['STREAM_MAX_CONTENT_LENGTH'] = 16
+        assert client.post('/compress', data=bytes(1000)).status_code == 413
+    
+    def test_decompress_invalid_container(self, client):
+        """Test malformed containers are rejected before streaming starts"""
+        response = client.post('/decompress', data=b'NOPE' + bytes(40))
+        
+        assert response.status_code == 400
+        assert 'Decoding error' in response.get_json()['error']
+    
+    def test_decompress_truncated_container(self, app, client):
+        """Test buffered bodies are checked in full, larger ones abort mid-stream"""
+        app.config['STREAM_BLOCK_SIZE'] = 4096
+        body = b'Hello World! ' * 2000
+        blob = client.post('/compress', data=body).data[:-5]
+        
+        response = client.post('/decompress', data=blob)
+        assert response.status_code == 400
+        assert 'Decoding error' in response.get_json()['error']
+        
+        app.config['STREAM_BUFFER_SIZE'] = 0
+        response = client.post('/decompress', data=blob)
+        assert response.status_code == 200
+        with pytest.raises(DecodingError):
+            response.get_data()
+    
+    def test_dictionary_round_trip(self, app, client):
+        """Test loaded dictionaries code messages, escaping unknown characters"""
+        dictionary = HuffmanDictionary.train(['hello world'] * 3, dict_id=7)
+        app.extensions['huffman_dictionaries'] = {7: dictionary}
+        text = 'hello wörld!'
+        
+        response = client.post('/dictionary/encode', json={'text': text, 'dict_id': 7})
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['dict_id'] == 7
+        assert base64.b64decode(data['encoded']) == dictionary.encode(text)
+        
+        response = client.post('/dictionary/decode', json={'encoded': data['encoded']})
+        assert response.status_code == 200
+        assert response.get_json()['decoded'] == text
+    
+    def test_dictionary_errors(self, app, client):
+        """Test unknown dictionaries and malformed messages get 400"""
+        response = client.post('/dictionary/encode', json={'text': 'a', 'dict_id': 7})
+        assert response.status_code == 400
+        assert 'Unknown dictionary ID 7' in response.get_json()['error']
+        
+        response = client.post('/dictionary/decode', json={'encoded': 'Bw=='})
+        assert response.status_code == 400
+        assert 'Decoding error' in response.get_json()['error']
+        
+        response = client.post('/dictionary/decode', json={'encoded': '!!'})
+        assert response.status_code == 400
+        assert client.post('/dictionary/decode', data='x').status_code == 400
+    
     def test_404_error(self, client):
         """Test 404 error handling"""
         response = client.get('/nonexistent')
@@ -0,0 +1,85 @@
+"""Tests for the benchmark suite"""
+
+import json
+
+import pytest
+from benchmarks.__main__ import main
+from benchmarks.compare import compare
+from benchmarks.corpora import format_size, generate, parse_size
+from benchmarks.harness import measure, percentile
+from benchmarks.suite import run_suite
+
+
+class TestCorpora:
+    """Test corpus generation and sizes"""
+
+    @pytest.mark.parametrize(
+        "name", ["uniform", "english", "repetitive", "unicode", "binary"])
+    def test_deterministic(self, name):
+        """Test corpora have the exact size and never change"""
+        corpus = generate(name, 3000)
+
+        assert len(corpus) == 3000
+        assert corpus == generate(name, 3000)
+        assert isinstance(corpus, bytes) == (name == "binary")
+
+    def test_sizes(self):
+        """Test binary size units parse and print"""
+        assert parse_size("64KB") == 65536
+        assert parse_size("1gb") == 1 << 30
+        assert format_size(1 << 20) == "1MB"
+        with pytest.raises(ValueError):
+            parse_size("0KB")
+
+
+class TestHarness:
+    """Test timing and statistics"""
+
+    def test_percentile(self):
+        """Test percentiles interpolate between samples"""
+        assert percentile([4, 1, 3, 2], 50) == 2.5
+        assert percentile([1, 2, 3], 100) == 3
+
+    def test_measure(self):
+        """Test the requested repeats are timed and memory is tracked"""
+        samples, peak = measure(lambda: bytearray(1 << 16), repeats=3, warmup=1)
+
+        assert len(samples) == 3
+        assert peak >= 1 << 16
+
+
+class TestSuite:
+    """Test running, saving and comparing results"""
+
+    def test_run_and_compare(self, tmp_path, capsys):
+        """Test a tiny run round-trips through JSON and flags slowdowns"""
+        output = tmp_path / "results.json"
+        assert main(["run", "--sizes", "1KB", "--corpora", "english,binary",
+                     "--repeats", "1", "--warmup", "0", "-o", str(output)]) == 0
+        results = json.loads(output.read_text())
+
+        assert len(results["results"]) == 8
+        assert results["results"][0]["mb_per_s"] > 0
+
+        slower = json.loads(output.read_text())
+        for entry in slower["results"]:
+            entry["p50_ns"] *= 2
+        (tmp_path / "slower.json").write_text(json.dumps(slower))
+
+        assert main(["compare", str(output), str(output)]) == 0
+        assert main(["compare", str(output), str(tmp_path / "slower.json")]) == 1
+        assert "REGRESSION" in capsys.readouterr().out
+
+    def test_http_size_limit(self):
+        """Test the HTTP round trip is skipped above its size limit"""
+        results = run_suite(sizes=[2048], corpora=["repetitive"], repeats=1, warmup=0,
+                            track_memory=False, http_max_size=1024)
+
+        assert [entry["benchmark"] for entry in results["results"]] == \
+            ["encode", "decode", "tree_build"]
+
+    def test_unknown_names(self):
+        """Test unknown corpora are rejected"""
+        with pytest.raises(ValueError):
+            run_suite(corpora=["klingon"])
+        assert compare({"results": []}, {"results": []}) == []
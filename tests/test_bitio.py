@@ -0,0 +1,126 @@
+"""Tests for bit packing helpers and packed Huffman output"""
+
+import pytest
+from huffman.bitio import BitWriter, pack_bits, read_varint, unpack_bits, write_varint
+from huffman.coding import HuffmanCoding, DecodingError
+
+
+class TestBitWriter:
+    """Test the BitWriter class"""
+    
+    def test_write_codes(self):
+        """Test codes are packed MSB-first with zero padding"""
+        writer = BitWriter()
+        writer.write(0b101, 3)
+        writer.write(0b1, 1)
+        writer.write(0b01, 2)
+        
+        assert writer.bit_length == 6
+        assert writer.getvalue() == bytes([0b10110100])
+    
+    def test_write_across_words(self):
+        """Test writes spanning the word boundary are preserved"""
+        writer = BitWriter()
+        bits = "1011001110001111" * 9
+        for bit in bits:
+            writer.write(int(bit), 1)
+        
+        assert writer.bit_length == len(bits)
+        assert writer.getvalue() == pack_bits(bits)
+    
+    def test_empty_writer(self):
+        """Test an unused writer produces no bytes"""
+        assert BitWriter().getvalue() == b""
+    
+    def test_write_codes_joins_in_chunks(self, monkeypatch):
+        """Test symbol codes are written the same whatever the join size"""
+        codes = {"a": "0", "b": "10", "c": "11"}
+        text = "abcabca" * 5
+        monkeypatch.setattr(BitWriter, "JOIN_SIZE", 4)
+        writer = BitWriter()
+        writer.write_codes(text, codes.__getitem__)
+        
+        bits = "".join(codes[char] for char in text)
+        assert writer.getvalue() == pack_bits(bits)
+        assert writer.bit_length == len(bits)
+    
+    def test_write_codes_missing_symbol(self):
+        """Test a lookup failure propagates to the caller"""
+        with pytest.raises(KeyError):
+            BitWriter().write_codes("ax", {"a": "0"}.__getitem__)
+
+
+class TestVarint:
+    """Test the LEB128 varint helpers"""
+    
+    @pytest.mark.parametrize("value", [0, 1, 127, 128, 300, 2 ** 40])
+    def test_roundtrip(self, value):
+        """Test values read back with the offset after them"""
+        out = bytearray(b"x")
+        write_varint(out, value)
+        
+        assert read_varint(out + b"rest", 1) == (value, len(out))
+    
+    def test_truncated(self):
+        """Test a varint cut short is rejected"""
+        out = bytearray()
+        write_varint(out, 300)
+        with pytest.raises(ValueError):
+            read_varint(out[:-1], 0)
+
+
+class TestPackBits:
+    """Test pack_bits/unpack_bits helpers"""
+    
+    def test_roundtrip(self):
+        """Test packing then unpacking returns the same bits"""
+        bits = "0001011100101"
+        packed = pack_bits(bits)
+        
+        assert len(packed) == 2
+        assert unpack_bits(packed, len(bits)) == bits
+    
+    def test_invalid_bit_length(self):
+        """Test a bit length larger than the data is rejected"""
+        with pytest.raises(ValueError):
+            unpack_bits(b"\x00", 9)
+
+
+class TestPackedEncoding:
+    """Test HuffmanCoding packed output"""
+    
+    def test_packed_matches_bit_string(self, sample_text):
+        """Test packed output carries the same bits as encode()"""
+        encoded, freq_table = HuffmanCoding().encode(sample_text)
+        packed, bit_length, packed_freq = HuffmanCoding().encode_packed(sample_text)
+        
+        assert bit_length == len(encoded)
+        assert packed == pack_bits(encoded)
+        assert packed_freq == freq_table
+        assert len(packed) < len(sample_text)
+    
+    def test_packed_roundtrip(self, sample_text):
+        """Test packed encode then decode returns original text"""
+        huffman = HuffmanCoding()
+        packed, bit_length, freq_table = huffman.encode_packed(sample_text)
+        
+        assert huffman.decode_packed(packed, bit_length, freq_table) == sample_text
+    
+    def test_packed_single_character(self):
+        """Test packed encoding of a single repeated character"""
+        huffman = HuffmanCoding()
+        packed, bit_length, freq_table = huffman.encode_packed("AAAAAAAAAA")
+        
+        assert packed == b"\x00\x00"
+        assert bit_length == 10
+        assert huffman.decode_packed(packed, bit_length, freq_table) == "AAAAAAAAAA"
+    
+    def test_packed_empty_text(self):
+        """Test packed encoding of empty text raises error"""
+        with pytest.raises(ValueError):
+            HuffmanCoding().encode_packed("")
+    
+    def test_packed_bad_bit_length(self, sample_frequency_table):
+        """Test decoding with an impossible bit length"""
+        with pytest.raises(DecodingError):
+            HuffmanCoding().decode_packed(b"\x00", 20, sample_frequency_table)
@@ -0,0 +1,104 @@
+"""Tests for block-adaptive re-coding"""
+
+import random
+
+import pytest
+from huffman import blockwise
+from huffman.blockwise import choose_table
+from huffman.canonical import serialize_code_lengths
+from huffman.coding import HuffmanCoding
+from huffman.exceptions import DecodingError
+
+
+def _drifting_text(sections=6, size=4000, seed=0):
+    """Text whose alphabet changes every ``size`` characters"""
+    rng = random.Random(seed)
+    parts = []
+    for _ in range(sections):
+        alphabet = [chr(rng.randrange(32, 0x250)) for _ in range(rng.randint(5, 20))]
+        weights = [rng.random() ** 3 for _ in alphabet]
+        parts.append("".join(rng.choices(alphabet, weights, k=size)))
+    return "".join(parts)
+
+
+class TestChooseTable:
+    """Test the per-block cost estimate"""
+
+    def test_first_block_sends_table(self):
+        """Test there is nothing to reuse for the first block"""
+        lengths, choice = choose_table({'a': 3, 'b': 1}, None)
+
+        assert choice.new_table
+        assert choice.header_bits == 8 * len(serialize_code_lengths(lengths))
+
+    def test_reuse_when_header_costs_more(self):
+        """Test a slightly worse table is kept rather than paying for a header"""
+        previous = {'a': 1, 'b': 2, 'c': 2}
+
+        lengths, choice = choose_table({'a': 10, 'b': 10, 'c': 12}, previous)
+
+        assert not choice.new_table
+        assert lengths == previous
+
+    def test_missing_symbol_forces_new_table(self):
+        """Test a table without a code for some symbol is never reused"""
+        _, choice = choose_table({'a': 1000, 'z': 1}, {'a': 1, 'b': 1})
+
+        assert choice.new_table
+
+
+class TestBlockwise:
+    """Test block-adaptive encoding and decoding"""
+
+    @pytest.mark.parametrize("text", ["", "a", "abracadabra", "日本語 \U0001F600 " * 300])
+    def test_round_trip(self, text):
+        """Test text survives across block sizes"""
+        for block_size in (1, 7, 1 << 16):
+            assert blockwise.decode(blockwise.encode(text, block_size)) == text
+
+    def test_bytes(self):
+        """Test binary data codes byte values"""
+        data = bytes(random.Random(1).randrange(256) for _ in range(5000))
+
+        assert blockwise.decode(blockwise.encode(data, 1000), binary=True) == data
+
+    def test_stationary_keeps_table(self, sample_text):
+        """Test input with stable statistics sends a single table"""
+        choices = blockwise.plan(sample_text * 500, 1024)
+
+        assert len(choices) > 10
+        assert [choice.new_table for choice in choices].count(True) == 1
+
+    def test_drift_beats_global_table(self):
+        """Test drifting input compresses better than with one table"""
+        text = _drifting_text()
+        huffman = HuffmanCoding(canonical=True)
+        encoded, _ = huffman.encode(text)
+        header = serialize_code_lengths(huffman.code_lengths)
+        global_size = len(encoded) // 8 + len(header)
+
+        stream = blockwise.encode(text, 1000)
+
+        assert blockwise.decode(stream) == text
+        assert len(stream) < 0.8 * global_size
+        choices = blockwise.plan(text, 1000)
+        assert [choice.new_table for choice in choices].count(True) >= 6
+
+    def test_invalid_block_size(self):
+        """Test block sizes must be positive"""
+        with pytest.raises(ValueError):
+            blockwise.encode("abc", 0)
+
+    @pytest.mark.parametrize("cut", [1, 3, -1])
+    def test_truncated(self, cut):
+        """Test truncated streams are rejected"""
+        stream = blockwise.encode(_drifting_text(2, 500), 100)
+
+        with pytest.raises(DecodingError):
+            blockwise.decode(stream[:cut])
+
+    def test_reuse_without_table(self):
+        """Test a first block claiming to reuse a table is rejected"""
+        with pytest.raises(DecodingError, match="mode"):
+            blockwise.decode(
+                b"\x04\x01" + bytes((blockwise.REUSE_TABLE,)) + b"\x01\x00")
@@ -0,0 +1,103 @@
+"""Tests for byte-pair alphabet extension"""
+
+import random
+
+import pytest
+from huffman import bpe
+from huffman.bpe import MergeTable
+from huffman.canonical import serialize_code_lengths
+from huffman.coding import HuffmanCoding
+from huffman.exceptions import DecodingError
+
+
+def _log_lines(count=2000, seed=0):
+    """Repetitive log text"""
+    rng = random.Random(seed)
+    levels = ["INFO", "WARN", "ERROR", "DEBUG"]
+    return "".join(
+        f"2026-10-17 12:{rng.randrange(60):02d}:{rng.randrange(60):02d} "
+        f"{rng.choice(levels)} "
+        f"[worker-{rng.randrange(8)}] GET /api/v1/items/{rng.randrange(1000)} "
+        f"in {rng.randrange(500)}ms\n"
+        for _ in range(count))
+
+
+class TestMergeTable:
+    """Test training, applying and expanding merges"""
+
+    def test_round_trip(self):
+        """Test applied merges expand back to the original text"""
+        text = _log_lines(200)
+        table = MergeTable.train(text, max_merges=50)
+
+        extended = table.apply(text)
+
+        assert 0 < len(table) <= 50
+        assert len(extended) < len(text) / 2
+        assert table.expand(extended) == text
+
+    def test_symbols_avoid_text(self):
+        """Test new symbols never collide with characters of the text"""
+        text = "\U000F0000\U000F0001 ab ab ab ab ab ab"
+        table = MergeTable.train(text, min_count=2)
+
+        assert all(symbol not in text for symbol, _, _ in table.merges)
+        assert table.expand(table.apply(text)) == text
+
+    def test_min_count(self):
+        """Test rare pairs are not merged"""
+        assert len(MergeTable.train("abcdefg", min_count=2)) == 0
+
+    def test_serialization(self):
+        """Test tables survive a round trip through bytes"""
+        table = MergeTable.train(_log_lines(100), max_merges=20)
+
+        parsed, end = MergeTable.read(table.to_bytes())
+
+        assert parsed.merges == table.merges
+        assert end == len(table.to_bytes())
+
+    def test_redefined_symbol(self):
+        """Test a symbol may only be defined once"""
+        with pytest.raises(ValueError):
+            MergeTable([("X", "a", "b"), ("X", "c", "d")])
+
+
+class TestBpeCoding:
+    """Test encoding with an extended alphabet"""
+
+    @pytest.mark.parametrize("text", ["", "a", "abababab", "日本語 \U0001F600 " * 100])
+    def test_round_trip(self, text):
+        """Test text survives encoding and decoding"""
+        assert bpe.decode(bpe.encode(text)) == text
+
+    def test_beats_per_character_coding(self):
+        """Test repetitive text compresses far better than per character"""
+        text = _log_lines()
+        huffman = HuffmanCoding(canonical=True)
+        encoded, _ = huffman.encode(text)
+        header = serialize_code_lengths(huffman.code_lengths)
+        plain_size = len(encoded) // 8 + len(header)
+
+        stream = bpe.encode(text)
+
+        assert bpe.decode(stream) == text
+        assert len(stream) < plain_size / 3
+
+    def test_unhelpful_merges_dropped(self):
+        """Test merges are left out when they would not pay for themselves"""
+        rng = random.Random(3)
+        text = "".join(rng.choices("abcdefghij", k=20000))
+
+        stream = bpe.encode(text, min_count=2)
+
+        assert stream[0] == 0  # empty merge table
+        assert bpe.decode(stream) == text
+
+    @pytest.mark.parametrize("cut", [0, 2, -1])
+    def test_truncated(self, cut):
+        """Test truncated streams are rejected"""
+        stream = bpe.encode(_log_lines(50))
+
+        with pytest.raises(DecodingError):
+            bpe.decode(stream[:cut])
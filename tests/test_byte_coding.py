@@ -0,0 +1,107 @@
+"""Tests for the byte-oriented Huffman codec"""
+
+import array
+import pytest
+from huffman.byte_coding import ALPHABET_SIZE, ByteHuffmanCoding
+from huffman.canonical import code_lengths_from_frequencies
+from huffman.coding import EncodingError, DecodingError
+
+
+class TestByteHuffmanCoding:
+    """Test the ByteHuffmanCoding class"""
+    
+    def test_frequency_table(self):
+        """Test byte counts land at their byte values"""
+        counts = ByteHuffmanCoding().build_frequency_table(b"aab\x00")
+        
+        assert len(counts) == ALPHABET_SIZE
+        assert counts[ord('a')] == 2
+        assert counts[ord('b')] == 1
+        assert counts[0] == 1
+        assert sum(counts) == 4
+    
+    def test_roundtrip_all_buffer_types(self, sample_text):
+        """Test bytes, bytearray and memoryview inputs round-trip"""
+        raw = sample_text.encode('utf-8')
+        for data in (raw, bytearray(raw), memoryview(raw)):
+            codec = ByteHuffmanCoding()
+            packed, bit_length, lengths = codec.encode(data)
+            
+            assert ByteHuffmanCoding().decode(packed, bit_length, lengths) == raw
+    
+    def test_non_byte_buffer(self):
+        """Test buffers with wider item sizes are viewed as raw bytes"""
+        data = array.array('H', [1, 2, 3, 1000])
+        codec = ByteHuffmanCoding()
+        packed, bit_length, lengths = codec.encode(data)
+        
+        assert codec.decode(packed, bit_length, lengths) == data.tobytes()
+    
+    def test_binary_data_roundtrip(self):
+        """Test every byte value round-trips"""
+        data = bytes(range(256)) * 3 + b"\xff" * 100
+        codec = ByteHuffmanCoding()
+        packed, bit_length, lengths = codec.encode(data)
+        
+        assert codec.decode(packed, bit_length, lengths) == data
+        assert bit_length < len(data) * 8
+    
+    def test_single_byte_value(self):
+        """Test input made of a single repeated byte"""
+        codec = ByteHuffmanCoding()
+        packed, bit_length, lengths = codec.encode(b"zzzz")
+        
+        assert bit_length == 4
+        assert codec.codes == {ord('z'): '0'}
+        assert codec.decode(packed, bit_length, lengths) == b"zzzz"
+    
+    def test_empty_data(self):
+        """Test encoding empty data raises error"""
+        with pytest.raises(ValueError):
+            ByteHuffmanCoding().encode(b"")
+    
+    def test_missing_code(self):
+        """Test encoding a byte without a code"""
+        codec = ByteHuffmanCoding()
+        codec.encode(b"ab")
+        
+        with pytest.raises(EncodingError):
+            codec.encode_with_codes(b"abc")
+    
+    def test_invalid_code_lengths(self):
+        """Test decoding with malformed code lengths"""
+        with pytest.raises(DecodingError):
+            ByteHuffmanCoding().decode(b"\x00", 8, [1] * 3)
+    
+    def test_compression_stats(self):
+        """Test stats use exact byte sizes"""
+        data = b"aaaaaaab"
+        codec = ByteHuffmanCoding()
+        _, bit_length, _ = codec.encode(data)
+        stats = codec.get_compression_stats(data, bit_length)
+        
+        assert stats.original_size == 64
+        assert stats.compressed_size == 8
+        assert stats.space_saved == pytest.approx(87.5)
+
+
+class TestCodeLengthsFromFrequencies:
+    """Test integer-array code length construction"""
+    
+    def test_lengths_match_tree(self, sample_frequency_table):
+        """Test lengths give the same total size as the Node-based tree"""
+        from huffman.coding import HuffmanCoding
+        huffman = HuffmanCoding()
+        text = "".join(char * freq for char, freq in sample_frequency_table.items())
+        huffman.encode(text)
+        lengths = code_lengths_from_frequencies(sample_frequency_table)
+        
+        def cost(table):
+            return sum(sample_frequency_table[char] * table[char] for char in table)
+        
+        assert cost(lengths) == cost(huffman.code_lengths)
+    
+    def test_zero_frequencies_ignored(self):
+        """Test zero counts get no code"""
+        assert code_lengths_from_frequencies({'a': 0, 'b': 3}) == {'b': 1}
+        assert code_lengths_from_frequencies({}) == {}
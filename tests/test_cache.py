@@ -0,0 +1,119 @@
+"""Tests for the code table cache"""
+
+import pytest
+from huffman.cache import CodeTableCache
+from huffman.coding import HuffmanCoding
+
+
+class TestCodeTableCache:
+    """Test LRU behavior and limits"""
+
+    def test_get_or_build_hits(self):
+        """Test a second lookup reuses the built value"""
+        cache = CodeTableCache()
+        key = cache.fingerprint("codes", {'a': 1, 'b': 2})
+        calls = []
+
+        def build():
+            calls.append(1)
+            return "built"
+
+        assert cache.get_or_build(key, build, len) == "built"
+        assert cache.get_or_build(key, build, len) == "built"
+        assert len(calls) == 1
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
+
+    def test_fingerprint_depends_on_order_and_variant(self):
+        """Test table order and settings produce distinct keys"""
+        fingerprint = CodeTableCache.fingerprint
+
+        key = fingerprint("codes", {'a': 1, 'b': 1})
+        assert key == fingerprint("codes", {'a': 1, 'b': 1})
+        assert key != fingerprint("codes", {'b': 1, 'a': 1})
+        assert (fingerprint("codes", {'a': 1}, True)
+                != fingerprint("codes", {'a': 1}, False))
+
+    def test_entry_limit_evicts_least_recent(self):
+        """Test the least recently used entry is evicted first"""
+        cache = CodeTableCache(max_entries=2)
+        cache.put("a", 1, 1)
+        cache.put("b", 2, 1)
+        cache.get("a")
+        cache.put("c", 3, 1)
+
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.stats.evictions == 1
+
+    def test_memory_limit(self):
+        """Test entries are evicted to stay within the byte budget"""
+        cache = CodeTableCache(max_bytes=100)
+        cache.put("a", 1, 60)
+        cache.put("b", 2, 60)
+        cache.put("huge", 3, 101)
+
+        assert len(cache) == 1
+        assert cache.get("huge") is None
+        assert cache.stats.bytes == 60
+
+    def test_invalid_limits(self):
+        """Test non-positive limits are rejected"""
+        with pytest.raises(ValueError):
+            CodeTableCache(max_entries=0)
+
+
+class TestCachedCoding:
+    """Test HuffmanCoding with a shared cache"""
+
+    @pytest.mark.parametrize("canonical", [False, True])
+    def test_round_trip_matches_uncached(self, canonical):
+        """Test cached instances produce the same codes and output"""
+        text = "the quick brown fox jumps over the lazy dog"
+        cache = CodeTableCache()
+        plain = HuffmanCoding(canonical=canonical)
+        expected, freq_table = plain.encode(text)
+
+        for _ in range(2):
+            huffman = HuffmanCoding(canonical=canonical, cache=cache)
+            encoded, _ = huffman.encode(text)
+            assert encoded == expected
+            assert huffman.codes == plain.codes
+            assert huffman.decode(encoded, freq_table) == text
+
+        # Short decodes walk the tree cached by encoding, built once
+        assert len(cache) == 1
+        assert cache.stats.hits == 3
+
+    def test_code_lengths_decoder_cached(self):
+        """Test decoders built from code lengths are reused"""
+        cache = CodeTableCache()
+        huffman = HuffmanCoding(canonical=True, cache=cache)
+        encoded, _ = huffman.encode("abracadabra")
+        lengths = huffman.code_lengths
+
+        for _ in range(3):
+            decoded = HuffmanCoding(cache=cache).decode(encoded, code_lengths=lengths)
+            assert decoded == "abracadabra"
+        assert cache.stats.hits == 2
+
+    def test_cached_codes_not_shared(self):
+        """Test mutating one instance's codes leaves the cache intact"""
+        cache = CodeTableCache()
+        first = HuffmanCoding(cache=cache)
+        first.encode("aab")
+        first._codes.clear()
+
+        second = HuffmanCoding(cache=cache)
+        encoded, freq_table = second.encode("aab")
+        assert second.decode(encoded, freq_table) == "aab"
+
+    def test_single_character(self):
+        """Test the single character special case is cached too"""
+        cache = CodeTableCache()
+        for _ in range(2):
+            huffman = HuffmanCoding(cache=cache)
+            encoded, freq_table = huffman.encode("zzz")
+            assert encoded == "000"
+            assert huffman.root is not None and huffman.root.char == 'z'
+        assert cache.stats.hits == 1
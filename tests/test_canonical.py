@@ -0,0 +1,255 @@
+"""Tests for canonical code assignment and code-length headers"""
+
+import itertools
+import random
+
+import pytest
+from huffman import coding
+from huffman.canonical import (
+    assign_canonical_codes,
+    code_lengths_from_frequencies,
+    deserialize_code_lengths,
+    read_code_lengths,
+    serialize_code_lengths,
+)
+from huffman.coding import HuffmanCoding, DecodingError, EncodingError
+
+
+class TestCanonicalCodes:
+    """Test canonical code assignment"""
+    
+    def test_assign_codes(self):
+        """Test codes follow length then symbol order"""
+        codes = assign_canonical_codes({'a': 2, 'b': 1, 'c': 3, 'd': 3})
+        
+        assert codes == {'b': '0', 'a': '10', 'c': '110', 'd': '111'}
+    
+    def test_oversubscribed_lengths(self):
+        """Test lengths that cannot form a prefix code are rejected"""
+        with pytest.raises(ValueError):
+            assign_canonical_codes({'a': 1, 'b': 1, 'c': 1})
+    
+    def test_invalid_length(self):
+        """Test zero code lengths are rejected"""
+        with pytest.raises(ValueError):
+            assign_canonical_codes({'a': 0})
+    
+    def test_canonical_encoding_roundtrip(self, sample_text):
+        """Test canonical codes decode from lengths alone"""
+        huffman = HuffmanCoding(canonical=True)
+        encoded, freq_table = huffman.encode(sample_text)
+        
+        assert huffman.codes == assign_canonical_codes(huffman.code_lengths)
+        decoded = HuffmanCoding().decode(encoded, code_lengths=huffman.code_lengths)
+        assert decoded == sample_text
+        assert HuffmanCoding(canonical=True).decode(encoded, freq_table) == sample_text
+    
+    def test_canonical_preserves_lengths(self, sample_text):
+        """Test canonical codes keep the optimal code lengths"""
+        plain = HuffmanCoding()
+        canonical = HuffmanCoding(canonical=True)
+        
+        plain_bits = len(plain.encode(sample_text)[0])
+        encoded, freq_table = canonical.encode(sample_text)
+        assert plain_bits == len(encoded)
+        assert canonical.code_lengths == code_lengths_from_frequencies(freq_table)
+    
+    def test_canonical_builds_no_nodes(self, monkeypatch, sample_text):
+        """Test canonical codes come straight from the lengths, without a Node heap"""
+        def no_nodes(*args, **kwargs):
+            raise AssertionError("Node built on the canonical path")
+        
+        monkeypatch.setattr(coding, "Node", no_nodes)
+        huffman = HuffmanCoding(canonical=True)
+        packed, bit_length, freq_table = huffman.encode_packed(sample_text)
+        
+        assert huffman.decode_packed(packed, bit_length, freq_table) == sample_text
+        # The classic tree still goes through the patched Node
+        with pytest.raises(EncodingError):
+            HuffmanCoding().encode(sample_text)
+    
+    def test_canonical_tree_matches_codes(self):
+        """Test the visualized tree paths follow canonical codes"""
+        huffman = HuffmanCoding(canonical=True)
+        huffman.encode("HELLO WORLD")
+        
+        def walk(node, path):
+            if node.is_leaf:
+                yield node.char, path
+                return
+            yield from walk(node.left, path + "0")
+            yield from walk(node.right, path + "1")
+        
+        assert dict(walk(huffman.root, "")) == huffman.codes
+        assert huffman.root.freq == len("HELLO WORLD")
+    
+    def test_invalid_code_lengths_decoding(self):
+        """Test decoding with impossible code lengths"""
+        with pytest.raises(DecodingError):
+            HuffmanCoding().decode("0101", code_lengths={'a': 1, 'b': 1, 'c': 1})
+
+
+class TestCodeLengthHeader:
+    """Test code-length header serialization"""
+    
+    def test_header_roundtrip(self, sample_text):
+        """Test a header parses back to the same lengths"""
+        huffman = HuffmanCoding(canonical=True)
+        huffman.encode(sample_text)
+        header = serialize_code_lengths(huffman.code_lengths)
+        
+        assert deserialize_code_lengths(header) == huffman.code_lengths
+        assert len(header) < len(str(huffman.code_lengths))
+    
+    def test_binary_symbols(self):
+        """Test integer symbols round-trip with binary=True"""
+        lengths = {0: 1, 200: 2, 255: 2}
+        header = serialize_code_lengths(lengths)
+        
+        assert deserialize_code_lengths(header, binary=True) == lengths
+    
+    def test_embedded_header(self):
+        """Test parsing a header embedded in a larger buffer"""
+        header = serialize_code_lengths({'x': 1, 'y': 1})
+        lengths, end = read_code_lengths(b"\xff" + header + b"rest", 1)
+        
+        assert lengths == {'x': 1, 'y': 1}
+        assert end == 1 + len(header)
+    
+    def test_truncated_header(self):
+        """Test truncated headers are rejected"""
+        header = serialize_code_lengths({'x': 1, 'y': 1})
+        with pytest.raises(ValueError):
+            deserialize_code_lengths(header[:-1])
+    
+    def test_multi_character_symbol_rejected(self):
+        """Test symbols must be single characters"""
+        with pytest.raises(ValueError):
+            serialize_code_lengths({'ab': 1})
+    
+    @pytest.mark.parametrize("lengths, message", [
+        ({'a': 1, 'b': 49}, "exceeds"),
+        ({'a': 1, 'b': 1, 'c': 1}, "Kraft"),
+        ({'a': 1, 'b': 2, 'c': 3, 'd': 3, 'e': 3}, "Kraft"),
+    ])
+    def test_untrusted_header_rejected(self, lengths, message):
+        """Test overlong and oversubscribed headers fail before symbols are read"""
+        header = serialize_code_lengths(lengths)
+        
+        with pytest.raises(ValueError, match=message):
+            deserialize_code_lengths(header)
+        with pytest.raises(ValueError, match=message):
+            read_code_lengths(b"\xff" + header, 1)
+    
+    def test_header_limit(self):
+        """Test a caller can raise or lower the accepted code length"""
+        header = serialize_code_lengths({'a': 1, 'b': 60})
+        
+        assert deserialize_code_lengths(header, limit=60) == {'a': 1, 'b': 60}
+        with pytest.raises(ValueError):
+            deserialize_code_lengths(serialize_code_lengths({'a': 1, 'b': 2}), limit=1)
+
+
+class TestCodeLengthBuilder:
+    """Test the two-queue code length builder"""
+    
+    @pytest.mark.parametrize("seed", range(5))
+    def test_two_queue_lengths_optimal(self, seed):
+        """Test lengths from the two-queue builder cost the same as the tree's"""
+        rng = random.Random(seed)
+        freqs = {chr(0x4E00 + i): rng.randint(1, 100) for i in range(300)}
+        huffman = HuffmanCoding()
+        codes = {}
+        huffman._generate_codes(huffman._build_huffman_tree(freqs), codes=codes)
+        
+        lengths = code_lengths_from_frequencies(freqs)
+        
+        assert sum(lengths[c] * f for c, f in freqs.items()) == \
+            sum(len(codes[c]) * f for c, f in freqs.items())
+        assert sum(2 ** -length for length in lengths.values()) == 1
+    
+    def test_two_queue_ignores_zero_frequencies(self):
+        """Test unused symbols get no code"""
+        lengths = code_lengths_from_frequencies({'a': 0, 'b': 3, 'c': 1})
+        assert lengths == {'b': 1, 'c': 1}
+        assert code_lengths_from_frequencies({'a': 0}) == {}
+
+
+class TestLengthLimitedCodes:
+    """Test package-merge length limiting"""
+    
+    @staticmethod
+    def _fibonacci_frequencies(count):
+        """Frequencies whose optimal code is as deep as possible"""
+        freqs = [1, 1]
+        while len(freqs) < count:
+            freqs.append(freqs[-1] + freqs[-2])
+        return {chr(ord('a') + i): freq for i, freq in enumerate(freqs)}
+    
+    @staticmethod
+    def _cost(lengths, freqs):
+        return sum(lengths[symbol] * freq for symbol, freq in freqs.items())
+    
+    def test_limit_respected(self):
+        """Test lengths stay within the limit and form a complete code"""
+        freqs = self._fibonacci_frequencies(20)
+        
+        lengths = code_lengths_from_frequencies(freqs, max_length=8)
+        
+        assert max(lengths.values()) == 8
+        assert sum(2 ** -length for length in lengths.values()) == 1
+        assert len(assign_canonical_codes(lengths)) == 20
+    
+    def test_small_compression_loss(self):
+        """Test a moderate limit costs almost nothing"""
+        freqs = self._fibonacci_frequencies(20)
+        optimal = code_lengths_from_frequencies(freqs)
+        
+        limited = code_lengths_from_frequencies(freqs, max_length=12)
+        
+        assert max(optimal.values()) == 19
+        assert self._cost(limited, freqs) <= self._cost(optimal, freqs) * 1.01
+    
+    def test_matches_exhaustive_search(self):
+        """Test package-merge finds the cheapest code within the limit"""
+        freqs = {'a': 1, 'b': 1, 'c': 2, 'd': 4, 'e': 9}
+        candidates = [
+            lengths for lengths in itertools.product(range(1, 4), repeat=5)
+            if sum(2 ** -length for length in lengths) <= 1
+        ]
+        best = min(sum(length * freq for length, freq in zip(lengths, freqs.values()))
+                   for lengths in candidates)
+        
+        limited = code_lengths_from_frequencies(freqs, max_length=3)
+        assert self._cost(limited, freqs) == best
+    
+    def test_unneeded_limit_keeps_optimal_lengths(self):
+        """Test a limit above the optimal depth changes nothing"""
+        freqs = {'a': 5, 'b': 2, 'c': 1, 'd': 1}
+        
+        assert (code_lengths_from_frequencies(freqs, 10)
+                == code_lengths_from_frequencies(freqs))
+    
+    def test_limit_too_short(self):
+        """Test a limit that cannot fit the alphabet is rejected"""
+        with pytest.raises(ValueError):
+            code_lengths_from_frequencies({'a': 1, 'b': 1, 'c': 1}, max_length=1)
+    
+    def test_huffman_coding_limit(self):
+        """Test HuffmanCoding honors max_code_length in encode and decode"""
+        freqs = self._fibonacci_frequencies(18)
+        text = "".join(char * count for char, count in freqs.items())
+        huffman = HuffmanCoding(max_code_length=10)
+        
+        encoded, freq_table = huffman.encode(text)
+        
+        assert max(huffman.code_lengths.values()) == 10
+        assert HuffmanCoding(max_code_length=10).decode(encoded, freq_table) == text
+        assert huffman.get_tree_structure()['frequency'] == len(text)
+    
+    def test_huffman_coding_limit_too_short(self):
+        """Test an alphabet too large for the limit fails to encode"""
+        with pytest.raises(ValueError):
+            HuffmanCoding(max_code_length=1).encode("abc")
+        with pytest.raises(DecodingError):
+            HuffmanCoding(max_code_length=1).decode("0", {'a': 1, 'b': 1, 'c': 1})
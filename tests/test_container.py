@@ -0,0 +1,312 @@
+"""Tests for the .huff container format and CLI"""
+
+import io
+import pytest
+from huffman.__main__ import main
+from huffman.container import (
+    MAGIC,
+    BlockContainerReader,
+    compress,
+    compress_blocks_stream,
+    decode_block,
+    encode_block,
+    compress_file,
+    compress_stream,
+    decompress,
+    decompress_file,
+    decompress_stream,
+    iter_compress_blocks,
+    iter_decompress,
+    ContainerHeader,
+    parse_header,
+)
+from huffman.coding import EncodingError, DecodingError
+
+
+@pytest.fixture
+def sample_bytes(sample_text):
+    """Sample binary data spanning several chunks"""
+    return (sample_text.encode('utf-8') + bytes(range(0, 256, 7))) * 50
+
+
+class TestContainer:
+    """Test in-memory and streaming container round-trips"""
+    
+    def test_roundtrip_in_memory(self, sample_bytes):
+        """Test compress then decompress returns original bytes"""
+        blob = compress(sample_bytes)
+        
+        assert blob.startswith(MAGIC)
+        assert len(blob) < len(sample_bytes)
+        assert decompress(blob) == sample_bytes
+    
+    def test_header_fields(self, sample_bytes):
+        """Test the header records length and payload size"""
+        blob = compress(sample_bytes)
+        header, pos = parse_header(blob)
+        
+        assert header.original_length == len(sample_bytes)
+        assert pos + header.payload_length == len(blob)
+    
+    def test_streaming_matches_in_memory(self, sample_bytes):
+        """Test small-chunk streaming produces the same container"""
+        dst = io.BytesIO()
+        stats = compress_stream(io.BytesIO(sample_bytes), dst, chunk_size=37)
+        
+        assert dst.getvalue() == compress(sample_bytes)
+        assert stats.compressed_size == len(dst.getvalue()) * 8
+        
+        out = io.BytesIO()
+        written = decompress_stream(io.BytesIO(dst.getvalue()), out, chunk_size=5)
+        assert written == len(sample_bytes)
+        assert out.getvalue() == sample_bytes
+    
+    def test_empty_input(self):
+        """Test empty input round-trips"""
+        assert decompress(compress(b"")) == b""
+        out = io.BytesIO()
+        compress_stream(io.BytesIO(b""), out)
+        assert decompress(out.getvalue()) == b""
+    
+    def test_bad_magic(self, sample_bytes):
+        """Test non-container data is rejected"""
+        with pytest.raises(DecodingError):
+            decompress(b"NOPE" + compress(sample_bytes)[4:])
+    
+    def test_unsupported_version(self, sample_bytes):
+        """Test unknown format versions are rejected"""
+        blob = bytearray(compress(sample_bytes))
+        blob[4] = 99
+        with pytest.raises(DecodingError):
+            decompress(bytes(blob))
+    
+    def test_corrupted_payload(self, sample_bytes):
+        """Test payload corruption is caught"""
+        blob = bytearray(compress(sample_bytes))
+        blob[-10] ^= 0xFF
+        with pytest.raises(DecodingError):
+            decompress(bytes(blob))
+    
+    def test_truncated_payload(self, sample_bytes):
+        """Test a truncated container is rejected"""
+        blob = compress(sample_bytes)
+        with pytest.raises(DecodingError):
+            decompress(blob[:-3])
+        with pytest.raises(DecodingError):
+            decompress_stream(io.BytesIO(blob[:-3]), io.BytesIO(), chunk_size=16)
+    
+    def test_truncated_payload_rejected_up_front(self, sample_bytes):
+        """Test a seekable truncated container fails before yielding output"""
+        blob = compress(sample_bytes)
+        pieces = iter_decompress(io.BytesIO(blob[:-3]), chunk_size=16)
+        with pytest.raises(DecodingError, match="Truncated"):
+            next(pieces)
+    
+    @pytest.mark.parametrize("lengths", [{65: 60, 66: 60}, {65: 1, 66: 1, 67: 1}])
+    def test_untrusted_code_lengths(self, lengths):
+        """Test overlong or oversubscribed headers fail before any table is built"""
+        code_lengths = [0] * 256
+        for byte, length in lengths.items():
+            code_lengths[byte] = length
+        blob = ContainerHeader(1, 0, 10, 0, 10, code_lengths).to_bytes() + bytes(8)
+        
+        with pytest.raises(DecodingError, match="Invalid code-length header"):
+            parse_header(blob)
+        with pytest.raises(DecodingError, match="Invalid code-length header"):
+            next(iter_decompress(io.BytesIO(blob)))
+    
+    def test_non_seekable_input(self):
+        """Test two-pass compression needs a seekable stream"""
+        class Pipe(io.RawIOBase):
+            def seekable(self):
+                return False
+        
+        with pytest.raises(EncodingError):
+            compress_stream(Pipe(), io.BytesIO())
+
+
+class TestBlockContainer:
+    """Test multi-block containers and parallel coding"""
+    
+    def _compress(self, data, block_size, workers=1):
+        dst = io.BytesIO()
+        compress_blocks_stream(io.BytesIO(data), dst, block_size, workers)
+        return dst.getvalue()
+    
+    def test_block_roundtrip(self, sample_bytes):
+        """Test a block container decodes through every entry point"""
+        blob = self._compress(sample_bytes, block_size=500)
+        
+        assert decompress(blob) == sample_bytes
+        out = io.BytesIO()
+        written = decompress_stream(io.BytesIO(blob), out, chunk_size=64)
+        assert written == len(sample_bytes)
+        assert out.getvalue() == sample_bytes
+    
+    def test_parallel_matches_serial(self, sample_bytes):
+        """Test the process pool writes the same container as in-process coding"""
+        serial = self._compress(sample_bytes, block_size=700)
+        parallel = self._compress(sample_bytes, block_size=700, workers=2)
+        
+        assert parallel == serial
+        out = io.BytesIO()
+        decompress_stream(io.BytesIO(parallel), out, workers=2)
+        assert out.getvalue() == sample_bytes
+    
+    def test_lazy_pieces_match_stream(self, sample_bytes):
+        """Test the iterators yield the same bytes as the stream functions"""
+        pieces = list(iter_compress_blocks(io.BytesIO(sample_bytes), block_size=500,
+                                           workers=1))
+        
+        assert b"".join(pieces) == self._compress(sample_bytes, block_size=500)
+        assert len(pieces) > 3
+        decoded = list(iter_decompress(io.BytesIO(b"".join(pieces)), chunk_size=64))
+        assert b"".join(decoded) == sample_bytes
+        assert len(decoded) > 1
+    
+    def test_empty_block_container(self):
+        """Test empty input produces a valid block container"""
+        assert decompress(self._compress(b"", block_size=10)) == b""
+    
+    def test_block_record(self):
+        """Test a single block record round-trips and is verified"""
+        record = encode_block(b"abracadabra")
+        assert decode_block(record) == b"abracadabra"
+        
+        corrupted = bytearray(record)
+        corrupted[-1] ^= 0x80
+        with pytest.raises(DecodingError):
+            decode_block(bytes(corrupted))
+        with pytest.raises(DecodingError):
+            decode_block(record[:-1])
+    
+    def test_bad_trailer(self, sample_bytes):
+        """Test a trailer that disagrees with the blocks is rejected"""
+        blob = bytearray(self._compress(sample_bytes, block_size=500))
+        blob[-5] ^= 0xFF
+        with pytest.raises(DecodingError):
+            decompress(bytes(blob))
+    
+    def test_truncated_blocks_rejected_up_front(self, sample_bytes):
+        """Test a seekable block container is checked before any block decodes"""
+        blob = self._compress(sample_bytes, block_size=500)
+        pieces = iter_decompress(io.BytesIO(blob[:-7]), chunk_size=64)
+        with pytest.raises(DecodingError, match="trailer"):
+            next(pieces)
+    
+    def test_invalid_block_size(self):
+        """Test block sizes must be positive"""
+        with pytest.raises(ValueError):
+            self._compress(b"abc", block_size=0)
+
+
+class TestBlockContainerReader:
+    """Test random access into block containers"""
+    
+    def _reader(self, data, block_size):
+        dst = io.BytesIO()
+        compress_blocks_stream(io.BytesIO(data), dst, block_size, workers=1)
+        return BlockContainerReader(io.BytesIO(dst.getvalue()))
+    
+    def test_decode_range(self, sample_bytes):
+        """Test arbitrary slices match the original"""
+        reader = self._reader(sample_bytes, block_size=256)
+        
+        assert len(reader) == len(sample_bytes)
+        assert reader.block_count == -(-len(sample_bytes) // 256)
+        spans = ((0, 1), (255, 257), (1000, 1800), (len(sample_bytes) - 5, 10 ** 9))
+        for start, stop in spans:
+            assert reader.decode_range(start, stop) == sample_bytes[start:stop]
+        assert reader.decode_range(10, 10) == b""
+    
+    def test_decode_range_reads_only_needed_blocks(self, sample_bytes):
+        """Test a small range touches only its own blocks"""
+        reader = self._reader(sample_bytes, block_size=256)
+        touched = []
+        original = reader.read_block
+        reader.read_block = lambda i: touched.append(i) or original(i)
+        
+        reader.decode_range(600, 700)
+        
+        assert touched == [2]
+    
+    def test_invalid_range(self, sample_bytes):
+        """Test negative or reversed ranges are rejected"""
+        reader = self._reader(sample_bytes, block_size=256)
+        with pytest.raises(ValueError):
+            reader.decode_range(5, 1)
+    
+    def test_single_table_container_rejected(self, sample_bytes):
+        """Test random access needs a block container"""
+        with pytest.raises(DecodingError):
+            BlockContainerReader(io.BytesIO(compress(sample_bytes)))
+    
+    def test_open_file(self, tmp_path, sample_bytes, capsysbinary):
+        """Test opening a container by path and the extract command"""
+        src = tmp_path / "input.bin"
+        src.write_bytes(sample_bytes)
+        compress_file(str(src), str(tmp_path / "b.huff"), block_size=128)
+        
+        with BlockContainerReader.open(str(tmp_path / "b.huff")) as reader:
+            assert reader.decode_range(300, 400) == sample_bytes[300:400]
+        
+        assert main(["extract", str(tmp_path / "b.huff"), "300", "400"]) == 0
+        assert capsysbinary.readouterr().out == sample_bytes[300:400]
+        assert main(["extract", str(src), "0", "1"]) == 1
+
+
+class TestFileCompression:
+    """Test file-level functions and the CLI"""
+    
+    def test_file_roundtrip(self, tmp_path, sample_bytes):
+        """Test compress_file/decompress_file round-trip"""
+        src = tmp_path / "input.log"
+        src.write_bytes(sample_bytes)
+        
+        compress_file(str(src), str(tmp_path / "input.huff"), chunk_size=64)
+        decompress_file(str(tmp_path / "input.huff"), str(tmp_path / "output.log"),
+                        chunk_size=64)
+        
+        assert (tmp_path / "output.log").read_bytes() == sample_bytes
+    
+    def test_corrupted_file_removes_output(self, tmp_path, sample_bytes):
+        """Test a failed decompression leaves no partial output"""
+        blob = bytearray(compress(sample_bytes))
+        blob[-10] ^= 0xFF
+        (tmp_path / "bad.huff").write_bytes(bytes(blob))
+        
+        with pytest.raises(DecodingError):
+            decompress_file(str(tmp_path / "bad.huff"), str(tmp_path / "out"))
+        assert not (tmp_path / "out").exists()
+    
+    def test_cli_roundtrip(self, tmp_path, sample_bytes, capsys):
+        """Test the python -m huffman entry point"""
+        src = tmp_path / "input.bin"
+        src.write_bytes(sample_bytes)
+        
+        assert main(["compress", str(src), str(tmp_path / "c.huff")]) == 0
+        assert main(["decompress", str(tmp_path / "c.huff"),
+                     str(tmp_path / "d.bin")]) == 0
+        assert (tmp_path / "d.bin").read_bytes() == sample_bytes
+        assert "saved" in capsys.readouterr().out
+    
+    def test_cli_block_container(self, tmp_path, sample_bytes):
+        """Test the CLI writes and reads block containers"""
+        src = tmp_path / "input.bin"
+        src.write_bytes(sample_bytes)
+        
+        assert main(["compress", str(src), str(tmp_path / "b.huff"),
+                     "--block-size", "300"]) == 0
+        assert main(["decompress", str(tmp_path / "b.huff"), str(tmp_path / "d.bin"),
+                     "-j", "2"]) == 0
+        assert (tmp_path / "d.bin").read_bytes() == sample_bytes
+        assert main(["decompress", str(tmp_path / "b.huff"), str(tmp_path / "e.bin"),
+                     "-j", "all"]) == 0
+        assert (tmp_path / "e.bin").read_bytes() == sample_bytes
+    
+    def test_cli_errors(self, tmp_path, capsys):
+        """Test CLI failures return a non-zero exit code"""
+        assert main(["compress", str(tmp_path / "missing"), str(tmp_path / "x")]) == 1
+        assert main(["compress", "a", "b", "--chunk-size", "0"]) == 2
+        assert main(["compress", "a", "b", "--jobs", "-1"]) == 2
+        assert "error" in capsys.readouterr().err
@@ -0,0 +1,78 @@
+"""Tests for the table-driven decoder"""
+
+import pytest
+from huffman.bitio import pack_bits
+from huffman.canonical import assign_canonical_codes
+from huffman.coding import HuffmanCoding, DecodingError
+from huffman.decoder import TableDecoder
+
+
+class TestTableDecoder:
+    """Test the TableDecoder class"""
+    
+    def test_decode_bit_string_codes(self, sample_text):
+        """Test decoding matches the tree-based codes for every table width"""
+        huffman = HuffmanCoding()
+        encoded, _ = huffman.encode(sample_text)
+        
+        for primary_bits in (1, 2, 4, 10):
+            decoder = TableDecoder(huffman.codes, primary_bits)
+            assert decoder.decode(pack_bits(encoded), len(encoded)) == sample_text
+    
+    def test_secondary_tables(self):
+        """Test codes longer than the primary window are resolved"""
+        # Skewed frequencies give a deep tree with long codes
+        text = "".join(chr(65 + i) * (2 ** i) for i in range(14))
+        huffman = HuffmanCoding()
+        packed, bit_length, _ = huffman.encode_packed(text)
+        decoder = TableDecoder(huffman.codes, primary_bits=4)
+        
+        assert decoder.max_code_length > decoder.primary_bits
+        assert decoder.decode(packed, bit_length) == text
+    
+    @pytest.mark.parametrize("primary_bits", [4, 10])
+    def test_very_long_codes_use_bounded_tables(self, primary_bits):
+        """Test codes of 1..40 bits chain small subtables instead of one huge one"""
+        lengths = {chr(65 + i): i + 1 for i in range(39)}
+        lengths["z"] = 40
+        codes = assign_canonical_codes(lengths)
+        decoder = TableDecoder(codes, primary_bits)
+        text = "".join(codes) * 3
+        bits = "".join(codes[char] for char in text)
+        
+        assert decoder.max_code_length == 40
+        # One 2**40 slot table would need terabytes
+        assert decoder.approximate_size < 1 << 20
+        assert decoder.decode(pack_bits(bits), len(bits)) == text
+        with pytest.raises(DecodingError):
+            decoder.decode(pack_bits(bits[:-1]), len(bits) - 1)
+    
+    def test_integer_symbols_decode_to_bytes(self):
+        """Test integer symbol tables produce bytes"""
+        decoder = TableDecoder({0: "0", 255: "10", 7: "11"})
+        
+        assert decoder.decode(pack_bits("010110"), 6) == bytes([0, 255, 7, 0])
+    
+    def test_invalid_sequence(self):
+        """Test bit patterns with no code are rejected"""
+        decoder = TableDecoder({"A": "0"})
+        
+        with pytest.raises(DecodingError):
+            decoder.decode(pack_bits("0100"), 4)
+    
+    def test_incomplete_sequence(self):
+        """Test a trailing partial code is rejected"""
+        decoder = TableDecoder({"A": "0", "B": "10", "C": "11"})
+        
+        with pytest.raises(DecodingError):
+            decoder.decode(pack_bits("01"), 2)
+    
+    def test_prefix_conflict(self):
+        """Test a code table that is not prefix-free is rejected"""
+        with pytest.raises(ValueError):
+            TableDecoder({"A": "0", "B": "01"})
+    
+    def test_empty_code_table(self):
+        """Test an empty code table is rejected"""
+        with pytest.raises(ValueError):
+            TableDecoder({})
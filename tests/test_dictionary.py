@@ -0,0 +1,88 @@
+"""Tests for trained static dictionaries"""
+
+import pytest
+from huffman.dictionary import HuffmanDictionary, decode_message, message_dictionary_id
+from huffman.exceptions import DecodingError
+
+SAMPLES = ["GET /api/users HTTP/1.1", "POST /api/orders HTTP/1.1",
+           "GET /api/orders/42 HTTP/1.1"]
+
+
+@pytest.fixture
+def dictionary():
+    """Dictionary trained on request lines"""
+    return HuffmanDictionary.train(SAMPLES)
+
+
+class TestHuffmanDictionary:
+    """Test training, encoding and decoding against a dictionary"""
+
+    @pytest.mark.parametrize("text", ["GET /api/users/7 HTTP/1.1", "", "G"])
+    def test_round_trip(self, dictionary, text):
+        """Test messages made of trained characters round-trip"""
+        assert dictionary.decode(dictionary.encode(text)) == text
+
+    def test_escaped_characters(self, dictionary):
+        """Test characters missing from the dictionary are escaped"""
+        text = "GET /café/\U0001F600 " + dictionary.escape
+
+        message = dictionary.encode(text)
+
+        assert dictionary.decode(message) == text
+
+    def test_message_smaller_than_table(self, dictionary):
+        """Test short messages carry only a few header bytes"""
+        text = "GET /api/orders HTTP/1.1"
+
+        assert len(dictionary.encode(text)) < len(text)
+
+    def test_serialization_round_trip(self, dictionary, tmp_path):
+        """Test a saved dictionary decodes messages of the original"""
+        path = tmp_path / "requests.hdic"
+        dictionary.save(str(path))
+        loaded = HuffmanDictionary.load(str(path))
+
+        assert loaded.dict_id == dictionary.dict_id
+        assert loaded.codes == dictionary.codes
+        assert loaded.decode(dictionary.encode("POST /api")) == "POST /api"
+
+    def test_explicit_id(self):
+        """Test an explicit dictionary ID is carried by messages"""
+        dictionary = HuffmanDictionary.train(SAMPLES, dict_id=7)
+
+        assert message_dictionary_id(dictionary.encode("GET")) == 7
+
+    def test_decode_message_selects_dictionary(self, dictionary):
+        """Test messages are routed to the dictionary they name"""
+        other = HuffmanDictionary.train(["0123456789"], dict_id=1)
+        dictionaries = {dictionary.dict_id: dictionary, other.dict_id: other}
+
+        assert decode_message(other.encode("2024"), dictionaries) == "2024"
+        assert decode_message(dictionary.encode("GET /"), dictionaries) == "GET /"
+        with pytest.raises(DecodingError):
+            decode_message(dictionary.encode("GET"), {other.dict_id: other})
+
+    def test_wrong_dictionary(self, dictionary):
+        """Test decoding with another dictionary is rejected"""
+        other = HuffmanDictionary.train(["abc"], dict_id=dictionary.dict_id ^ 1)
+
+        with pytest.raises(DecodingError):
+            other.decode(dictionary.encode("GET"))
+
+    @pytest.mark.parametrize("data", [b"", b"\x80", b"NOPE" + bytes(12)])
+    def test_invalid_dictionary_bytes(self, data):
+        """Test malformed dictionaries are rejected"""
+        with pytest.raises(DecodingError):
+            HuffmanDictionary.from_bytes(data)
+
+    def test_truncated_message(self, dictionary):
+        """Test truncated messages are rejected"""
+        message = dictionary.encode("GET /api/users")
+
+        with pytest.raises(DecodingError):
+            dictionary.decode(message[:-1])
+
+    def test_empty_training_set(self):
+        """Test training requires some text"""
+        with pytest.raises(ValueError):
+            HuffmanDictionary.train(["", ""])
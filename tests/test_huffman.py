@@ -1,7 +1,7 @@
 """Tests for the Huffman coding core functionality"""
 
 import pytest
-from huffman.coding import HuffmanCoding, EncodingError, DecodingError
+from huffman.coding import HuffmanCoding, EncodingError, DecodingError, SeekIndex
 from huffman.node import Node
 
 
@@ -122,6 +122,114 @@ class TestHuffmanCoding:
             huffman.decode(incomplete, freq_table)
 
 
+class TestSeekIndex:
+    """Test checkpoint-based range decoding"""
+    
+    def test_decode_range_bit_string(self, sample_text):
+        """Test slices decode from a binary string"""
+        text = sample_text * 20
+        huffman = HuffmanCoding()
+        encoded, freq_table = huffman.encode(text)
+        index = huffman.build_seek_index(text, interval=16)
+        
+        assert index.offsets[0] == 0
+        spans = ((0, 5), (17, 90), (100, 101), (len(text) - 3, len(text) + 10))
+        for start, stop in spans:
+            decoded = huffman.decode_range(encoded, start, stop, index, freq_table)
+            assert decoded == text[start:stop]
+    
+    def test_decode_range_packed(self, sample_text):
+        """Test slices decode from packed bytes at unaligned offsets"""
+        text = sample_text * 20
+        huffman = HuffmanCoding(canonical=True)
+        packed, bit_length, _ = huffman.encode_packed(text)
+        index = huffman.build_seek_index(text, interval=7)
+        
+        decoded = huffman.decode_range(packed, 50, 75, index,
+                                       code_lengths=huffman.code_lengths,
+                                       bit_length=bit_length)
+        assert decoded == text[50:75]
+    
+    def test_span(self):
+        """Test checkpoint selection around a range"""
+        index = SeekIndex(interval=10, offsets=[0, 30, 55])
+        
+        assert index.span(12, 18, 80) == (10, 30, 55)
+        assert index.span(21, 29, 80) == (20, 55, 80)
+    
+    def test_invalid_arguments(self, sample_text):
+        """Test invalid ranges and intervals are rejected"""
+        huffman = HuffmanCoding()
+        encoded, freq_table = huffman.encode(sample_text)
+        index = huffman.build_seek_index(sample_text, interval=4)
+        
+        with pytest.raises(ValueError):
+            huffman.build_seek_index(sample_text, interval=0)
+        with pytest.raises(ValueError):
+            huffman.decode_range(encoded, 5, 2, index, freq_table)
+        with pytest.raises(ValueError):
+            huffman.decode_range(b"\x00", 0, 2, index, freq_table)
+        with pytest.raises(EncodingError):
+            huffman.build_seek_index("???", interval=4)
+        assert huffman.decode_range(encoded, 3, 3, index, freq_table) == ""
+
+
+class TestBatchCoding:
+    """Test encoding and decoding many items per call"""
+    
+    TEXTS = ["GET /users", "POST /orders", "GET /users", "DELETE /orders/7"]
+    
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_per_item_tables(self, workers):
+        """Test each item matches a separate encode and round-trips"""
+        huffman = HuffmanCoding(canonical=True)
+        
+        results = huffman.encode_many(self.TEXTS, workers=workers)
+        
+        assert results == [HuffmanCoding(canonical=True).encode(text)
+                           for text in self.TEXTS]
+        encoded, freq_tables = zip(*results)
+        assert huffman.decode_many(encoded, freq_tables, workers=workers) == self.TEXTS
+        assert huffman.codes == {}
+    
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_shared_table(self, workers):
+        """Test one table codes the whole batch and is left on the instance"""
+        huffman = HuffmanCoding(canonical=True)
+        
+        results = huffman.encode_many(self.TEXTS, shared=True, workers=workers)
+        
+        assert len({id(freq_table) for _, freq_table in results}) == 1
+        assert sum(results[0][1].values()) == sum(map(len, self.TEXTS))
+        encoded = [bits for bits, _ in results]
+        decoded = HuffmanCoding().decode_many(encoded,
+                                              code_lengths=huffman.code_lengths,
+                                              workers=workers)
+        assert decoded == self.TEXTS
+    
+    def test_errors_name_the_item(self):
+        """Test failures report which item was bad"""
+        huffman = HuffmanCoding()
+        encoded, freq_table = huffman.encode("abc")
+        
+        with pytest.raises(ValueError, match="Item 1"):
+            huffman.encode_many(["abc", ""])
+        with pytest.raises(ValueError, match="Item 1"):
+            huffman.encode_many(["abc", ""], shared=True)
+        with pytest.raises(DecodingError, match="Item 1"):
+            huffman.decode_many([encoded, "102"], freq_table)
+        with pytest.raises(ValueError):
+            huffman.decode_many([encoded], [freq_table, freq_table])
+    
+    def test_code_lengths_for(self):
+        """Test lengths match what encode assigns for the same table"""
+        huffman = HuffmanCoding(canonical=True)
+        _, freq_table = huffman.encode("abracadabra")
+        
+        lengths = HuffmanCoding(canonical=True).code_lengths_for(freq_table)
+        assert lengths == huffman.code_lengths
+
+
 class TestHuffmanTreeVisualization:
     """Test the Huffman tree visualization functionality"""
     
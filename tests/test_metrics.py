@@ -0,0 +1,157 @@
+"""Tests for metrics collection and the /metrics endpoint"""
+
+import json
+import os
+
+import pytest
+from huffman import metrics
+from huffman.coding import DecodingError, HuffmanCoding
+from huffman.metrics import Counter, Histogram, Registry, STAGE_SECONDS
+
+
+@pytest.fixture
+def recording():
+    """Enable metrics with a clean registry, disabling them afterwards"""
+    metrics.REGISTRY.reset()
+    metrics.enable()
+    yield metrics.REGISTRY
+    metrics.disable()
+    metrics.REGISTRY.reset()
+
+
+class TestMetricTypes:
+    """Test counters, histograms and the exposition format"""
+
+    def test_render(self, recording):
+        """Test samples render in the text exposition format"""
+        registry = Registry()
+        requests = registry.register(Counter('requests_total', 'Requests', ('path',)))
+        latency = registry.register(Histogram('latency_seconds', 'Latency', (0.1, 1.0)))
+        requests.inc(('/a"b',), 2)
+        latency.observe(0.05)
+        latency.observe(0.5)
+
+        text = registry.render()
+
+        assert '# TYPE requests_total counter' in text
+        assert 'requests_total{path="/a\\"b"} 2' in text
+        assert 'latency_seconds_bucket{le="0.1"} 1' in text
+        assert 'latency_seconds_bucket{le="+Inf"} 2' in text
+        assert 'latency_seconds_sum 0.55' in text
+        assert 'latency_seconds_count 2' in text
+
+    def test_disabled_records_nothing(self):
+        """Test updates are dropped and timers are shared no-ops while disabled"""
+        counter = Counter('dropped_total', 'Dropped')
+        counter.inc()
+
+        assert counter.value() == 0
+        timer = metrics.time(STAGE_SECONDS, 'encode')
+        assert timer is metrics.time(STAGE_SECONDS, 'decode')
+
+    def test_duplicate_name(self):
+        """Test metric names are unique within a registry"""
+        registry = Registry()
+        registry.register(Counter('x_total', 'X'))
+        with pytest.raises(ValueError):
+            registry.register(Counter('x_total', 'X'))
+
+    def test_snapshot_merge(self, recording):
+        """Test values recorded in one registry add up in another"""
+        source, target = Registry(), Registry()
+        for registry in (source, target):
+            registry.register(Counter('jobs_total', 'Jobs', ('kind',)))
+            registry.register(Histogram('job_seconds', 'Job time', (0.1, 1.0)))
+        source.get('jobs_total').inc(('a',), 2)
+        source.get('job_seconds').observe(0.5)
+        target.get('job_seconds').observe(2.0)
+
+        target.merge(source.snapshot())
+        target.merge({'unknown_total': {(): 1}})
+
+        assert target.get('jobs_total').value(('a',)) == 2
+        assert target.get('job_seconds').count() == 2
+        assert 'job_seconds_sum 2.5' in target.render()
+
+
+class TestCodecMetrics:
+    """Test HuffmanCoding reports its stages"""
+
+    def test_stages_recorded(self, recording, sample_text):
+        """Test every codec stage of an encode/decode is timed"""
+        huffman = HuffmanCoding()
+        encoded, freq_table = huffman.encode(sample_text)
+        huffman.decode(encoded, freq_table)
+
+        for stage in ('frequency_count', 'tree_build', 'code_generation', 'encode',
+                      'decode'):
+            assert STAGE_SECONDS.count((stage,)) >= 1, stage
+        assert metrics.SYMBOLS.value(('encode',)) == len(sample_text)
+        assert metrics.PAYLOAD_BITS.value(('decode',)) == len(encoded)
+        assert metrics.ALPHABET_SIZE.count() == 1
+
+    def test_errors_counted(self, recording):
+        """Test failed calls are counted per operation"""
+        with pytest.raises(DecodingError):
+            HuffmanCoding().decode('012', {'a': 1, 'b': 1})
+
+        assert metrics.ERRORS.value(('decode',)) == 1
+
+
+class TestMetricsEndpoint:
+    """Test the HTTP side of metrics"""
+
+    def test_disabled_endpoint(self, client):
+        """Test /metrics is hidden while metrics are disabled"""
+        assert client.get('/metrics').status_code == 404
+
+    def test_exposition(self, recording, client, sample_text):
+        """Test requests and JSON serialization show up in /metrics"""
+        client.post('/encode', json={'text': sample_text, 'mode': 'lean'})
+
+        response = client.get('/metrics')
+
+        assert response.status_code == 200
+        assert response.content_type.startswith('text/plain; version=0.0.4')
+        text = response.get_data(as_text=True)
+        assert ('http_requests_total{endpoint="/encode",method="POST",status="200"} 1'
+                in text)
+        assert 'huffman_stage_seconds_count{stage="json_serialization"}' in text
+        assert 'http_request_bytes_total{endpoint="/encode"}' in text
+
+    def test_shared_across_processes(self, recording, client, tmp_path):
+        """Test /metrics sums the values every sharing process published"""
+        row = [0.0] * (len(STAGE_SECONDS.buckets) + 2)
+        row[0], row[-1] = 3, 0.0001
+        other = {'huffman_stage_seconds': [[['encode'], row]],
+                 'huffman_symbols_total': [[['encode'], 40]]}
+        (tmp_path / '1.json').write_text(json.dumps(other))
+        metrics.SYMBOLS.inc(('encode',), 2)
+
+        metrics.share(str(tmp_path), interval=3600)
+        try:
+            text = client.get('/metrics').get_data(as_text=True)
+            metrics.flush()
+            published = json.loads((tmp_path / f'{os.getpid()}.json').read_text())
+        finally:
+            metrics.stop_sharing()
+
+        assert 'huffman_symbols_total{operation="encode"} 42' in text
+        assert 'huffman_stage_seconds_count{stage="encode"} 3' in text
+        assert published['huffman_symbols_total'] == [[['encode'], 2]]
+        assert 'huffman_symbols_total{operation="encode"} 2' in metrics.render()
+
+        metrics.clear_shared(str(tmp_path))
+        assert list(tmp_path.iterdir()) == []
+
+    def test_offloaded_jobs_counted(self, recording, app, client, sample_text):
+        """Test stage timings of jobs run in the offload pool reach /metrics"""
+        app.config.update(OFFLOAD_WORKERS=1, OFFLOAD_MIN_SIZE=0)
+        try:
+            client.post('/encode', json={'text': sample_text, 'mode': 'lean'})
+            assert app.extensions['codec_pool']._executor is not None
+        finally:
+            app.extensions['codec_pool'].shutdown()
+
+        assert STAGE_SECONDS.count(('encode',)) == 1
+        assert metrics.SYMBOLS.value(('encode',)) == len(sample_text)
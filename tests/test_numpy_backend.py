@@ -0,0 +1,155 @@
+"""Tests for the optional NumPy backend"""
+
+import random
+import tracemalloc
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+# Imported after the skip so the module is only loaded with numpy present
+from huffman import numpy_backend  # noqa: E402
+from huffman.bitio import BitWriter  # noqa: E402
+from huffman.canonical import (  # noqa: E402
+    assign_canonical_codes,
+    code_lengths_from_frequencies,
+)
+from huffman.coding import HuffmanCoding, DecodingError  # noqa: E402
+from huffman.decoder import TableDecoder  # noqa: E402
+
+
+def _pack(codes, text):
+    writer = BitWriter()
+    writer.write_bits("".join(codes[char] for char in text))
+    return writer.getvalue(), writer.bit_length
+
+
+class TestNumpyBackend:
+    """Test the numpy backend matches the pure-Python one"""
+
+    @pytest.mark.parametrize("text", [
+        "HELLO WORLD",
+        "aaaa",
+        "mixed 日本語 text with emoji \U0001F600 " * 500,
+    ])
+    @pytest.mark.parametrize("canonical", [False, True])
+    def test_identical_output(self, text, canonical):
+        """Test both backends produce the same bits and tables"""
+        python = HuffmanCoding(canonical=canonical)
+        vectorized = HuffmanCoding(canonical=canonical, backend="numpy")
+
+        assert vectorized.encode(text) == python.encode(text)
+        assert vectorized.encode_packed(text) == python.encode_packed(text)
+        freq_table = python.build_frequency_table(text)
+        assert list(vectorized.build_frequency_table(text).items()) == \
+            list(freq_table.items())
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_small_chunks(self, seed, monkeypatch):
+        """Test chunked counting and packing across many chunk boundaries"""
+        monkeypatch.setattr(numpy_backend, "_ENCODE_CHUNK", 7)
+        monkeypatch.setattr(numpy_backend, "_PACK_CHUNK", 5)
+        rng = random.Random(seed)
+        # Later chunks bring new characters, seen an even number of times
+        text = "".join(rng.choice("ab") for _ in range(50))
+        text += "ccdd\U0001F600\U0001F600" * 3
+        python = HuffmanCoding()
+        vectorized = HuffmanCoding(backend="numpy")
+
+        assert list(vectorized.build_frequency_table(text).items()) == \
+            list(python.build_frequency_table(text).items())
+        assert vectorized.encode(text) == python.encode(text)
+        assert vectorized.encode_packed(text) == python.encode_packed(text)
+
+    def test_packed_memory_bounded(self, monkeypatch):
+        """Test packing never holds a byte per output bit"""
+        # Small chunks leave only the memory that grows with the input
+        monkeypatch.setattr(numpy_backend, "_ENCODE_CHUNK", 1 << 12)
+        monkeypatch.setattr(numpy_backend, "_PACK_CHUNK", 1 << 12)
+        text = "".join(random.Random(0).choices("abcdefghij", k=1 << 20))
+        huffman = HuffmanCoding(backend="numpy")
+        huffman.encode_packed(text[:100])
+
+        tracemalloc.start()
+        try:
+            _, bit_length, _ = huffman.encode_packed(text)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        assert peak < bit_length / 2
+
+    def test_round_trip(self, sample_text):
+        """Test encoding and decoding with the numpy backend"""
+        huffman = HuffmanCoding(backend="numpy")
+        text = sample_text * 1000
+
+        encoded, freq_table = huffman.encode(text)
+        packed, bit_length, _ = huffman.encode_packed(text)
+
+        assert huffman.decode(encoded, freq_table) == text
+        assert huffman.decode_packed(packed, bit_length, freq_table) == text
+
+    def test_invalid_packed_stream(self):
+        """Test truncated streams raise like the pure-Python decoder"""
+        huffman = HuffmanCoding(backend="numpy")
+        packed, bit_length, freq_table = huffman.encode_packed("abcabd" * 2000)
+
+        with pytest.raises(DecodingError):
+            huffman.decode_packed(packed, bit_length - 1, freq_table)
+
+    def test_unknown_backend(self):
+        """Test unknown backend names are rejected"""
+        with pytest.raises(ValueError):
+            HuffmanCoding(backend="fortran")
+
+
+class TestNumpyDecoder:
+    """Test the lock-step segment decoder against the table decoder"""
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_random_codes(self, seed, monkeypatch):
+        """Test random alphabets, including ones that resynchronize slowly"""
+        monkeypatch.setattr(numpy_backend, "_SEGMENT_BITS", 64)
+        rng = random.Random(seed)
+        freqs = {chr(97 + i): rng.choice([1, 2, 5, 50, 1000])
+                 for i in range(rng.randint(2, 30))}
+        codes = assign_canonical_codes(code_lengths_from_frequencies(freqs))
+        text = "".join(rng.choices(list(freqs), list(freqs.values()),
+                                   k=rng.randint(1, 5000)))
+        data, bit_length = _pack(codes, text)
+        decoder = numpy_backend.NumpyDecoder(codes)
+
+        assert decoder.decode(data, bit_length) == text
+        for cut in (rng.randint(0, bit_length), bit_length - 1):
+            try:
+                expected = TableDecoder(codes).decode(data, cut)
+            except DecodingError:
+                with pytest.raises(DecodingError):
+                    decoder.decode(data, cut)
+            else:
+                assert decoder.decode(data, cut) == expected
+
+    def test_fixed_length_codes(self):
+        """Test equal-length codes, which never resynchronize"""
+        codes = {'a': '00', 'b': '01', 'c': '10'}
+        decoder = numpy_backend.NumpyDecoder(codes)
+
+        assert decoder.decode(*_pack(codes, "abcab" * 100)) == "abcab" * 100
+        with pytest.raises(DecodingError):
+            decoder.decode(b"\xff", 2)
+        with pytest.raises(DecodingError):
+            decoder.decode(b"\x00", 3)
+
+    def test_invalid_code(self):
+        """Test a bit pattern outside an incomplete code is rejected"""
+        decoder = numpy_backend.NumpyDecoder({'a': '0', 'b': '10'})
+
+        with pytest.raises(DecodingError, match="Invalid"):
+            decoder.decode(b"\xc0", 2)
+
+    def test_codes_too_long(self):
+        """Test codes beyond the flat table width are refused"""
+        codes = {'a': '0' * 21, 'b': '1'}
+        with pytest.raises(ValueError):
+            numpy_backend.NumpyDecoder(codes)
@@ -0,0 +1,77 @@
+"""Tests for the bounded codec offload pool"""
+
+import time
+
+import pytest
+from app.offload import CodecPool, JobTimeout, PoolOverloaded
+
+
+@pytest.fixture
+def pool():
+    """Single-worker pool that offloads everything"""
+    pool = CodecPool(workers=1, min_size=0, max_pending=1, timeout=5)
+    yield pool
+    pool.shutdown()
+
+
+class TestCodecPool:
+    """Test inline dispatch, back-pressure and timeouts"""
+
+    def test_small_jobs_run_inline(self):
+        """Test inputs below the threshold never start the pool"""
+        pool = CodecPool(workers=1, min_size=100)
+
+        assert pool.run(len, 10, "abc") == 3
+        assert pool._executor is None
+
+    def test_large_jobs_run_in_pool(self, pool):
+        """Test offloaded results and errors come back to the caller"""
+        assert pool.run(sorted, 3, "cab") == ['a', 'b', 'c']
+        with pytest.raises(ValueError):
+            pool.run(int, 3, "x")
+
+    def test_zero_workers_run_inline(self):
+        """Test 0 keeps every job on the calling thread, as in map_ordered"""
+        pool = CodecPool(workers=0, min_size=0)
+
+        assert not pool.enabled
+        assert pool.run(len, 10 ** 9, "abc") == 3
+        assert pool._executor is None
+
+    def test_none_uses_every_cpu(self):
+        """Test None sizes the pool by CPU count"""
+        assert CodecPool(workers=None).enabled
+
+    def test_timeout_and_back_pressure(self, pool):
+        """Test slow jobs time out and hold their slot until done"""
+        pool._timeout = 0.2
+        with pytest.raises(JobTimeout):
+            pool.run(time.sleep, 1, 1)
+        with pytest.raises(PoolOverloaded):
+            pool.run(len, 1, "abc")
+
+
+class TestOffloadedRoutes:
+    """Test the JSON routes through the pool"""
+
+    def test_encode_decode_offloaded(self, app, client, sample_text):
+        """Test offloaded requests give the same responses as inline ones"""
+        inline = client.post('/encode', json={'text': sample_text}).get_json()
+        app.config.update(OFFLOAD_WORKERS=1, OFFLOAD_MIN_SIZE=0)
+
+        offloaded = client.post('/encode', json={'text': sample_text}).get_json()
+        decoded = client.post('/decode', json=offloaded).get_json()
+
+        assert offloaded == inline
+        assert decoded['decoded'] == sample_text
+        app.extensions['codec_pool'].shutdown()
+
+    def test_busy_pool_returns_503(self, app, client):
+        """Test a full pool refuses work with Retry-After"""
+        app.extensions['codec_pool'] = CodecPool(workers=1, min_size=0, max_pending=1)
+        app.extensions['codec_pool']._slots.acquire()
+
+        response = client.post('/encode', json={'text': 'abc'})
+
+        assert response.status_code == 503
+        assert response.headers['Retry-After'] == '1'
@@ -0,0 +1,47 @@
+"""Tests for the shared order-preserving process pool"""
+
+import pytest
+from huffman import parallel
+from huffman.parallel import map_ordered, resolve_workers, runs_inline
+
+
+@pytest.fixture(autouse=True)
+def fresh_pools():
+    """Start and stop the shared executors around each test"""
+    parallel.shutdown()
+    yield
+    parallel.shutdown()
+
+
+class TestMapOrdered:
+    """Test worker counts and executor reuse"""
+
+    @pytest.mark.parametrize("workers", [0, 1])
+    def test_small_counts_run_inline(self, workers):
+        """Test 0 and 1 workers call unpicklable functions in this process"""
+        assert list(map_ordered(lambda x: x * 2, range(5), workers)) == [0, 2, 4, 6, 8]
+        assert not parallel._pools
+
+    def test_worker_counts(self):
+        """Test None means every CPU and 0 means no process"""
+        assert resolve_workers(None) >= 1
+        assert resolve_workers(0) == 0
+        assert runs_inline(0) and runs_inline(1) and not runs_inline(2)
+        with pytest.raises(ValueError):
+            resolve_workers(-1)
+
+    def test_pool_reused_across_calls(self):
+        """Test later calls share the processes started by the first one"""
+        assert list(map_ordered(abs, range(-6, 0), 2)) == [6, 5, 4, 3, 2, 1]
+        pool = parallel._pools[2]
+
+        assert list(map_ordered(abs, [-1, -2], 2)) == [1, 2]
+        assert parallel._pools[2] is pool
+
+    def test_abandoned_iterator_cancels_pending(self):
+        """Test closing an iterator early leaves the shared pool usable"""
+        results = map_ordered(abs, range(-100, 0), 2)
+        assert next(results) == 100
+        results.close()
+
+        assert list(map_ordered(abs, [-3], 2)) == [3]
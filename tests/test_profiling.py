@@ -0,0 +1,173 @@
+"""Tests for per-stage profiling and the debug profile header"""
+
+import json
+import threading
+import tracemalloc
+
+import pytest
+from huffman import profiling
+from huffman.coding import HuffmanCoding
+from huffman.profiling import profile
+
+
+class TestProfile:
+    """Test profiles of HuffmanCoding calls"""
+
+    def test_encode_stages(self, sample_text):
+        """Test an encode reports its stages nested under the call"""
+        huffman = HuffmanCoding()
+
+        with profile() as report:
+            encoded, _ = huffman.encode(sample_text)
+            huffman.get_tree_structure()
+
+        assert list(report.stages) == [
+            'encode.frequency_count', 'encode.tree_build', 'encode.code_generation',
+            'encode.bit_packing', 'encode', 'tree_layout',
+        ]
+        assert report.stages['encode'].calls == 1
+        assert report.stages['encode'].peak_bytes > 0
+        assert report.total_nanoseconds >= report.stages['encode'].nanoseconds
+        assert report.counts == {
+            'nodes_created': 2 * len(set(sample_text)) - 1,
+            'symbols': len(sample_text),
+            'bits_emitted': len(encoded),
+        }
+
+    def test_decode_counts(self, sample_text):
+        """Test repeated calls accumulate and decodes are counted"""
+        huffman = HuffmanCoding()
+        packed, bit_length, freq_table = huffman.encode_packed(sample_text)
+
+        with profile(memory=False) as report:
+            for _ in range(3):
+                huffman.decode_packed(packed, bit_length, freq_table)
+
+        assert report.stages['decode'].calls == 3
+        assert report.stages['decode.symbol_decode'].calls == 3
+        assert report.stages['decode'].allocated_bytes is None
+        assert report.counts['symbols_decoded'] == 3 * len(sample_text)
+        assert report.counts['bits_consumed'] == 3 * bit_length
+
+    def test_sink_and_failure(self):
+        """Test the sink gets the profile even when the block raises"""
+        received = []
+
+        with pytest.raises(ValueError):
+            with profile(sink=received.append):
+                HuffmanCoding().encode("")
+
+        assert len(received) == 1
+        assert 'encode' in received[0].stages
+        assert not profiling.is_active()
+        assert not tracemalloc.is_tracing()
+
+    def test_json_sink(self, sample_text):
+        """Test the JSON sink writes one parseable line"""
+        lines = []
+
+        with profile(sink=profiling.json_sink(lines.append), memory=False):
+            HuffmanCoding().encode(sample_text)
+
+        data = json.loads(lines[0])
+        assert data['stages']['encode']['calls'] == 1
+        assert data['counts']['symbols'] == len(sample_text)
+
+    def test_inactive(self, sample_text):
+        """Test nothing is recorded outside a profile"""
+        profiling.count(symbols=1)
+        HuffmanCoding().encode(sample_text)
+
+        assert not profiling.is_active()
+
+    def test_format(self, sample_text):
+        """Test the text table and Server-Timing rendering"""
+        with profile() as report:
+            HuffmanCoding().encode(sample_text)
+
+        assert 'encode.tree_build' in report.format()
+        assert report.server_timing().startswith('encode.frequency_count;dur=')
+
+    def test_concurrent_memory_profiles(self, sample_text):
+        """Test overlapping profiles share tracing and drop memory figures"""
+        entered, joined, first_done = (threading.Event(), threading.Event(),
+                                       threading.Event())
+        reports = {}
+
+        def first():
+            with profile() as report:
+                entered.set()
+                HuffmanCoding().encode(sample_text)
+                joined.wait(5)
+            reports['first'] = report
+            first_done.set()
+
+        def second():
+            entered.wait(5)
+            with profile() as report:
+                joined.set()
+                first_done.wait(5)
+                # The first profile ending must not stop tracing under this one
+                reports['tracing'] = tracemalloc.is_tracing()
+                HuffmanCoding().encode(sample_text)
+            reports['second'] = report
+
+        threads = [threading.Thread(target=first), threading.Thread(target=second)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+
+        assert reports['tracing']
+        assert not tracemalloc.is_tracing()
+        for name in ('first', 'second'):
+            report = reports[name]
+            assert report.memory_unavailable
+            assert report.stages['encode'].calls == 1
+            assert report.stages['encode'].peak_bytes is None
+            assert report.to_dict()['memory_unavailable'] is True
+
+        with profile() as report:
+            HuffmanCoding().encode(sample_text)
+        assert not report.memory_unavailable
+        assert report.stages['encode'].peak_bytes > 0
+
+
+class TestProfileHeader:
+    """Test the X-Huffman-Profile debug header"""
+
+    def test_breakdown_returned(self, app, client):
+        """Test a profiled request returns its stages in the headers"""
+        app.config['PROFILING_ENABLED'] = True
+        # A table no other test encodes, so the shared cache cannot skip the build
+        text = "profiled request \u2603"
+
+        response = client.post('/encode', json={'text': text},
+                               headers={'X-Huffman-Profile': '1'})
+
+        assert response.status_code == 200
+        data = json.loads(response.headers['X-Huffman-Profile'])
+        assert 'encode.tree_build' in data['stages']
+        assert 'json_serialization' in data['stages']
+        assert data['counts']['symbols'] == len(text)
+        assert 'encode;dur=' in response.headers['Server-Timing']
+
+    def test_sink(self, app, client, sample_text):
+        """Test the configured sink receives request profiles"""
+        received = []
+        app.config.update(PROFILING_ENABLED=True, PROFILING_SINK=received.append)
+
+        client.post('/encode', json={'text': sample_text},
+                    headers={'X-Huffman-Profile': 'time'})
+
+        assert len(received) == 1
+        assert received[0].stages['encode'].allocated_bytes is None
+
+    def test_disabled(self, client, sample_text):
+        """Test the header is ignored unless profiling is enabled"""
+        response = client.post('/encode', json={'text': sample_text},
+                               headers={'X-Huffman-Profile': '1'})
+
+        assert response.status_code == 200
+        assert 'X-Huffman-Profile' not in response.headers
+        assert 'Server-Timing' not in response.headers
@@ -0,0 +1,121 @@
+"""Tests for incremental encoding and decoding"""
+
+import io
+import pytest
+from huffman.coding import HuffmanCoding, EncodingError, DecodingError
+from huffman.streaming import (
+    HuffmanDecoder,
+    HuffmanEncoder,
+    count_frequencies,
+    iter_decode,
+    iter_encode,
+)
+
+
+@pytest.fixture
+def long_text(sample_text):
+    """Text long enough to span many chunks"""
+    return (sample_text + " ünïcødé ✓\n") * 200
+
+
+class TestHuffmanEncoder:
+    """Test the HuffmanEncoder class"""
+    
+    def test_chunked_output_matches_one_shot(self, long_text):
+        """Test chunked encoding produces the same bits as encode_packed"""
+        huffman = HuffmanCoding(canonical=True)
+        packed, bit_length, freq_table = huffman.encode_packed(long_text)
+        
+        encoder = HuffmanEncoder.from_code_lengths(huffman.code_lengths)
+        parts = [encoder.update(long_text[i:i + 13])
+                 for i in range(0, len(long_text), 13)]
+        parts.append(encoder.flush())
+        
+        assert b"".join(parts) == packed
+        assert encoder.bit_length == bit_length
+    
+    def test_missing_symbol(self):
+        """Test symbols without codes are rejected"""
+        encoder = HuffmanEncoder({'a': '0', 'b': '1'})
+        with pytest.raises(EncodingError):
+            encoder.update("abc")
+    
+    def test_update_after_flush(self):
+        """Test the encoder cannot be reused after flush"""
+        encoder = HuffmanEncoder({'a': '0', 'b': '1'})
+        encoder.flush()
+        with pytest.raises(EncodingError):
+            encoder.update("a")
+    
+    def test_byte_symbols(self):
+        """Test integer code tables encode binary chunks"""
+        encoder = HuffmanEncoder.from_frequencies({0: 5, 255: 1, 7: 2})
+        data = (encoder.update(b"\x00\x00\xff") + encoder.update(bytearray(b"\x07"))
+                + encoder.flush())
+        decoder = HuffmanDecoder(encoder.codes, encoder.bit_length)
+        
+        assert decoder.update(data) + decoder.flush() == b"\x00\x00\xff\x07"
+        
+        with pytest.raises(EncodingError):
+            HuffmanEncoder({0: '0', 1: '1'}).update(b"\x02")
+    
+    def test_empty_tables(self):
+        """Test empty code and frequency tables are rejected"""
+        with pytest.raises(ValueError):
+            HuffmanEncoder({})
+        with pytest.raises(ValueError):
+            HuffmanEncoder.from_frequencies({})
+
+
+class TestHuffmanDecoder:
+    """Test the HuffmanDecoder class"""
+    
+    def _encode(self, text):
+        encoder = HuffmanEncoder.from_frequencies(count_frequencies(io.StringIO(text)))
+        payload = b"".join(iter_encode(io.StringIO(text), encoder, chunk_size=17))
+        return encoder, payload
+    
+    def test_known_length(self, long_text):
+        """Test decoding with the bit length known up front"""
+        encoder, payload = self._encode(long_text)
+        decoder = HuffmanDecoder.from_code_lengths(encoder.code_lengths,
+                                                   encoder.bit_length)
+        
+        pieces = [decoder.update(payload[i:i + 3]) for i in range(0, len(payload), 3)]
+        
+        assert "".join(pieces) + decoder.flush() == long_text
+    
+    def test_length_given_at_flush(self, long_text):
+        """Test decoding when the bit length arrives at the end"""
+        encoder, payload = self._encode(long_text)
+        decoder = HuffmanDecoder(encoder.codes)
+        
+        decoded = "".join(iter_decode(io.BytesIO(payload), decoder, chunk_size=5,
+                                      bit_length=encoder.bit_length))
+        
+        assert decoded == long_text
+    
+    def test_missing_length(self, long_text):
+        """Test flush without any bit length fails"""
+        encoder, payload = self._encode(long_text)
+        decoder = HuffmanDecoder(encoder.codes)
+        decoder.update(payload)
+        
+        with pytest.raises(DecodingError):
+            decoder.flush()
+        with pytest.raises(DecodingError):
+            decoder.update(payload)
+    
+    def test_truncated_stream(self, long_text):
+        """Test a stream shorter than its bit length fails"""
+        encoder, payload = self._encode(long_text)
+        decoder = HuffmanDecoder(encoder.codes, encoder.bit_length)
+        decoder.update(payload[:-4])
+        
+        with pytest.raises(DecodingError):
+            decoder.flush()
+    
+    def test_count_frequencies_binary(self):
+        """Test counting a binary stream yields byte values"""
+        counts = count_frequencies(io.BytesIO(b"abca"), chunk_size=2)
+        assert counts == {97: 2, 98: 1, 99: 1}
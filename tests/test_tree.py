@@ -0,0 +1,113 @@
+"""Tests for the compact array-backed tree"""
+
+import pytest
+from huffman.coding import HuffmanCoding, DecodingError
+from huffman.node import Node
+from huffman.tree import CompactTree
+
+
+class TestCompactTree:
+    """Test building, walking and decoding compact trees"""
+
+    def test_from_node_matches_codes(self, sample_text):
+        """Test flattening a Node tree keeps every code"""
+        huffman = HuffmanCoding()
+        huffman.encode(sample_text)
+        root = huffman._build_huffman_tree(huffman.build_frequency_table(sample_text))
+
+        tree = CompactTree.from_node(root)
+
+        assert tree.codes() == huffman.codes
+        assert tree.frequency(0) == len(sample_text)
+        assert len(tree) == 2 * tree.leaf_count - 1
+
+    def test_from_codes_sums_frequencies(self):
+        """Test internal weights are the sums of their leaves"""
+        tree = CompactTree.from_codes({'a': '0', 'b': '10', 'c': '11'},
+                                      {'a': 3, 'b': 2, 'c': 1})
+
+        right = tree.child(0, 1)
+        assert tree.frequency(0) == 6
+        assert tree.frequency(right) == 3
+        assert tree.symbol(tree.child(right, 0)) == 'b'
+        assert not tree.is_leaf(right)
+
+    def test_to_node_round_trip(self):
+        """Test expanding back to Node objects keeps the shape"""
+        codes = {'a': '0', 'b': '10', 'c': '11'}
+        root = CompactTree.from_codes(codes, {'a': 3, 'b': 2, 'c': 1}).to_node()
+
+        assert isinstance(root, Node)
+        assert root.freq == 6
+        assert root.left.char == 'a'
+        assert root.right.right.char == 'c'
+        assert CompactTree.from_node(root).codes() == codes
+
+    def test_nodes_have_no_dict(self):
+        """Test nodes are slotted"""
+        assert not hasattr(Node(char='a', freq=1), '__dict__')
+
+    def test_decode(self):
+        """Test walking the tree decodes a bit string"""
+        tree = CompactTree.from_codes({'a': '0', 'b': '10', 'c': '11'})
+
+        assert tree.decode("010110") == "abca"
+        assert tree.decode("") == ""
+
+    def test_decode_single_symbol(self):
+        """Test a lone-leaf tree decodes one symbol per zero bit"""
+        tree = CompactTree.from_codes({'z': '0'})
+
+        assert tree.decode("000") == "zzz"
+        with pytest.raises(DecodingError):
+            tree.decode("01")
+
+    @pytest.mark.parametrize("bits, message", [
+        ("1", "Incomplete"),
+        ("0102", "Invalid"),
+    ])
+    def test_decode_errors(self, bits, message):
+        """Test malformed bit strings are rejected"""
+        tree = CompactTree.from_codes({'a': '0', 'b': '10', 'c': '11'})
+
+        with pytest.raises(DecodingError, match=message):
+            tree.decode(bits)
+
+    def test_decode_unused_branch(self):
+        """Test bits leading off an incomplete code are rejected"""
+        tree = CompactTree.from_codes({'a': '0', 'b': '10'})
+
+        with pytest.raises(DecodingError, match="Invalid"):
+            tree.decode("11")
+
+
+class TestTreeDecodePath:
+    """Test HuffmanCoding picks the tree walk for short inputs"""
+
+    @pytest.mark.parametrize("canonical", [False, True])
+    def test_short_and_long_inputs_agree(self, canonical):
+        """Test short (tree) and long (table) decodes give the same text"""
+        for text in ("HELLO WORLD", "HELLO WORLD " * 2000):
+            huffman = HuffmanCoding(canonical=canonical)
+            encoded, freq_table = huffman.encode(text)
+
+            decoded = HuffmanCoding(canonical=canonical).decode(encoded, freq_table)
+            assert decoded == text
+
+    def test_short_input_from_code_lengths(self):
+        """Test the tree walk works from canonical code lengths"""
+        huffman = HuffmanCoding(canonical=True)
+        encoded, _ = huffman.encode("abracadabra")
+
+        decoded = HuffmanCoding().decode(encoded, code_lengths=huffman.code_lengths)
+        assert decoded == "abracadabra"
+
+    def test_tree_property(self):
+        """Test the compact tree is exposed after encoding"""
+        huffman = HuffmanCoding()
+        assert huffman.tree is None
+
+        huffman.encode("HELLO")
+
+        assert huffman.tree.leaf_count == 4
+        assert huffman.tree.codes() == huffman.codes
@@ -0,0 +1,62 @@
+"""Tests for the production launcher and start-up warm-up"""
+
+import runpy
+from pathlib import Path
+
+import pytest
+from app import create_app
+from app.warmup import WARMUP_TEXT, get_dictionaries, load_dictionaries, warm_up
+from huffman.cache import CodeTableCache
+from huffman.dictionary import HuffmanDictionary
+
+
+class TestLauncher:
+    """Test configuration loading and warm-up"""
+
+    def test_create_app_loads_config(self):
+        """Test the factory applies a named configuration"""
+        app = create_app('testing')
+
+        assert app.config['TESTING']
+        assert app.config['BATCH_MAX_ITEMS'] == 10000
+
+    def test_warm_up_fills_cache(self, app, monkeypatch):
+        """Test warm-up runs the endpoints and leaves tables cached"""
+        cache = CodeTableCache()
+        monkeypatch.setattr('app.routes.default_cache', cache)
+
+        warm_up(app)
+
+        assert len(cache) > 0
+
+    def test_warm_up_fails_loudly(self, app, monkeypatch):
+        """Test a broken endpoint stops the start-up"""
+        monkeypatch.setattr('app.routes.encode_payload', None)
+
+        with pytest.raises(RuntimeError, match='/encode'):
+            warm_up(app)
+
+    def test_load_dictionaries(self, app, tmp_path):
+        """Test configured dictionaries are loaded by ID and served"""
+        path = tmp_path / 'api.hdic'
+        HuffmanDictionary.train([WARMUP_TEXT], dict_id=3).save(str(path))
+        app.config['DICTIONARY_PATHS'] = [str(path)]
+
+        assert list(load_dictionaries(app)) == [3]
+        warm_up(app)
+        assert list(get_dictionaries(app)) == [3]
+
+        client = app.test_client()
+        encoded = client.post('/dictionary/encode', json={'text': 'fox', 'dict_id': 3})
+        assert encoded.status_code == 200
+        decoded = client.post('/dictionary/decode', json=encoded.get_json())
+        assert decoded.get_json() == {'decoded': 'fox'}
+
+    def test_gunicorn_settings(self):
+        """Test the gunicorn file preloads the app with configured workers"""
+        path = Path(__file__).parent.parent / 'gunicorn.conf.py'
+        settings = runpy.run_path(str(path))
+
+        assert settings['preload_app'] is True
+        assert settings['workers'] >= 1
+        assert settings['worker_class'] == 'gthread'
@@ -0,0 +1,13 @@
+"""
+WSGI entry point for production servers, e.g. ``gunicorn -c gunicorn.conf.py wsgi:app``
+"""
+
+import os
+
+from app import create_app
+from app.warmup import warm_up
+
+app = create_app(os.environ.get('FLASK_ENV', 'production'))
+
+if app.config.get('WARM_UP'):
+    warm_up(app)